@@ -1,19 +1,35 @@
 import os
 import sqlite3
 import json
-import shutil
 import io
+import re
 import csv
+import base64
+import zlib
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, redirect, url_for, session, send_file, jsonify
+from flask import Flask, render_template, request, redirect, url_for, session, send_file, jsonify, g, has_app_context, Response, stream_with_context
 from flask_socketio import SocketIO, emit
 import threading
+import atexit
+import signal
+import sys
 import time
-import hashlib
 import requests
 from werkzeug.security import generate_password_hash, check_password_hash
 import uuid
+from contextlib import contextmanager
 import secrets
+from runtime_profile import PROFILE
+from change_log import TRACKED_COLUMNS, CHANGE_LOG_DDL, trigger_statement, ensure_change_log_columns, get_changes_since, compact_change_log
+from raport_sumar import RAPORT_SUMAR_DDL, summary_statement, rebuild_summary
+from autocomplete import AutocompleteIndex, AUTOCOMPLETE_LIMIT
+from classifier import Classifier
+from reclasificare import reclassify, load_checkpoint, RECLASIFICARE_CHECKPOINT
+from sqlite_snapshot import restore_database
+from backup_store import ChunkStore, STORE_DIRNAME, BACKUP_PREFIX, write_backup, backup_exists, open_backup, delete_backup
+from backup_catalog import get_catalog
+from backup_retention import load_policy, apply_retention
+from cold_restore import restore_latest, register_drive_backups
 
 # Import opțional pentru auto_backup
 try:
@@ -23,6 +39,9 @@ except ImportError:
     AUTO_BACKUP_AVAILABLE = False
     print("⚠️ Auto backup nu este disponibil (lipsește auto_backup.py)")
 
+# Google Drive se folosește doar dacă modulul de backup și credențialele sunt disponibile
+GDRIVE_AVAILABLE = AUTO_BACKUP_AVAILABLE and PROFILE.gdrive_available
+
 app = Flask(__name__, static_folder='static')
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 socketio = SocketIO(app, cors_allowed_origins="*")
@@ -42,9 +61,17 @@ def validate_csrf_token():
 DATABASE = 'finance.db'
 
 # Configurare pentru sincronizare
-SYNC_INTERVAL = 30  # secunde
-BACKUP_INTERVAL = 43200  # secunde (12 ore) - pe local
-BACKUP_INTERVAL_RENDER = 60  # secunde (1 minut) - pe Render
+CHANGE_COALESCE_WINDOW = 0.3  # secunde - grupează modificările consecutive într-un singur eveniment
+WRITE_BEHIND_DEBOUNCE = 5  # secunde fără scrieri după care se face backup-ul pe Render
+WRITE_BEHIND_MAX_STALENESS = 60  # secunde - limita maximă pentru modificări nesalvate pe Render
+SYNC_SNAPSHOT_LIMIT = 50  # tranzacții trimise când cursorul clientului nu mai poate fi folosit
+SYNC_DELTA_LIMIT = 500  # peste atâtea rânduri modificate se trimite snapshot
+SYNC_TOMBSTONE_LIMIT = 5000  # tombstone-uri păstrate pentru clienții deconectați
+CHANGES_PAGE_LIMIT = 1000  # modificări returnate maxim per pagină de /api/changes
+EXPORT_PAGE_LIMIT = 50000  # rânduri maxim per pagină de /api/export
+EXPORT_FETCH_SIZE = 500  # rânduri citite din cursor la un pas în exporturile generate incremental
+IMPORT_BATCH_SIZE = 1000  # rânduri inserate per executemany în /api/import
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonlines')
 SYNC_ENABLED = True  # Activat pentru persistență
 
 # Variabile pentru tracking backup-ului bazat pe modificări
@@ -59,147 +86,91 @@ def get_backup_dir():
         os.makedirs(backup_dir)
     return backup_dir
 
+# Backup-urile automate sunt păstrate deduplicat, pe blocuri (backup_store.py)
+backup_store = ChunkStore(os.path.join(get_backup_dir(), STORE_DIRNAME))
+
+def get_backup_catalog():
+    """Catalogul backup-urilor (backup_catalog.py), creat din fișiere la prima folosire"""
+    return get_catalog(get_backup_dir(), backup_store)
+
 def is_render_environment():
-    """Detectează dacă aplicația rulează pe Render"""
-    # Multiple metode de detectare pentru Render
-    render_indicators = [
-        os.environ.get('RENDER', False),
-        'render' in os.environ.get('HOSTNAME', '').lower(),
-        'render' in os.environ.get('RENDER_EXTERNAL_HOSTNAME', '').lower(),
-        'render' in os.environ.get('RENDER_SERVICE_NAME', '').lower(),
-        os.environ.get('RENDER_SERVICE_NAME') is not None,
-        os.environ.get('RENDER_EXTERNAL_HOSTNAME') is not None,
-        os.environ.get('RENDER_SERVICE_ID') is not None,
-        os.environ.get('RENDER_INSTANCE_ID') is not None
-    ]
-    
-    is_render = any(render_indicators)
-    
-    # Debug info
-    print(f"🔍 Detectare mediu Render:")
-    print(f"   RENDER: {os.environ.get('RENDER', 'Not set')}")
-    print(f"   HOSTNAME: {os.environ.get('HOSTNAME', 'Not set')}")
-    print(f"   RENDER_EXTERNAL_HOSTNAME: {os.environ.get('RENDER_EXTERNAL_HOSTNAME', 'Not set')}")
-    print(f"   RENDER_SERVICE_NAME: {os.environ.get('RENDER_SERVICE_NAME', 'Not set')}")
-    print(f"   RENDER_SERVICE_ID: {os.environ.get('RENDER_SERVICE_ID', 'Not set')}")
-    print(f"   RENDER_INSTANCE_ID: {os.environ.get('RENDER_INSTANCE_ID', 'Not set')}")
-    print(f"   Rezultat detectare: {is_render}")
-    
-    return is_render
-
-def restore_from_latest_backup():
-    """Restaurează datele din cel mai recent backup (local sau Google Drive)"""
-    backup_dir = get_backup_dir()
-    
+    """Detectează dacă aplicația rulează pe Render (rezultat calculat o singură dată la import)"""
+    return PROFILE.is_render
+
+def latest_gdrive_backup():
+    """Cel mai recent backup de pe Google Drive, din catalog (pe Render, cu discul gol,
+    catalogul se completează o dată din lista folderului de pe Drive)"""
+    from gdrive_session import get_drive_session
+    
+    catalog = get_backup_catalog()
+    latest = catalog.latest(on_gdrive=True)
+    if latest is None and is_render_environment():
+        register_drive_backups(catalog, get_drive_session().list_files(BACKUP_PREFIX))
+        latest = catalog.latest(on_gdrive=True)
+    return latest
+
+def restore_backup_entry(backup, cold_start=False):
+    """Restaurează intrarea de catalog `backup` (cold_restore.py); (succes, mesaj)"""
+    from gdrive_session import get_drive_session
+    
+    download = get_drive_session().download if GDRIVE_AVAILABLE else None
+    open_local = lambda filename: open_backup(get_backup_dir(), filename, backup_store)
+    restored, message = restore_latest(DATABASE, backup, download, open_local, cold_start=cold_start)
+    if restored:
+        database_replaced()
+    return True, message
+
+def restore_from_latest_backup(cold_start=False):
+    """Restaurează datele din cel mai recent backup (local sau Google Drive).
+
+    Cu cold_start=True (la pornire, înainte de primul request) baza de date
+    este înlocuită prin redenumire atomică; altfel prin API-ul de backup SQLite.
+    """
     # Verifică dacă sunt pe Render
     is_render = is_render_environment()
     
     # Pe Render, forțează restaurarea din Google Drive întotdeauna
-    if is_render and AUTO_BACKUP_AVAILABLE:
+    if is_render and GDRIVE_AVAILABLE:
         print("🔄 Detectat mediul Render.com - forțez restaurarea din Google Drive...")
         try:
-            backup_system = get_backup_system()
-            
-            # Obține lista backup-urilor din Google Drive
-            backups = backup_system.get_backup_list()
-            
-            if backups:
-                # Găsește cel mai recent backup cu Google Drive ID
-                gdrive_backups = [b for b in backups if b.get('gdrive_id')]
-                if gdrive_backups:
-                    latest_gdrive_backup = gdrive_backups[0]
-                    
-                    # Descarcă backup-ul din Google Drive
-                    from auto_backup import gdrive_auth
-                    drive = gdrive_auth()
-                    
-                    # Descarcă fișierul
-                    backup_file = drive.CreateFile({'id': latest_gdrive_backup['gdrive_id']})
-                    backup_filename = f"gdrive_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-                    backup_path = os.path.join(backup_dir, backup_filename)
-                    
-                    backup_file.GetContentFile(backup_path)
-                    
-                    # Restaurează din backup-ul descărcat
-                    shutil.copy2(backup_path, DATABASE)
-                    
-                    print(f"✅ Date restaurate din Google Drive: {latest_gdrive_backup['filename']}")
-                    return True, f"Date restaurate din Google Drive: {latest_gdrive_backup['filename']}"
-                    
+            latest = latest_gdrive_backup()
+            if latest:
+                return restore_backup_entry(latest, cold_start)
         except Exception as e:
             print(f"⚠️ Eroare la restaurare din Google Drive: {e}")
             # Fallback la backup local pe Render
             print("🔄 Încercare fallback la backup local...")
     
     # Încearcă să restaureze din backup local
-    if os.path.exists(backup_dir):
-        backup_files = []
-        for filename in os.listdir(backup_dir):
-            if filename.endswith('.db') and filename.startswith('finance_backup_'):
-                backup_path = os.path.join(backup_dir, filename)
-                backup_files.append((filename, os.path.getctime(backup_path)))
-        
-        if backup_files:
-            # Sortează după data creării (cel mai recent primul)
-            backup_files.sort(key=lambda x: x[1], reverse=True)
-            latest_backup = backup_files[0][0]
-            latest_backup_path = os.path.join(backup_dir, latest_backup)
+    latest_local = get_backup_catalog().latest(local=True)
+    if latest_local:
+        try:
+            # Pe Render, restaurarea se face întotdeauna
+            # Pe local, verifică dacă baza de date are deja date
+            if not is_render:
+                if os.path.exists(DATABASE):
+                    conn = sqlite3.connect(DATABASE)
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT COUNT(*) FROM tranzactii")
+                    current_count = cursor.fetchone()[0]
+                    conn.close()
+                    
+                    # Dacă baza de date are deja date, nu restaura (doar pe local)
+                    if current_count > 0:
+                        print(f"Baza de date are deja {current_count} tranzacții, nu se restaurează")
+                        return True, "Baza de date are deja date"
             
-            try:
-                # Pe Render, restaurarea se face întotdeauna
-                # Pe local, verifică dacă baza de date are deja date
-                if not is_render:
-                    if os.path.exists(DATABASE):
-                        conn = sqlite3.connect(DATABASE)
-                        cursor = conn.cursor()
-                        cursor.execute("SELECT COUNT(*) FROM tranzactii")
-                        current_count = cursor.fetchone()[0]
-                        conn.close()
-                        
-                        # Dacă baza de date are deja date, nu restaura (doar pe local)
-                        if current_count > 0:
-                            print(f"Baza de date are deja {current_count} tranzacții, nu se restaurează")
-                            return True, "Baza de date are deja date"
-                
-                # Restaurează din backup local
-                shutil.copy2(latest_backup_path, DATABASE)
-                print(f"✅ Date restaurate din backup local: {latest_backup}")
-                return True, f"Date restaurate din backup local: {latest_backup}"
-                
-            except Exception as e:
-                print(f"⚠️ Eroare la restaurare din backup local: {e}")
+            # Restaurează din backup local
+            return restore_backup_entry(latest_local, cold_start)
+        except Exception as e:
+            print(f"⚠️ Eroare la restaurare din backup local: {e}")
     
     # Dacă nu există backup local și nu sunt pe Render, încearcă din Google Drive
-    if not is_render and AUTO_BACKUP_AVAILABLE:
+    if not is_render and GDRIVE_AVAILABLE:
         try:
-            backup_system = get_backup_system()
-            
-            # Obține lista backup-urilor din Google Drive
-            backups = backup_system.get_backup_list()
-            
-            if backups:
-                # Găsește cel mai recent backup cu Google Drive ID
-                gdrive_backups = [b for b in backups if b.get('gdrive_id')]
-                if gdrive_backups:
-                    latest_gdrive_backup = gdrive_backups[0]
-                    
-                    # Descarcă backup-ul din Google Drive
-                    from auto_backup import gdrive_auth
-                    drive = gdrive_auth()
-                    
-                    # Descarcă fișierul
-                    backup_file = drive.CreateFile({'id': latest_gdrive_backup['gdrive_id']})
-                    backup_filename = f"gdrive_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-                    backup_path = os.path.join(backup_dir, backup_filename)
-                    
-                    backup_file.GetContentFile(backup_path)
-                    
-                    # Restaurează din backup-ul descărcat
-                    shutil.copy2(backup_path, DATABASE)
-                    
-                    print(f"✅ Date restaurate din Google Drive: {latest_gdrive_backup['filename']}")
-                    return True, f"Date restaurate din Google Drive: {latest_gdrive_backup['filename']}"
-                    
+            latest = latest_gdrive_backup()
+            if latest:
+                return restore_backup_entry(latest, cold_start)
         except Exception as e:
             print(f"⚠️ Eroare la restaurare din Google Drive: {e}")
     elif is_render:
@@ -212,10 +183,10 @@ def create_backup(is_auto_backup=False):
     backup_dir = get_backup_dir()
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_filename = f'finance_backup_{timestamp}.db'
-    backup_path = os.path.join(backup_dir, backup_filename)
     
-    # Copiază baza de date
-    shutil.copy2(DATABASE, backup_path)
+    # Snapshot verificat cu quick_check; backup-urile automate (la fiecare minut pe
+    # Render) merg în depozitul deduplicat, cele manuale devin un fișier comprimat
+    storage = write_backup(DATABASE, backup_dir, backup_filename, backup_store if is_auto_backup else None)
     
     # Creează un fișier JSON cu informații despre backup
     if is_auto_backup:
@@ -223,31 +194,15 @@ def create_backup(is_auto_backup=False):
     else:
         description = f'Backup manual creat la {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
     
-    # Obține informații despre backup
-    backup_size = os.path.getsize(backup_path)
-    
-    # Conectează la backup pentru a obține informații despre tabele
-    backup_conn = sqlite3.connect(backup_path)
-    backup_cursor = backup_conn.cursor()
-    
-    # Numără înregistrările din tabele
-    tranzactii_count = backup_cursor.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0]
-    obiecte_count = backup_cursor.execute("SELECT COUNT(*) FROM obiecte").fetchone()[0]
-    backup_conn.close()
-    
     backup_info = {
         'filename': backup_filename,
         'created_at': datetime.now().isoformat(),
         'timestamp': datetime.now().isoformat(),
-        'size': backup_size,
-        'tables': {
-            'tranzactii': tranzactii_count,
-            'obiecte': obiecte_count
-        },
         'source': 'local_backup',
         'original_db': DATABASE,
         'description': description,
-        'is_auto_backup': is_auto_backup
+        'is_auto_backup': is_auto_backup,
+        **storage
     }
     
     info_filename = backup_filename.replace('.db', '.json')
@@ -255,12 +210,15 @@ def create_backup(is_auto_backup=False):
     
     with open(info_path, 'w', encoding='utf-8') as f:
         json.dump(backup_info, f, indent=2, ensure_ascii=False)
+    get_backup_catalog().record(backup_info)
     
     return backup_filename
 
-def init_db():
-    """Creează tabelele în baza de date dacă nu există și restaurează datele"""
-    conn = sqlite3.connect(DATABASE)
+# Tabelele urmărite pentru detectarea modificărilor
+TRACKED_TABLES = tuple(TRACKED_COLUMNS)
+
+def create_schema(conn):
+    """Creează tabelele, contorul de modificări și trigger-ele (idempotent)"""
     cursor = conn.cursor()
     
     # Creează tabelul tranzactii
@@ -286,7 +244,145 @@ def init_db():
         )
     ''')
     
+    # Contor monoton al modificărilor, incrementat de trigger-e.
+    # purged_seq marchează până unde au fost șterse tombstone-urile, iar epoch
+    # se schimbă la fiecare restaurare (cursoarele clienților devin invalide).
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sync_state (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            change_seq INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO sync_state (id, change_seq) VALUES (1, 0)")
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(sync_state)").fetchall()]
+    if 'purged_seq' not in columns:
+        cursor.execute("ALTER TABLE sync_state ADD COLUMN purged_seq INTEGER NOT NULL DEFAULT 0")
+    if 'compacted_seq' not in columns:
+        # Până unde a fost deja comprimat change_log (compact_change_log)
+        cursor.execute("ALTER TABLE sync_state ADD COLUMN compacted_seq INTEGER NOT NULL DEFAULT 0")
+    if 'epoch' not in columns:
+        cursor.execute("ALTER TABLE sync_state ADD COLUMN epoch TEXT")
+        cursor.execute("UPDATE sync_state SET epoch = ? WHERE id = 1", (secrets.token_hex(8),))
+    
+    # Ultima modificare a fiecărui rând (inclusiv tombstone-uri pentru ștergeri)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sync_rows (
+            tabel TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            deleted INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (tabel, row_id)
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sync_rows_seq ON sync_rows (seq)")
+    
+    # Jurnalul complet al modificărilor (pentru sincronizare și audit)
+    cursor.execute(CHANGE_LOG_DDL)
+    ensure_change_log_columns(conn)
+    
+    # Sumele pe (operator, tip, is_transfer) pentru raportul de pe pagina principală
+    summary_exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'raport_sumar'"
+    ).fetchone()
+    cursor.execute(RAPORT_SUMAR_DDL)
+    if not summary_exists:
+        rebuild_summary(conn)
+    
+    # Trigger-ele sunt recreate la fiecare pornire, ca să aibă mereu corpul curent
+    for table in TRACKED_TABLES:
+        for op in ('INSERT', 'UPDATE', 'DELETE'):
+            if op == 'DELETE':
+                row_changes = f"""
+                    INSERT OR REPLACE INTO sync_rows (tabel, row_id, seq, deleted)
+                    VALUES ('{table}', OLD.id, (SELECT change_seq FROM sync_state WHERE id = 1), 1);"""
+            else:
+                row_changes = f"""
+                    INSERT OR REPLACE INTO sync_rows (tabel, row_id, seq, deleted)
+                    VALUES ('{table}', NEW.id, (SELECT change_seq FROM sync_state WHERE id = 1), 0);"""
+            if op == 'UPDATE':
+                row_changes += f"""
+                    INSERT OR REPLACE INTO sync_rows (tabel, row_id, seq, deleted)
+                    SELECT '{table}', OLD.id, (SELECT change_seq FROM sync_state WHERE id = 1), 1
+                    WHERE OLD.id != NEW.id;"""
+            row_changes += trigger_statement(table, op)
+            if table == 'tranzactii':
+                row_changes += summary_statement(op)
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{op.lower()}_seq")
+            cursor.execute(f'''
+                CREATE TRIGGER trg_{table}_{op.lower()}_seq
+                AFTER {op} ON {table}
+                BEGIN
+                    UPDATE sync_state SET change_seq = change_seq + 1 WHERE id = 1;{row_changes}
+                END
+            ''')
+    
+    conn.commit()
+    run_migrations(conn)
+
+# Migrările schemei, aplicate în ordine pe baza PRAGMA user_version.
+# O migrare nouă se adaugă la final cu următorul număr; cele existente nu se modifică.
+MIGRATIONS = [
+    (1, 'index pentru ordonarea după dată (istoric, pagina principală, verificarea duplicatelor)', [
+        "CREATE INDEX IF NOT EXISTS idx_tranzactii_data_id ON tranzactii (data, id)",
+    ]),
+    (2, 'indexuri compuse pentru filtrele pe obiect, operator, persoană și tip', [
+        # obiect_detalii(), numărul de tranzacții per obiect, agent() pe obiect
+        "CREATE INDEX IF NOT EXISTS idx_tranzactii_obiect_tip_data ON tranzactii (obiect, tip, data)",
+        # venituri_operator(), agent() pe operator, lista operatorilor
+        "CREATE INDEX IF NOT EXISTS idx_tranzactii_operator_tip_data ON tranzactii (operator, tip, data)",
+        # agent() pe persoană (acoperă și suma)
+        "CREATE INDEX IF NOT EXISTS idx_tranzactii_persoana_tip_suma ON tranzactii (persoana, tip, suma)",
+        # lista_venituri() și totalurile din agent()
+        "CREATE INDEX IF NOT EXISTS idx_tranzactii_tip_data ON tranzactii (tip, data)",
+    ]),
+]
+
+def run_migrations(conn, migrations=None):
+    """Aplică migrările cu versiunea mai mare decât PRAGMA user_version.
+
+    Fiecare migrare rulează într-o tranzacție proprie, împreună cu actualizarea
+    versiunii, deci o migrare eșuată nu lasă schema pe jumătate modificată.
+    Returnează lista versiunilor aplicate.
+    """
+    if migrations is None:
+        migrations = MIGRATIONS
+    current = conn.execute("PRAGMA user_version").fetchone()[0]
+    applied = []
+    for version, descriere, statements in migrations:
+        if version <= current:
+            continue
+        conn.execute("BEGIN")
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"🔧 Migrare {version} aplicată: {descriere}")
+        applied.append(version)
+        current = version
+    return applied
+
+def purge_sync_tombstones(conn, keep=SYNC_TOMBSTONE_LIMIT):
+    """Păstrează doar ultimele `keep` tombstone-uri; cursoarele mai vechi primesc snapshot"""
+    threshold = conn.execute('''
+        SELECT seq FROM sync_rows WHERE deleted = 1
+        ORDER BY seq DESC LIMIT 1 OFFSET ?
+    ''', (keep,)).fetchone()
+    if threshold is None:
+        return 0
+    
+    purged = conn.execute("DELETE FROM sync_rows WHERE deleted = 1 AND seq <= ?", (threshold[0],)).rowcount
+    conn.execute("UPDATE sync_state SET purged_seq = MAX(purged_seq, ?) WHERE id = 1", (threshold[0],))
     conn.commit()
+    return purged
+
+def init_db():
+    """Creează tabelele în baza de date dacă nu există și restaurează datele"""
+    conn = sqlite3.connect(DATABASE)
+    create_schema(conn)
     conn.close()
     
     # Verifică dacă sunt pe Render
@@ -294,7 +390,7 @@ def init_db():
     
     if is_render:
         print("🔄 Detectat mediul Render.com - forțez restaurarea datelor...")
-        success, message = restore_from_latest_backup()
+        success, message = restore_from_latest_backup(cold_start=True)
         if success:
             print(f"✅ {message}")
         else:
@@ -305,7 +401,7 @@ def init_db():
         
         if not has_data:
             print("⚠️ Baza de date este goală - încercare restaurare...")
-            success, message = restore_from_latest_backup()
+            success, message = restore_from_latest_backup(cold_start=True)
             if success:
                 print(f"✅ {message}")
             else:
@@ -345,42 +441,200 @@ def check_database_has_data():
         print(f"⚠️ Eroare la verificarea bazei de date: {e}")
         return False
 
+# Numărul maxim de conexiuni păstrate deschise (gunicorn rulează cu --threads 8)
+DB_POOL_SIZE = 8
+
+class ConnectionPool:
+    """Pool de conexiuni SQLite reutilizate între request-uri.
+
+    Conexiunile sunt deschise o singură dată, cu PRAGMA-urile deja aplicate,
+    și sunt returnate în pool la finalul fiecărui request. După o restaurare
+    (fișierul bazei de date este înlocuit) pool-ul este resetat cu reset().
+    """
+
+    def __init__(self, database, pragmas=(), max_idle=DB_POOL_SIZE):
+        self.database = database
+        self.pragmas = tuple(pragmas)
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        """Returnează o conexiune din pool (sau deschide una nouă)"""
+        with self._lock:
+            while self._idle:
+                conn, generation = self._idle.pop()
+                if generation == self._generation:
+                    return conn, generation
+                conn.close()
+            generation = self._generation
+        return self._connect(), generation
+
+    def release(self, conn, generation):
+        """Pune conexiunea înapoi în pool; o închide dacă pool-ul e plin sau vechi"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.ProgrammingError:
+            # Conexiunea a fost deja închisă de apelant
+            return
+        with self._lock:
+            if generation == self._generation and len(self._idle) < self.max_idle:
+                self._idle.append((conn, generation))
+                return
+        conn.close()
+
+    def reset(self):
+        """Închide conexiunile inactive; cele în uz se închid la eliberare"""
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+db_pool = ConnectionPool(DATABASE, PROFILE.sqlite_pragmas)
+
+# Conexiunile folosite de thread-urile din background (în afara unui request)
+_thread_db = threading.local()
+
+_db_initialized = False
+_db_init_lock = threading.Lock()
+
+def ensure_db_initialized():
+    """Rulează init_db() (schemă + restaurare) o singură dată pe proces"""
+    global _db_initialized
+    if _db_initialized:
+        return
+    with _db_init_lock:
+        if not _db_initialized:
+            init_db()
+            _db_initialized = True
+
+def _connection_is_open(conn):
+    try:
+        conn.in_transaction
+        return True
+    except sqlite3.ProgrammingError:
+        return False
+
 def get_db():
-    # Inițializează baza de date dacă nu există
-    init_db()
+    """Returnează conexiunea la baza de date pentru request-ul sau thread-ul curent"""
+    ensure_db_initialized()
+
+    if has_app_context():
+        if 'db' not in g:
+            g.db, g.db_generation = db_pool.acquire()
+        return g.db
+
+    # În afara unui request (thread-uri din background, scripturi),
+    # fiecare thread își păstrează propria conexiune din pool
+    conn = getattr(_thread_db, 'conn', None)
+    if conn is None or getattr(_thread_db, 'generation', None) != db_pool._generation or not _connection_is_open(conn):
+        _thread_db.conn, _thread_db.generation = db_pool.acquire()
+    return _thread_db.conn
+
+@app.teardown_appcontext
+def close_db(exception=None):
+    """Returnează conexiunea request-ului în pool"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        db_pool.release(conn, g.pop('db_generation', None))
+
+def database_replaced():
+    """Trebuie apelată după ce fișierul bazei de date a fost înlocuit (restaurare)"""
+    db_pool.reset()
+    # Backup-urile vechi nu au contorul de modificări și trigger-ele;
+    # epoch nou ca toți clienții să ceară snapshot
     conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
-    
-    # Pe Render, forțează salvarea la fiecare operație
-    is_render = is_render_environment()
-    if is_render:
-        # Activează WAL mode pentru performanță și siguranță
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA synchronous=NORMAL")
-        conn.execute("PRAGMA cache_size=10000")
-        conn.execute("PRAGMA temp_store=MEMORY")
-    
-    return conn
+    create_schema(conn)
+    conn.execute("UPDATE sync_state SET epoch = ? WHERE id = 1", (secrets.token_hex(8),))
+    conn.commit()
+    conn.close()
+    change_tracker.reset()
+    classifier_cache.invalidate()
+    autocomplete_index.reset()
+
+def _switch_database(path):
+    global DATABASE, _db_initialized
+    DATABASE = path
+    for holder in (db_pool, change_tracker, autocomplete_index, reclassification_job):
+        holder.database = path
+    db_pool.reset()
+    change_tracker.reset()
+    _count_cache['token'] = None
+    # Schema fără restaurare: o bază nouă nu trebuie umplută din backup-uri
+    conn = sqlite3.connect(path)
+    create_schema(conn)
+    conn.close()
+    _db_initialized = True
+    classifier_cache.invalidate()
+    autocomplete_index.reset()
+
+@contextmanager
+def use_database(path):
+    """Rulează aplicația pe alt fișier SQLite (teste), apoi revine la baza curentă"""
+    previous = DATABASE
+    _switch_database(path)
+    try:
+        yield
+    finally:
+        _switch_database(previous)
+
+class ChangeTracker:
+    """Detectează modificările bazei de date în timp constant.
+
+    PRAGMA data_version se schimbă doar când altă conexiune face commit, deci
+    este o verificare ieftină înainte de a citi contorul din sync_state.
+    Token-ul rezultat (contor + max(id) pe tabel) înlocuiește vechiul hash MD5.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._conn = None
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._token = None
+
+    def current_token(self):
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.database, check_same_thread=False)
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._token is not None and data_version == self._data_version:
+                return self._token
+            
+            row = self._conn.execute('''
+                SELECT (SELECT change_seq FROM sync_state WHERE id = 1),
+                       (SELECT MAX(id) FROM tranzactii),
+                       (SELECT MAX(id) FROM obiecte)
+            ''').fetchone()
+            self._token = f"{row[0] or 0}-{row[1] or 0}-{row[2] or 0}"
+            self._data_version = data_version
+            return self._token
+
+    def reset(self):
+        """Uită starea cache-uită (după înlocuirea fișierului bazei de date)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._data_version = None
+            self._token = None
+
+change_tracker = ChangeTracker(DATABASE)
 
 def get_db_hash():
-    """Calculează hash-ul bazei de date pentru detectarea modificărilor"""
-    conn = get_db()
-    c = conn.cursor()
-    
-    # Obține toate tranzacțiile pentru hash
-    tranzactii = c.execute("SELECT * FROM tranzactii ORDER BY id").fetchall()
-    obiecte = c.execute("SELECT * FROM obiecte ORDER BY id").fetchall()
-    
-    # Creează un string cu toate datele
-    data_string = ""
-    for row in tranzactii:
-        data_string += str(row['id']) + str(row['data']) + str(row['suma']) + str(row['comentariu']) + str(row['operator']) + str(row['tip']) + str(row['obiect']) + str(row['persoana']) + str(row['categorie'])
-    
-    for row in obiecte:
-        data_string += str(row['id']) + str(row['nume'])
-    
-    # Calculează hash-ul
-    return hashlib.md5(data_string.encode()).hexdigest()
+    """Returnează token-ul de versiune al bazei de date pentru detectarea modificărilor"""
+    ensure_db_initialized()
+    return change_tracker.current_token()
 
 def reset_backup_tracking():
     """Resetează tracking-ul pentru backup-ul automat"""
@@ -389,33 +643,91 @@ def reset_backup_tracking():
         conn = get_db()
         cursor = conn.cursor()
         last_transaction_count = cursor.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0]
-        conn.close()
         print(f"📊 Tracking backup resetat: {last_transaction_count} tranzacții")
     except Exception as e:
         print(f"⚠️ Eroare la resetarea tracking-ului: {e}")
 
-def force_save_on_render():
-    """Forțează salvarea datelor pe Render"""
-    is_render = is_render_environment()
-    if is_render:
+class BackupScheduler:
+    """Backup write-behind pe Render: scrierile doar marchează baza de date ca modificată.
+
+    Un singur thread face snapshot-ul (backup local + Google Drive) după ce
+    scrierile se opresc pentru `debounce` secunde, dar cel târziu la
+    `max_staleness` secunde după prima scriere nesalvată. Astfel o rafală de
+    scrieri produce un singur backup, iar request-urile nu așteaptă upload-ul.
+    """
+
+    def __init__(self, debounce=WRITE_BEHIND_DEBOUNCE, max_staleness=WRITE_BEHIND_MAX_STALENESS):
+        self.debounce = debounce
+        self.max_staleness = max_staleness
+        self._condition = threading.Condition()
+        self._first_dirty = None
+        self._last_dirty = None
+        self._thread = None
+        # Un singur snapshot odată: flush() așteaptă salvarea pornită de thread
+        self._save_lock = threading.Lock()
+
+    def mark_dirty(self):
+        with self._condition:
+            now = time.monotonic()
+            if self._first_dirty is None:
+                self._first_dirty = now
+            self._last_dirty = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def due_in(self, now=None):
+        """Secunde până la următorul snapshot; None dacă nu există modificări nesalvate"""
+        if self._first_dirty is None:
+            return None
+        now = time.monotonic() if now is None else now
+        due = min(self._last_dirty + self.debounce, self._first_dirty + self.max_staleness)
+        return max(0.0, due - now)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                wait = self.due_in()
+                while wait is None or wait > 0:
+                    self._condition.wait(wait)
+                    wait = self.due_in()
+            self.flush()
+
+    def flush(self):
+        """Salvează imediat modificările nesalvate (la oprirea procesului).
+
+        Dacă thread-ul face deja un snapshot, îl așteaptă să se termine.
+        """
+        with self._save_lock:
+            with self._condition:
+                dirty = self._first_dirty is not None
+                # Scrierile de după acest punct marchează din nou baza de date
+                self._first_dirty = self._last_dirty = None
+            if dirty:
+                self.save()
+
+    def save(self):
         try:
-            # Forțează backup după fiecare operație pe Render
-            from app import create_backup
             backup_filename = create_backup(is_auto_backup=True)
-            print(f"💾 Backup forțat pe Render: {backup_filename}")
+            print(f"💾 Backup write-behind pe Render: {backup_filename}")
             
-            # Forțează sincronizarea cu Google Drive dacă este disponibil
-            if AUTO_BACKUP_AVAILABLE:
+            # Sincronizarea cu Google Drive dacă este disponibil
+            if GDRIVE_AVAILABLE:
                 try:
-                    from auto_backup import get_backup_system
-                    backup_system = get_backup_system()
-                    backup_system.create_backup(upload_to_gdrive_flag=True)
-                    print("☁️ Backup Google Drive forțat pe Render")
+                    get_backup_system().create_backup(upload_to_gdrive_flag=True, is_auto_backup=True)
+                    print("☁️ Backup Google Drive write-behind pe Render")
                 except Exception as e:
                     print(f"⚠️ Eroare la backup Google Drive: {e}")
-                    
         except Exception as e:
-            print(f"⚠️ Eroare la forțarea backup-ului pe Render: {e}")
+            print(f"⚠️ Eroare la backup-ul write-behind pe Render: {e}")
+
+backup_scheduler = BackupScheduler()
+
+def mark_database_dirty(table, ids):
+    """Pe Render, fiecare scriere programează un backup write-behind"""
+    if PROFILE.is_render:
+        backup_scheduler.mark_dirty()
 
 def auto_backup():
     """Backup automat în background cu Google Drive - la 12 ore pe local, 1 minut pe Render"""
@@ -424,11 +736,8 @@ def auto_backup():
     while True:
         try:
             if SYNC_ENABLED:
-                # Verifică dacă sunt pe Render
-                is_render = is_render_environment()
-                
-                # Alege intervalul de backup în funcție de mediu
-                backup_interval = BACKUP_INTERVAL_RENDER if is_render else BACKUP_INTERVAL
+                is_render = PROFILE.is_render
+                backup_interval = PROFILE.backup_interval
                 
                 # Verifică dacă trebuie să facă backup
                 should_backup = False
@@ -448,7 +757,8 @@ def auto_backup():
                     conn = get_db()
                     cursor = conn.cursor()
                     current_transaction_count = cursor.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0]
-                    conn.close()
+                    purge_sync_tombstones(conn)
+                    compact_change_log(conn)
                     
                     transaction_diff = current_transaction_count - last_transaction_count
                     if transaction_diff >= backup_threshold:
@@ -468,10 +778,10 @@ def auto_backup():
                         print(f"✅ Backup local automat creat la {datetime.now().strftime('%H:%M:%S')}")
                     
                     # Încearcă backup pe Google Drive (doar pe Render și dacă este disponibil)
-                    if is_render and AUTO_BACKUP_AVAILABLE:
+                    if is_render and GDRIVE_AVAILABLE:
                         try:
                             backup_system = get_backup_system()
-                            backup_system.create_backup(upload_to_gdrive_flag=True)
+                            backup_system.create_backup(upload_to_gdrive_flag=True, is_auto_backup=True)
                             print(f"✅ Backup Google Drive creat la {datetime.now().strftime('%H:%M:%S')}")
                         except Exception as e:
                             print(f"⚠️ Eroare la backup Google Drive: {e}")
@@ -487,39 +797,167 @@ def auto_backup():
                     else:
                         print(f"📊 Backup completat. Următorul backup: la 12 ore sau la {backup_threshold} tranzacții noi")
                 
+                # Retenția rulează aici, în background, și acoperă și backup-urile write-behind
+                try:
+                    result = prune_backups()
+                    if result['local'] or result['gdrive']:
+                        print(f"🧹 Backup-uri vechi șterse: {result['local']} local, {result['gdrive']} Google Drive")
+                except Exception as e:
+                    print(f"⚠️ Eroare la retenția backup-urilor: {e}")
+                
         except Exception as e:
             print(f"Eroare la backup automat: {e}")
         
         # Așteaptă 5 minute înainte de următoarea verificare
         time.sleep(300)  # 5 minute
 
-def sync_data():
-    """Sincronizare automată în background"""
-    last_hash = get_db_hash()
-    
-    while True:
+class ChangeNotifier:
+    """Trimite clienților evenimentul data_changed imediat după scrieri.
+
+    Modificările dintr-o fereastră scurtă sunt grupate într-un singur emit,
+    cu ID-urile rândurilor afectate pe fiecare tabel.
+    """
+
+    def __init__(self, socketio, window=CHANGE_COALESCE_WINDOW):
+        self.socketio = socketio
+        self.window = window
+        # Funcții apelate cu modificările grupate, înainte de emit (ex. indexul de autocompletare)
+        self.listeners = []
+        # Funcții apelate imediat, la fiecare publish(table, ids) (ex. invalidarea cache-urilor)
+        self.immediate_listeners = []
+        self._pending = {}
+        self._truncated = False
+        self._scheduled = False
+        self._lock = threading.Lock()
+
+    def publish(self, table, ids, truncated=False):
+        """Înregistrează rândurile modificate; emit-ul pleacă după fereastra de grupare.
+
+        truncated=True semnalează că lista de ID-uri este incompletă (import masiv),
+        iar clienții trebuie să ceară o resincronizare.
+        """
+        for listener in self.immediate_listeners:
+            listener(table, ids)
+        if not SYNC_ENABLED:
+            return
+        with self._lock:
+            self._pending.setdefault(table, set()).update(ids)
+            self._truncated = self._truncated or truncated
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.socketio.start_background_task(self._flush_later)
+
+    def _flush_later(self):
+        self.socketio.sleep(self.window)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            truncated, self._truncated = self._truncated, False
+            self._scheduled = False
+        for listener in self.listeners:
+            try:
+                listener(pending)
+            except Exception as e:
+                print(f"Eroare la procesarea modificărilor: {e}")
         try:
-            if SYNC_ENABLED:
-                current_hash = get_db_hash()
-                if current_hash != last_hash:
-                    # Datele s-au modificat, notifică toți clienții
-                    socketio.emit('data_changed', {
-                        'timestamp': datetime.now().isoformat(),
-                        'hash': current_hash
-                    })
-                    last_hash = current_hash
-                    print(f"Sincronizare la {datetime.now().strftime('%H:%M:%S')}")
+            payload = {
+                'timestamp': datetime.now().isoformat(),
+                'hash': get_db_hash(),
+                'truncated': truncated
+            }
+            for table in TRACKED_TABLES:
+                payload[table] = sorted(pending.get(table, ()))
+            self.socketio.emit('data_changed', payload)
         except Exception as e:
-            print(f"Eroare la sincronizare: {e}")
-        
-        time.sleep(SYNC_INTERVAL)
+            print(f"Eroare la notificarea modificărilor: {e}")
+
+change_notifier = ChangeNotifier(socketio)
 
-# Pornește thread-urile pentru backup și sincronizare
-backup_thread = threading.Thread(target=auto_backup, daemon=True)
-sync_thread = threading.Thread(target=sync_data, daemon=True)
+# Sugestiile de autocompletare, actualizate din change_log după fiecare scriere
+autocomplete_index = AutocompleteIndex(DATABASE)
+change_notifier.listeners.append(lambda pending: autocomplete_index.refresh())
 
-backup_thread.start()
-sync_thread.start()
+def invalidate_classifier(table, ids):
+    """Clasificatorul depinde doar de lista de obiecte"""
+    if table == 'obiecte':
+        classifier_cache.invalidate()
+
+change_notifier.immediate_listeners.append(invalidate_classifier)
+change_notifier.immediate_listeners.append(mark_database_dirty)
+atexit.register(backup_scheduler.flush)
+
+def handle_sigterm(signum, frame):
+    """Render oprește instanța cu SIGTERM: salvează modificările nesalvate, apoi ieși"""
+    print("🛑 SIGTERM primit - salvare backup înainte de oprire")
+    backup_scheduler.flush()
+    sys.exit(0)
+
+class ReclassificationJob:
+    """Reclasificarea tranzacțiilor existente, rulată într-un thread separat.
+
+    Clasificarea propriu-zisă rulează într-un pool de procese (reclasificare.py),
+    deci request-urile web nu sunt blocate; progresul este citit cu status().
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._thread = None
+        self._stop = threading.Event()
+        self._state = None
+        self._error = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return False
+        self._stop.clear()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        try:
+            self._state = reclassify(self.database, progress=self._on_progress, should_stop=self._stop.is_set)
+            print(f"✅ Reclasificare: {self._state['updated']} tranzacții modificate din {self._state['processed']}")
+        except Exception as e:
+            self._error = str(e)
+            print(f"❌ Eroare la reclasificare: {e}")
+
+    def _on_progress(self, state):
+        ids = state.pop('ids')
+        self._state = state
+        if ids:
+            change_notifier.publish('tranzactii', ids)
+
+    def status(self):
+        return {
+            'running': self.running,
+            'state': self._state or load_checkpoint(RECLASIFICARE_CHECKPOINT),
+            'error': self._error
+        }
+
+reclassification_job = ReclassificationJob(DATABASE)
+
+# Worker-ii reclasificării (forkserver/spawn) importă modulul principal ca __mp_main__;
+# restaurarea și thread-urile rulează doar în procesul aplicației
+if __name__ != '__mp_main__':
+    # Schema și restaurarea rulează o singură dată, la pornirea procesului
+    for line in PROFILE.describe():
+        print(line)
+    ensure_db_initialized()
+    autocomplete_index.rebuild()
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
+    # Pornește thread-ul pentru backup (modificările sunt notificate direct de rutele de scriere)
+    backup_thread = threading.Thread(target=auto_backup, daemon=True)
+    backup_thread.start()
 
 # WebSocket events
 @socketio.on('connect')
@@ -531,27 +969,74 @@ def handle_connect():
 def handle_disconnect():
     print(f"Client deconectat: {request.sid}")
 
-@socketio.on('request_sync')
-def handle_sync_request():
-    """Trimite datele curente la client"""
+def _rows_by_id(c, table, ids):
+    """Citește rândurile cu ID-urile date, în loturi (limita de parametri SQLite)"""
+    rows = []
+    ids = list(ids)
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        placeholders = ','.join('?' for _ in chunk)
+        rows.extend(dict(row) for row in c.execute(f"SELECT * FROM {table} WHERE id IN ({placeholders})", chunk))
+    return rows
+
+def build_sync_payload(conn, since=None, epoch=None):
+    """Construiește răspunsul pentru request_sync.
+
+    Dacă cursorul clientului (since + epoch) este valid, trimite doar rândurile
+    inserate/modificate și tombstone-urile de după el. Altfel (cursor lipsă,
+    prea vechi, altă epocă sau prea multe modificări) trimite un snapshot limitat.
+    """
+    c = conn.cursor()
+    # O singură tranzacție de citire: contorul și rândurile provin din același snapshot
+    c.execute("BEGIN")
     try:
-        conn = get_db()
-        c = conn.cursor()
+        state = c.execute("SELECT change_seq, purged_seq, epoch FROM sync_state WHERE id = 1").fetchone()
+        current_seq, purged_seq, current_epoch = state['change_seq'], state['purged_seq'], state['epoch']
         
-        # Obține toate datele necesare
-        tranzactii = c.execute("SELECT * FROM tranzactii ORDER BY id DESC LIMIT 50").fetchall()
-        obiecte = c.execute("SELECT * FROM obiecte ORDER BY id").fetchall()
+        changes = None
+        if since is not None and epoch == current_epoch and purged_seq <= since <= current_seq:
+            changes = c.execute('''
+                SELECT tabel, row_id, deleted FROM sync_rows
+                WHERE seq > ? ORDER BY seq LIMIT ?
+            ''', (since, SYNC_DELTA_LIMIT + 1)).fetchall()
+            if len(changes) > SYNC_DELTA_LIMIT:
+                changes = None
         
-        # Convertește în format JSON
         data = {
-            'tranzactii': [dict(row) for row in tranzactii],
-            'obiecte': [dict(row) for row in obiecte],
-            'hash': get_db_hash(),
-            'timestamp': datetime.now().isoformat()
+            'seq': current_seq,
+            'epoch': current_epoch,
+            'deleted': {table: [] for table in TRACKED_TABLES}
         }
+        if changes is None:
+            data['mode'] = 'snapshot'
+            data['tranzactii'] = [dict(row) for row in c.execute(
+                "SELECT * FROM tranzactii ORDER BY id DESC LIMIT ?", (SYNC_SNAPSHOT_LIMIT,))]
+            data['obiecte'] = [dict(row) for row in c.execute("SELECT * FROM obiecte ORDER BY id")]
+        else:
+            data['mode'] = 'delta'
+            upserted = {table: [] for table in TRACKED_TABLES}
+            for change in changes:
+                target = data['deleted'] if change['deleted'] else upserted
+                target[change['tabel']].append(change['row_id'])
+            for table in TRACKED_TABLES:
+                data[table] = _rows_by_id(c, table, upserted[table])
+    finally:
+        conn.rollback()
+    
+    data['hash'] = get_db_hash()
+    data['timestamp'] = datetime.now().isoformat()
+    return data
+
+@socketio.on('request_sync')
+def handle_sync_request(message=None):
+    """Trimite clientului modificările de după cursorul lui (sau un snapshot)"""
+    try:
+        message = message or {}
+        since = message.get('since')
+        data = build_sync_payload(get_db(), int(since) if since is not None else None, message.get('epoch'))
         
         emit('sync_data', data)
-        print(f"Date sincronizate pentru client: {request.sid}")
+        print(f"Date sincronizate pentru client: {request.sid} ({data['mode']})")
         
     except Exception as e:
         emit('sync_error', {'error': str(e)})
@@ -572,127 +1057,40 @@ def sync_status():
     })
 
 
+class ClassifierCache:
+    """Clasificatorul compilat pentru obiectele curente, reconstruit doar când obiecte se schimbă.
+
+    invalidate() incrementează generația; un clasificator construit din lista
+    citită înaintea unei invalidări este folosit o dată, dar nu intră în cache.
+    """
+
+    def __init__(self):
+        self._classifier = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        classifier = self._classifier
+        if classifier is None:
+            with self._lock:
+                classifier = self._classifier
+                if classifier is None:
+                    generation = self._generation
+                    lista_obiecte = [row['nume'] for row in get_db().execute("SELECT nume FROM obiecte").fetchall()]
+                    classifier = Classifier(lista_obiecte)
+                    if self._generation == generation:
+                        self._classifier = classifier
+        return classifier
+
+    def invalidate(self):
+        self._generation += 1
+        self._classifier = None
+
+classifier_cache = ClassifierCache()
+
 def classify_entry(comment):
-    comment = comment.lower().strip()
-    tip = 'cheltuiala'
-    persoane = ['valerian', 'victor', 'transport', 'bus']
-    categorie = 'alte cheltuieli'
-    # preluăm lista reală de obiecte din baza de date
-    conn = get_db()
-    c = conn.cursor()
-    lista_obiecte = [row['nume'] for row in c.execute("SELECT nume FROM obiecte").fetchall()]
-    obiect = next((o for o in lista_obiecte if o in comment), 'necunoscut')
-
-    # Dacă există 'salariu' sau 'salariul', e cheltuială
-    if 'salariu' in comment or 'salariul' in comment:
-        categorie = 'salariu'
-        # extrag persoana și obiectul dacă există
-        import re
-        match = re.match(r"(salariu|salariul)\s+(\w+)(?:\s+(la|pentru)\s+(\w+))?", comment)
-        persoana = match.group(2) if match else 'necunoscut'
-        if match and match.group(3) and match.group(4):
-            obiect = match.group(4)
-        return tip, obiect, persoana, categorie
-
-    # Cuvinte cheie pentru venit
-    venit_keywords = ['decontare', 'scos bani', 'primit', 'venit', 'am primit']
-    for kw in venit_keywords:
-        if comment.startswith(kw):
-            tip = 'venit'
-            rest = comment[len(kw):].strip()
-            
-            # Încearcă să identifice de la cine este venitul
-            persoane_posibile = ['valerian', 'victor', 'transport', 'bus']
-            persoana = 'necunoscut'
-            
-            # Caută persoana în restul comentariului
-            for pers in persoane_posibile:
-                if pers in rest.lower():
-                    persoana = pers
-                    break
-            
-            # Dacă nu găsește persoana, încearcă să extragă din context
-            if persoana == 'necunoscut' and rest:
-                # Încearcă să găsească un nume după "de la" sau "de la"
-                import re
-                match = re.search(r'(?:de la|de la)\s+(\w+)', rest.lower())
-                if match:
-                    persoana = match.group(1)
-                else:
-                    # Dacă nu găsește, ia primul cuvânt din rest ca persoană
-                    words = rest.strip().split()
-                    if words:
-                        persoana = words[0]
-            
-            # Determină categoria
-            for cat in ['salariu', 'material', 'transport']:
-                if cat in comment:
-                    categorie = cat
-                    break
-            
-            return tip, obiect, persoana, categorie
-
-    # Reguli speciale pentru Achitat, Avans
-    import re
-    match = re.match(r"(achitat|avans)\s+(\w+)(?:\s+(la|pentru)\s+(\w+))?", comment)
-    if match:
-        persoana = match.group(2)
-        if match.group(3) and match.group(4):
-            obiect = match.group(4)
-        categorie = 'salariu'
-        return tip, obiect, persoana, categorie
-
-    # Regulă specială pentru "Am primit"
-    if comment.startswith('am primit'):
-        tip = 'venit'
-        rest = comment[10:].strip()  # Elimină "am primit"
-        
-        # Încearcă să identifice de la cine este venitul
-        persoane_posibile = ['valerian', 'victor', 'transport', 'bus']
-        persoana = 'necunoscut'
-        
-        # Caută persoana în restul comentariului
-        for pers in persoane_posibile:
-            if pers in rest.lower():
-                persoana = pers
-                break
-        
-        # Dacă nu găsește persoana, încearcă să extragă din context
-        if persoana == 'necunoscut' and rest:
-            # Încearcă să găsească un nume după "de la" sau "de la"
-            match = re.search(r'(?:de la|de la)\s+(\w+)', rest.lower())
-            if match:
-                persoana = match.group(1)
-            else:
-                # Dacă nu găsește, ia primul cuvânt din rest ca persoană
-                words = rest.strip().split()
-                if words:
-                    persoana = words[0]
-        
-        # Determină categoria
-        for cat in ['salariu', 'material', 'transport']:
-            if cat in comment:
-                categorie = cat
-                break
-        
-        return tip, obiect, persoana, categorie
-
-    # Reguli speciale pentru transport
-    match = re.match(r"transport\s+(\w+)", comment)
-    if match:
-        tip = 'cheltuiala'
-        categorie = 'transport'
-        persoana = match.group(1)
-        return tip, obiect, persoana, categorie
-
-    # fallback vechi
-    if any(x in comment for x in ['venit', 'incasare']):
-        tip = 'venit'
-    persoana = next((p for p in persoane if p in comment), 'necunoscut')
-    for cat in ['salariu', 'material', 'transport']:
-        if cat in comment:
-            categorie = cat
-    return tip, obiect, persoana, categorie
+    """Returnează (tip, obiect, persoana, categorie); nu accesează baza de date"""
+    return classifier_cache.get().classify(comment)
 
 
 def calculeaza_raport():
@@ -702,31 +1100,27 @@ def calculeaza_raport():
     # Lista completă de operatori cunoscuți
     operatori_cunoscuti = ['valerian', 'victor']
 
+    # Sumele sunt citite din raport_sumar (un rând pe operator, tip și transfer)
+    venituri_dict, cheltuieli_dict = {}, {}
+    venituri_afisare_dict, cheltuieli_afisare_dict = {}, {}
+    for row in c.execute("SELECT operator, tip, is_transfer, total FROM raport_sumar WHERE tip IN ('venit', 'cheltuiala')"):
+        # Include transferurile în calculul pe operator (pentru sold)
+        total_dict = venituri_dict if row['tip'] == 'venit' else cheltuieli_dict
+        total_dict[row['operator']] = total_dict.get(row['operator'], 0) + row['total']
+        # Pentru afișare în rapoartele separate, exclude transferurile
+        if not row['is_transfer']:
+            afisare_dict = venituri_afisare_dict if row['tip'] == 'venit' else cheltuieli_afisare_dict
+            afisare_dict[row['operator']] = row['total']
+
     # Exclude transferurile din calculul total (transferurile se anulează reciproc)
-    total_venituri = c.execute("SELECT SUM(suma) FROM tranzactii WHERE tip='venit' AND obiect != 'transfer'").fetchone()[0] or 0
-    total_cheltuieli = c.execute("SELECT SUM(suma) FROM tranzactii WHERE tip='cheltuiala' AND obiect != 'transfer'").fetchone()[0] or 0
+    total_venituri = sum(venituri_afisare_dict.values())
+    total_cheltuieli = sum(cheltuieli_afisare_dict.values())
     balanta = total_venituri - total_cheltuieli
-
-    # Include transferurile în calculul pe operator (pentru sold)
-    venituri_op = c.execute("SELECT operator, SUM(suma) FROM tranzactii WHERE tip='venit' GROUP BY operator").fetchall()
-    cheltuieli_op = c.execute("SELECT operator, SUM(suma) FROM tranzactii WHERE tip='cheltuiala' GROUP BY operator").fetchall()
-
-    # Transform în dict pentru calcul sold
-    venituri_dict = {row['operator']: row['SUM(suma)'] for row in venituri_op}
-    cheltuieli_dict = {row['operator']: row['SUM(suma)'] for row in cheltuieli_op}
     
     # Include toți operatorii cunoscuți, chiar dacă nu au tranzacții
     operatori = set(operatori_cunoscuti + list(venituri_dict.keys()) + list(cheltuieli_dict.keys()))
     sold_pe_operator = {op: (venituri_dict.get(op, 0) or 0) - (cheltuieli_dict.get(op, 0) or 0) for op in operatori}
 
-    # Pentru afișare în rapoartele separate, exclude transferurile
-    venituri_afisare = c.execute("SELECT operator, SUM(suma) FROM tranzactii WHERE tip='venit' AND obiect != 'transfer' GROUP BY operator").fetchall()
-    cheltuieli_afisare = c.execute("SELECT operator, SUM(suma) FROM tranzactii WHERE tip='cheltuiala' AND obiect != 'transfer' GROUP BY operator").fetchall()
-
-    # Transform în dict pentru afișare
-    venituri_afisare_dict = {row['operator']: row['SUM(suma)'] for row in venituri_afisare}
-    cheltuieli_afisare_dict = {row['operator']: row['SUM(suma)'] for row in cheltuieli_afisare}
-
     # Creează liste complete pentru venituri și cheltuieli, inclusiv operatorii fără tranzacții
     venituri_complete = []
     for op in operatori:
@@ -750,91 +1144,35 @@ def calculeaza_raport():
     }
 
 def get_backup_list():
-    """Returnează lista tuturor backup-urilor disponibile"""
-    backup_dir = get_backup_dir()
-    backups = []
-    
-    if os.path.exists(backup_dir):
-        for filename in os.listdir(backup_dir):
-            if filename.endswith('.db') and filename.startswith('finance_backup_'):
-                backup_path = os.path.join(backup_dir, filename)
-                info_filename = filename.replace('.db', '.json')
-                info_path = os.path.join(backup_dir, info_filename)
-                
-                backup_info = {
-                    'filename': filename,
-                    'created_at': datetime.fromtimestamp(os.path.getctime(backup_path)).isoformat(),
-                    'size': os.path.getsize(backup_path),
-                    'description': f'Backup din {datetime.fromtimestamp(os.path.getctime(backup_path)).strftime("%Y-%m-%d %H:%M:%S")}'
-                }
-                
-                # Încearcă să citească informațiile din JSON
-                if os.path.exists(info_path):
-                    try:
-                        with open(info_path, 'r', encoding='utf-8') as f:
-                            json_info = json.load(f)
-                            backup_info.update(json_info)
-                    except:
-                        pass
-                
-                backups.append(backup_info)
-    
-    # Sortează după data creării (cel mai recent primul)
-    backups.sort(key=lambda x: x['created_at'], reverse=True)
-    
-    # Șterge backup-urile automate vechi (păstrează doar ultimele 5 backup-uri automate)
-    auto_backups = [b for b in backups if b.get('is_auto_backup', False)]
-    if len(auto_backups) > 5:
-        auto_backups_to_delete = auto_backups[5:]
-        for backup in auto_backups_to_delete:
-            try:
-                backup_path = os.path.join(backup_dir, backup['filename'])
-                info_filename = backup['filename'].replace('.db', '.json')
-                info_path = os.path.join(backup_dir, info_filename)
-                
-                if os.path.exists(backup_path):
-                    os.remove(backup_path)
-                if os.path.exists(info_path):
-                    os.remove(info_path)
-            except:
-                pass
-    
-    # Șterge backup-urile vechi (păstrează doar ultimele 200 backup-uri manuale)
-    manual_backups = [b for b in backups if not b.get('is_auto_backup', False)]
-    if len(manual_backups) > 200:
-        manual_backups_to_delete = manual_backups[200:]
-        for backup in manual_backups_to_delete:
-            try:
-                backup_path = os.path.join(backup_dir, backup['filename'])
-                info_filename = backup['filename'].replace('.db', '.json')
-                info_path = os.path.join(backup_dir, info_filename)
-                
-                if os.path.exists(backup_path):
-                    os.remove(backup_path)
-                if os.path.exists(info_path):
-                    os.remove(info_path)
-            except:
-                pass
-    
-    # Reîncarcă lista finală
-    backups = [b for b in backups if os.path.exists(os.path.join(backup_dir, b['filename']))]
-    
-    return backups
+    """Returnează lista tuturor backup-urilor locale (interogare pe catalog, fără citirea directorului)"""
+    return get_backup_catalog().list(local=True)
+
+def prune_backups():
+    """Aplică politica de retenție din settings.yaml (backup_retention.py), local și pe Google Drive"""
+    drive_delete = None
+    if GDRIVE_AVAILABLE:
+        from gdrive_session import get_drive_session
+        drive_delete = get_drive_session().delete
+    result = apply_retention(get_backup_catalog(), get_backup_dir(), backup_store, load_policy(), drive_delete)
+    for filename, error in result['failed'].items():
+        print(f"⚠️ Eroare la ștergerea backup-ului {filename}: {error}")
+    return result
 
 def restore_backup(backup_filename):
     """Restaurează baza de date din backup"""
     backup_dir = get_backup_dir()
-    backup_path = os.path.join(backup_dir, backup_filename)
     
-    if not os.path.exists(backup_path):
+    if not backup_exists(backup_dir, backup_filename, backup_store):
         return False, "Backup-ul nu există"
     
     try:
         # Creează un backup al bazei actuale înainte de restaurare
         current_backup = create_backup(is_auto_backup=True)
         
-        # Restaurează din backup
-        shutil.copy2(backup_path, DATABASE)
+        # Restaurează din backup (reasamblat din depozit dacă e un backup automat)
+        with open_backup(backup_dir, backup_filename, backup_store) as backup_path:
+            restore_database(backup_path, DATABASE)
+        database_replaced()
         
         return True, f"Restaurare reușită. Backup-ul anterior a fost salvat ca {current_backup}"
     except Exception as e:
@@ -878,9 +1216,7 @@ def index():
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (data, suma, comentariu, operator, tip, obiect, persoana, categorie))
             conn.commit()
-            
-            # Pe Render, forțează salvarea după fiecare tranzacție
-            force_save_on_render()
+            change_notifier.publish('tranzactii', [cursor.lastrowid])
             
             # Generează un nou CSRF token după fiecare tranzacție
             session['csrf_token'] = secrets.token_hex(16)
@@ -950,9 +1286,7 @@ def editare(id):
             WHERE id=?
         ''', (data, suma, comentariu, operator, tip, obiect, persoana, categorie, id))
         conn.commit()
-        
-        # Pe Render, forțează salvarea după fiecare editare
-        force_save_on_render()
+        change_notifier.publish('tranzactii', [id])
         
         return redirect(url_for('index'))
 
@@ -968,13 +1302,12 @@ def editare_istoric(id):
 
     # Verifică dacă tranzacția aparține operatorului curent
     tranzactie = c.execute("SELECT * FROM tranzactii WHERE id=?", (id,)).fetchone()
+    cursor_istoric = request.form.get('cursor') or request.args.get('cursor') or None
     if not tranzactie:
-        pagina = request.args.get('page', 1, type=int)
-        return redirect(url_for('istoric', page=pagina, error='Tranzacția nu există'))
+        return redirect(url_for('istoric', cursor=cursor_istoric, error='Tranzacția nu există'))
     
     if tranzactie['operator'] != session['user']:
-        pagina = request.args.get('page', 1, type=int)
-        return redirect(url_for('istoric', page=pagina, error='Nu poți modifica tranzacții ale altor operatori'))
+        return redirect(url_for('istoric', cursor=cursor_istoric, error='Nu poți modifica tranzacții ale altor operatori'))
 
     if request.method == 'POST':
         suma = float(request.form['suma'])
@@ -988,16 +1321,12 @@ def editare_istoric(id):
             WHERE id=?
         ''', (data, suma, comentariu, operator, tip, obiect, persoana, categorie, id))
         conn.commit()
-        
-        # Pe Render, forțează salvarea după fiecare editare
-        force_save_on_render()
+        change_notifier.publish('tranzactii', [id])
         
         # Redirecționează înapoi în istoric cu pagina curentă
-        pagina = request.form.get('page', request.args.get('page', 1, type=int), type=int)
-        return redirect(url_for('istoric', page=pagina))
+        return redirect(url_for('istoric', cursor=cursor_istoric))
 
-    pagina = request.args.get('page', 1, type=int)
-    return render_template("editare.html", tranzactie=tranzactie, pagina=pagina)
+    return render_template("editare.html", tranzactie=tranzactie, din_istoric=True, cursor_istoric=cursor_istoric)
 
 @app.route('/sterge/<int:id>', methods=['POST', 'GET'])
 def sterge(id):
@@ -1017,9 +1346,7 @@ def sterge(id):
     
     c.execute("DELETE FROM tranzactii WHERE id=?", (id,))
     conn.commit()
-    
-    # Pe Render, forțează salvarea după fiecare ștergere
-    force_save_on_render()
+    change_notifier.publish('tranzactii', [id])
     
     return redirect(url_for('index'))
 
@@ -1033,23 +1360,19 @@ def sterge_istoric(id):
     
     # Verifică dacă tranzacția aparține operatorului curent
     tranzactie = c.execute("SELECT operator FROM tranzactii WHERE id=?", (id,)).fetchone()
+    cursor_istoric = request.args.get('cursor') or None
     if not tranzactie:
-        pagina = request.args.get('page', 1, type=int)
-        return redirect(url_for('istoric', page=pagina, error='Tranzacția nu există'))
+        return redirect(url_for('istoric', cursor=cursor_istoric, error='Tranzacția nu există'))
     
     if tranzactie['operator'] != session['user']:
-        pagina = request.args.get('page', 1, type=int)
-        return redirect(url_for('istoric', page=pagina, error='Nu poți șterge tranzacții ale altor operatori'))
+        return redirect(url_for('istoric', cursor=cursor_istoric, error='Nu poți șterge tranzacții ale altor operatori'))
     
     c.execute("DELETE FROM tranzactii WHERE id=?", (id,))
     conn.commit()
-    
-    # Pe Render, forțează salvarea după fiecare ștergere
-    force_save_on_render()
+    change_notifier.publish('tranzactii', [id])
     
     # Redirecționează înapoi în istoric cu pagina curentă
-    pagina = request.args.get('page', 1, type=int)
-    return redirect(url_for('istoric', page=pagina))
+    return redirect(url_for('istoric', cursor=cursor_istoric))
 
 @app.route('/sterge-multiple', methods=['POST'])
 def sterge_multiple():
@@ -1080,9 +1403,7 @@ def sterge_multiple():
         placeholders_permise = ','.join(['?' for _ in tranzactii_permise])
         c.execute(f"DELETE FROM tranzactii WHERE id IN ({placeholders_permise})", tranzactii_permise)
         conn.commit()
-        
-        # Pe Render, forțează salvarea după ștergerea multiplă
-        force_save_on_render()
+        change_notifier.publish('tranzactii', tranzactii_permise)
         
         deleted_count = c.rowcount
         
@@ -1115,9 +1436,7 @@ def obiecte():
                 
                 c.execute("INSERT INTO obiecte (nume) VALUES (?)", (nume,))
                 conn.commit()
-                
-                # Pe Render, forțează salvarea după adăugarea obiectului
-                force_save_on_render()
+                change_notifier.publish('obiecte', [c.lastrowid])
                 
                 return render_template("obiecte.html", obiecte=c.execute("SELECT * FROM obiecte").fetchall(), 
                                     success=f"Obiectul '{nume}' a fost adăugat cu succes!")
@@ -1235,72 +1554,125 @@ def agent():
 
     return render_template("agent.html", raspuns=raspuns)
 
+class _CsvLine:
+    """Destinație pentru csv.writer care păstrează doar ultima linie scrisă"""
+    def write(self, value):
+        return value
+
+def _csv_chunks(cursor):
+    """Generează CSV-ul în bucăți, citind rândurile cu fetchmany"""
+    writer = csv.writer(_CsvLine())
+    yield writer.writerow([col[0] for col in cursor.description])
+    while True:
+        rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+        if not rows:
+            break
+        yield ''.join(writer.writerow(tuple(row)) for row in rows)
+
+def _csv_filters(args):
+    """Construiește clauza WHERE din filtrele de_la, pana_la (YYYY-MM-DD) și operator"""
+    conditions, params = [], []
+    for name, operator in (('de_la', '>='), ('pana_la', '<=')):
+        value = args.get(name)
+        if value:
+            datetime.strptime(value, '%Y-%m-%d')
+            conditions.append(f'data {operator} ?')
+            params.append(value)
+    if args.get('operator'):
+        conditions.append('operator = ?')
+        params.append(args['operator'])
+    return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
 @app.route('/export/csv')
 def export_csv():
-    conn = get_db()
-    c = conn.cursor()
-    tranzactii = c.execute('SELECT * FROM tranzactii ORDER BY data DESC').fetchall()
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(tranzactii[0].keys() if tranzactii else [])
-    for row in tranzactii:
-        writer.writerow([row[k] for k in row.keys()])
-    output.seek(0)
-    return send_file(io.BytesIO(output.getvalue().encode()), mimetype='text/csv', as_attachment=True, download_name='tranzactii.csv')
+    """Export CSV generat în flux; filtre opționale de_la, pana_la, operator și gzip=1"""
+    try:
+        where, params = _csv_filters(request.args)
+    except ValueError:
+        return 'Data trebuie să fie în formatul YYYY-MM-DD', 400
+    
+    cursor = get_db().execute(f'SELECT * FROM tranzactii{where} ORDER BY data DESC', params)
+    chunks = (chunk.encode('utf-8') for chunk in _csv_chunks(cursor))
+    if request.args.get('gzip') == '1':
+        # Fișier .csv.gz descărcat ca atare, nu comprimare de transport
+        return Response(stream_with_context(_gzip_chunks(chunks)), mimetype='application/gzip',
+                        headers={'Content-Disposition': 'attachment; filename=tranzactii.csv.gz'})
+    return streamed_response(chunks, 'text/csv',
+                             headers={'Content-Disposition': 'attachment; filename=tranzactii.csv'})
+
+def _excel_sheet_name(nume, used):
+    """Nume de foaie valid și unic (Excel limitează la 31 caractere, fără []:*?/\\)"""
+    base = re.sub(r'[\[\]:*?/\\]', '_', f'Obiect_{nume}')[:31]
+    sheet_name, index = base, 1
+    while sheet_name.lower() in used:
+        index += 1
+        suffix = f'~{index}'
+        sheet_name = base[:31 - len(suffix)] + suffix
+    used.add(sheet_name.lower())
+    return sheet_name
 
 @app.route('/export/excel')
 def export_excel():
+    """Export Excel într-o singură trecere prin tranzacții.
+
+    Foile pe obiecte sunt create din același LEFT JOIN care găsește obiectele fără
+    tranzacții; apoi fiecare rând citit este scris în foaia generală și în foaia
+    obiectului său. Modul constant_memory scrie rândurile pe disc pe măsură ce avansează.
+    """
     try:
-        import pandas as pd
+        import xlsxwriter
     except ImportError:
-        return 'Pandas nu este instalat', 500
+        return 'XlsxWriter nu este instalat', 500
     
     conn = get_db()
-    c = conn.cursor()
-    
-    # Toate tranzacțiile
-    tranzactii = c.execute('SELECT * FROM tranzactii ORDER BY data DESC').fetchall()
-    df_tranzactii = pd.DataFrame([dict(row) for row in tranzactii])
-    
-    # Obține lista obiectelor
-    obiecte = c.execute('SELECT * FROM obiecte ORDER BY nume').fetchall()
+    obiecte = conn.execute('''
+        SELECT o.nume, COUNT(t.id) AS tranzactii
+        FROM obiecte o LEFT JOIN tranzactii t ON t.obiect = o.nume
+        GROUP BY o.nume
+        ORDER BY o.nume
+    ''').fetchall()
     
     output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        # Foaia 1: Toate tranzacțiile
-        df_tranzactii.to_excel(writer, sheet_name='Toate Tranzacțiile', index=False)
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    try:
+        cursor = conn.execute('SELECT * FROM tranzactii ORDER BY data DESC')
+        header = [col[0] for col in cursor.description]
+        obiect_col = header.index('obiect')
         
-        # Foi separate pentru fiecare obiect
+        # Foaia 1: Toate tranzacțiile; apoi câte o foaie pentru fiecare obiect cu tranzacții
+        toate = workbook.add_worksheet('Toate Tranzacțiile')
+        toate.write_row(0, 0, header)
+        used = {toate.name.lower()}
+        foi = {}
         for obiect in obiecte:
-            nume_obiect = obiect['nume']
-            # Tranzacții pentru acest obiect
-            tranzactii_obiect = c.execute('''
-                SELECT * FROM tranzactii 
-                WHERE obiect = ? 
-                ORDER BY data DESC
-            ''', (nume_obiect,)).fetchall()
-            
-            if tranzactii_obiect:  # Doar dacă există tranzacții pentru acest obiect
-                df_obiect = pd.DataFrame([dict(row) for row in tranzactii_obiect])
-                # Numele foii nu poate conține caractere speciale
-                sheet_name = f'Obiect_{nume_obiect}'[:31]  # Excel limitează la 31 caractere
-                df_obiect.to_excel(writer, sheet_name=sheet_name, index=False)
+            if obiect['tranzactii']:
+                sheet = workbook.add_worksheet(_excel_sheet_name(obiect['nume'], used))
+                sheet.write_row(0, 0, header)
+                foi[obiect['nume']] = [sheet, 1]
         
-        # Foaia pentru obiecte fără tranzacții
-        obiecte_fara_tranzactii = []
-        for obiect in obiecte:
-            nume_obiect = obiect['nume']
-            count = c.execute('SELECT COUNT(*) FROM tranzactii WHERE obiect = ?', (nume_obiect,)).fetchone()[0]
-            if count == 0:
-                obiecte_fara_tranzactii.append({
-                    'nume_obiect': nume_obiect,
-                    'tranzactii': 0,
-                    'status': 'Fără tranzacții'
-                })
+        row_index = 1
+        while True:
+            rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                values = tuple(row)
+                toate.write_row(row_index, 0, values)
+                row_index += 1
+                foaie = foi.get(values[obiect_col])
+                if foaie:
+                    foaie[0].write_row(foaie[1], 0, values)
+                    foaie[1] += 1
         
-        if obiecte_fara_tranzactii:
-            df_fara_tranzactii = pd.DataFrame(obiecte_fara_tranzactii)
-            df_fara_tranzactii.to_excel(writer, sheet_name='Obiecte Fără Tranzacții', index=False)
+        # Foaia pentru obiecte fără tranzacții
+        fara_tranzactii = [obiect['nume'] for obiect in obiecte if not obiect['tranzactii']]
+        if fara_tranzactii:
+            sheet = workbook.add_worksheet('Obiecte Fără Tranzacții')
+            sheet.write_row(0, 0, ['nume_obiect', 'tranzactii', 'status'])
+            for index, nume in enumerate(fara_tranzactii, 1):
+                sheet.write_row(index, 0, [nume, 0, 'Fără tranzacții'])
+    finally:
+        workbook.close()
     
     output.seek(0)
     return send_file(output, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', as_attachment=True, download_name='tranzactii_complete.xlsx')
@@ -1334,122 +1706,450 @@ def export_pdf():
     output.seek(0)
     return send_file(output, mimetype='application/pdf', as_attachment=True, download_name='tranzactii.pdf')
 
+def encode_page_token(data):
+    """Token opac de continuare (JSON codat base64)"""
+    return base64.urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def decode_page_token(token):
+    """Decodează un token creat cu encode_page_token(); None dacă este invalid"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return data if isinstance(data, dict) else None
+    except (ValueError, TypeError):
+        return None
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def streamed_response(chunks, mimetype, headers=None):
+    """Răspuns generat incremental; comprimat gzip dacă clientul îl acceptă"""
+    chunks = (chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in chunks)
+    headers = dict(headers or {})
+    headers['Vary'] = 'Accept-Encoding'
+    if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+        chunks = _gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+def _stream_rows(cursor, counter):
+    """Serializează rândurile unui cursor ca elemente JSON, citind în loturi"""
+    while True:
+        rows = cursor.fetchmany(EXPORT_FETCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            counter['count'] += 1
+            counter['last_id'] = row['id']
+            yield ('' if counter['count'] == 1 else ',') + json.dumps(dict(row), ensure_ascii=False)
+
+def _export_full(conn, state, limit, token):
+    """Exportul complet, paginat după (tabel, id)"""
+    faza = token.get('faza', 'obiecte')
+    dupa = token.get('dupa', 0)
+    seq = token.get('seq', state['change_seq'])
+    remaining = limit
+    next_token = None
+    totals = {}
+    
+    yield '{"export_date":' + json.dumps(datetime.now().isoformat())
+    yield ',"epoch":' + json.dumps(state['epoch'])
+    for table in ('obiecte', 'tranzactii'):
+        counter = {'count': 0, 'last_id': None}
+        yield f',"{table}":['
+        if table == 'tranzactii' and faza == 'obiecte':
+            faza, dupa = 'tranzactii', 0
+        if table == faza and (remaining is None or remaining > 0):
+            cursor = conn.execute(f"SELECT * FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                                  (dupa, remaining if remaining is not None else -1))
+            yield from _stream_rows(cursor, counter)
+            if remaining is not None:
+                remaining -= counter['count']
+                if remaining == 0 and next_token is None:
+                    next_token = encode_page_token({'faza': table, 'dupa': counter['last_id'] or dupa, 'seq': seq})
+        yield ']'
+        totals[table] = counter['count']
+    
+    yield f',"total_obiecte":{totals["obiecte"]},"total_tranzactii":{totals["tranzactii"]}'
+    yield ',"seq":' + json.dumps(seq) + ',"next":' + json.dumps(next_token) + '}'
+
+def _export_since(conn, state, since, limit):
+    """Rândurile inserate/modificate și ID-urile șterse după secvența `since`"""
+    upper = state['change_seq']
+    next_token = None
+    if limit is not None:
+        row = conn.execute("SELECT seq FROM sync_rows WHERE seq > ? ORDER BY seq LIMIT 1 OFFSET ?",
+                           (since, limit)).fetchone()
+        if row is not None:
+            # Pagina se oprește înaintea primei modificări care nu mai încape
+            upper = row['seq'] - 1
+            next_token = encode_page_token({'since': upper})
+    
+    yield '{"export_date":' + json.dumps(datetime.now().isoformat())
+    yield ',"epoch":' + json.dumps(state['epoch'])
+    totals = {}
+    for table in ('obiecte', 'tranzactii'):
+        counter = {'count': 0, 'last_id': None}
+        yield f',"{table}":['
+        cursor = conn.execute(f'''
+            SELECT t.* FROM sync_rows s JOIN {table} t ON t.id = s.row_id
+            WHERE s.tabel = ? AND s.deleted = 0 AND s.seq > ? AND s.seq <= ?
+            ORDER BY s.seq
+        ''', (table, since, upper))
+        yield from _stream_rows(cursor, counter)
+        yield ']'
+        totals[table] = counter['count']
+    
+    deleted = {table: [] for table in TRACKED_TABLES}
+    for row in conn.execute("SELECT tabel, row_id FROM sync_rows WHERE deleted = 1 AND seq > ? AND seq <= ? ORDER BY seq",
+                            (since, upper)):
+        deleted[row['tabel']].append(row['row_id'])
+    yield ',"deleted":' + json.dumps(deleted)
+    yield f',"total_obiecte":{totals["obiecte"]},"total_tranzactii":{totals["tranzactii"]}'
+    yield ',"seq":' + json.dumps(upper) + ',"next":' + json.dumps(next_token) + '}'
+
 @app.route('/api/export')
 def export_json():
-    """Export JSON pentru sincronizare cu aplicația locală"""
+    """Export JSON pentru sincronizare cu aplicația locală.
+
+    Parametri opționali: since=<seq> (doar modificările de după secvență),
+    limit=<n> (mărimea paginii) și cursor=<token> (continuarea din câmpul `next`).
+    Răspunsul este generat incremental și comprimat gzip la cerere.
+    """
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, EXPORT_PAGE_LIMIT))
+    token = {}
+    if request.args.get('cursor'):
+        token = decode_page_token(request.args['cursor'])
+        if token is None:
+            return jsonify({'error': 'Cursor invalid'}), 400
+    since = token.get('since', request.args.get('since', type=int))
+    
     conn = get_db()
-    c = conn.cursor()
+    state = conn.execute("SELECT change_seq, purged_seq, epoch FROM sync_state WHERE id = 1").fetchone()
+    if since is not None:
+        epoch = request.args.get('epoch')
+        if since < state['purged_seq'] or since > state['change_seq'] or (epoch and epoch != state['epoch']):
+            return jsonify({'error': 'Cursorul este prea vechi - este necesar un export complet',
+                            'full_export_required': True}), 409
+    
+    def generate():
+        # O singură tranzacție de citire pentru toată pagina
+        conn.execute("BEGIN")
+        try:
+            if since is not None:
+                yield from _export_since(conn, state, since, limit)
+            else:
+                yield from _export_full(conn, state, limit, token)
+        finally:
+            conn.rollback()
     
-    # Obține toate tranzacțiile
-    tranzactii = c.execute('SELECT * FROM tranzactii ORDER BY data DESC').fetchall()
-    tranzactii_list = [dict(row) for row in tranzactii]
-    
-    # Obține toate obiectele
-    obiecte = c.execute('SELECT * FROM obiecte ORDER BY nume').fetchall()
-    obiecte_list = [dict(row) for row in obiecte]
-    
-    # Creează răspunsul JSON
-    response_data = {
-        'tranzactii': tranzactii_list,
-        'obiecte': obiecte_list,
-        'export_date': datetime.now().isoformat(),
-        'total_tranzactii': len(tranzactii_list),
-        'total_obiecte': len(obiecte_list)
-    }
+    return streamed_response(generate(), 'application/json')
+
+@app.route('/api/changes')
+def export_changes():
+    """Modificările de după secvența `since`, paginate, pentru sincronizare incrementală"""
+    since = request.args.get('since', 0, type=int)
+    limit = max(1, min(request.args.get('limit', CHANGES_PAGE_LIMIT, type=int), CHANGES_PAGE_LIMIT))
+    
+    conn = get_db()
+    epoch = conn.execute("SELECT epoch FROM sync_state WHERE id = 1").fetchone()['epoch']
+    changes = get_changes_since(conn, since, limit + 1)
+    has_more = len(changes) > limit
+    changes = changes[:limit]
     
-    return jsonify(response_data)
+    return jsonify({
+        'changes': changes,
+        'last_seq': changes[-1]['seq'] if changes else since,
+        'has_more': has_more,
+        'epoch': epoch
+    })
+
+def _ndjson_records(stream):
+    """Citește un corp NDJSON linie cu linie: (tabel, rând) sau (None, eroare)"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield None, f"linia {line_no}: JSON invalid ({e})"
+            continue
+        if not isinstance(record, dict):
+            yield None, f"linia {line_no}: se aștepta un obiect JSON"
+            continue
+        yield record.pop('tabel', None) or f"linia {line_no}", record
+
+def _update_sql(table):
+    """UPDATE pentru upsert: doar rândurile existente ale căror valori diferă.
+
+    Nu se folosește INSERT ... ON CONFLICT: clauza de conflict a instrucțiunii
+    exterioare ar înlocui INSERT OR REPLACE din trigger-ele sync_rows.
+    """
+    tracked = TRACKED_COLUMNS[table]
+    placeholders = ', '.join('?' for _ in tracked)
+    return (f"UPDATE {table} SET {', '.join(f'{col} = ?' for col in tracked)} "
+            f"WHERE id = ? AND ({', '.join(tracked)}) IS NOT ({placeholders})")
+
+def bulk_import(conn, records, batch_size=IMPORT_BATCH_SIZE, upsert=False):
+    """Importă înregistrări (tabel, rând) cu executemany, într-o singură tranzacție.
+
+    Fiecare lot rulează într-un SAVEPOINT: un lot invalid este anulat și raportat,
+    fără să afecteze celelalte. Rândurile existente (același id) sunt ignorate,
+    iar cu upsert=True sunt actualizate (și numărate ca importate).
+    """
+    stats = {table: {'importate': 0, 'ignorate': 0} for table in TRACKED_TABLES}
+    errors = []
+    pending = {table: [] for table in TRACKED_TABLES}
+    invalid = {table: [] for table in TRACKED_TABLES}
+    invalid_records = []
+    batches = 0
+    
+    def flush(table):
+        nonlocal batches
+        rows = pending[table]
+        if not rows and not invalid[table]:
+            return
+        batches += 1
+        if invalid[table]:
+            errors.append({'batch': batches, 'tabel': table, 'randuri_invalide': len(invalid[table]),
+                           'eroare': invalid[table][0]})
+            invalid[table] = []
+        if not rows:
+            return
+        columns = ('id',) + TRACKED_COLUMNS[table]
+        conn.execute("SAVEPOINT import_batch")
+        try:
+            updated = 0
+            if upsert:
+                updated = conn.executemany(_update_sql(table), [row[1:] + row[:1] + row[1:] for row in rows]).rowcount
+            cursor = conn.executemany(
+                f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                rows
+            )
+            conn.execute("RELEASE import_batch")
+            stats[table]['importate'] += updated + cursor.rowcount
+            stats[table]['ignorate'] += len(rows) - updated - cursor.rowcount
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK TO import_batch")
+            conn.execute("RELEASE import_batch")
+            errors.append({'batch': batches, 'tabel': table, 'randuri': len(rows), 'eroare': str(e)})
+        pending[table] = []
+    
+    conn.execute("BEGIN")
+    try:
+        for table, record in records:
+            if table not in pending:
+                invalid_records.append(record if table is None else f"tabel necunoscut: {table}")
+                continue
+            try:
+                pending[table].append((record.get('id'),) + tuple(record[col] for col in TRACKED_COLUMNS[table]))
+            except (KeyError, TypeError, AttributeError) as e:
+                invalid[table].append(f"câmp lipsă sau invalid: {e}")
+                continue
+            if len(pending[table]) >= batch_size:
+                flush(table)
+        for table in TRACKED_TABLES:
+            flush(table)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    
+    if invalid_records:
+        errors.append({'batch': None, 'randuri_invalide': len(invalid_records), 'eroare': invalid_records[0]})
+    return {'stats': stats, 'errors': errors, 'batches': batches}
 
 @app.route('/api/import', methods=['POST'])
 def import_json():
-    """Importă datele din format JSON"""
+    """Importă datele din format JSON sau NDJSON.
+
+    NDJSON (application/x-ndjson) este citit în flux, o înregistrare pe linie,
+    cu câmpul `tabel` ('tranzactii' sau 'obiecte'), pentru importuri mari.
+    Cu ?mode=upsert, rândurile existente (același id) sunt actualizate.
+    """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'Nu s-au primit date'})
+        upsert = request.args.get('mode') == 'upsert'
+        if request.mimetype in NDJSON_MIMETYPES:
+            records = _ndjson_records(request.stream)
+        else:
+            data = request.get_json()
+            if not data:
+                return jsonify({'error': 'Nu s-au primit date'})
+            records = ((table, row) for table in ('obiecte', 'tranzactii') for row in data.get(table) or [])
         
         conn = get_db()
-        cursor = conn.cursor()
-        
-        tranzactii_importate = 0
-        obiecte_importate = 0
+        seq_before = conn.execute("SELECT change_seq FROM sync_state WHERE id = 1").fetchone()[0]
+        result = bulk_import(conn, records, upsert=upsert)
         
-        # Importă obiectele
-        if 'obiecte' in data:
-            for obiect in data['obiecte']:
-                try:
-                    cursor.execute("INSERT OR IGNORE INTO obiecte (id, nume) VALUES (?, ?)", 
-                                 (obiect['id'], obiect['nume']))
-                    obiecte_importate += 1
-                except Exception as e:
-                    print(f"Eroare la import obiect {obiect['nume']}: {e}")
-        
-        # Importă tranzacțiile
-        if 'tranzactii' in data:
-            for tranzactie in data['tranzactii']:
-                try:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO tranzactii 
-                        (id, data, suma, comentariu, operator, tip, obiect, persoana, categorie)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        tranzactie['id'],
-                        tranzactie['data'],
-                        tranzactie['suma'],
-                        tranzactie['comentariu'],
-                        tranzactie['operator'],
-                        tranzactie['tip'],
-                        tranzactie['obiect'],
-                        tranzactie['persoana'],
-                        tranzactie['categorie']
-                    ))
-                    tranzactii_importate += 1
-                except Exception as e:
-                    print(f"Eroare la import tranzacție {tranzactie['id']}: {e}")
-        
-        conn.commit()
-        conn.close()
+        # Notifică clienții cu ID-urile inserate (limitate la SYNC_DELTA_LIMIT)
+        changed = conn.execute('''
+            SELECT tabel, row_id FROM sync_rows WHERE seq > ? ORDER BY seq LIMIT ?
+        ''', (seq_before, SYNC_DELTA_LIMIT + 1)).fetchall()
+        truncated = len(changed) > SYNC_DELTA_LIMIT
+        for table in TRACKED_TABLES:
+            ids = [row['row_id'] for row in changed[:SYNC_DELTA_LIMIT] if row['tabel'] == table]
+            if ids or (truncated and result['stats'][table]['importate']):
+                change_notifier.publish(table, ids, truncated=truncated)
         
+        stats = result['stats']
         return jsonify({
             'success': True,
-            'tranzactii_importate': tranzactii_importate,
-            'obiecte_importate': obiecte_importate,
+            'mode': 'upsert' if upsert else 'insert',
+            'tranzactii_importate': stats['tranzactii']['importate'],
+            'obiecte_importate': stats['obiecte']['importate'],
+            'tranzactii_ignorate': stats['tranzactii']['ignorate'],
+            'obiecte_ignorate': stats['obiecte']['ignorate'],
+            'batches': result['batches'],
+            'errors': result['errors'],
             'imported_at': datetime.now().isoformat()
         })
         
     except Exception as e:
         return jsonify({'error': str(e)})
 
+@app.route('/autocomplete')
+def autocomplete():
+    """Sugestii pentru câmpul de comentariu, servite din indexul în memorie"""
+    if 'user' not in session:
+        return jsonify([]), 401
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify([])
+    limit = max(1, min(request.args.get('limit', AUTOCOMPLETE_LIMIT, type=int), AUTOCOMPLETE_LIMIT))
+    return jsonify(autocomplete_index.suggest(q, limit))
+
+@app.route('/reclasificare', methods=['POST'])
+def reclasificare():
+    """Pornește (sau oprește, cu actiune=stop) reclasificarea tranzacțiilor existente"""
+    if 'user' not in session:
+        return jsonify({'error': 'Neautentificat'}), 401
+    if request.form.get('actiune') == 'stop':
+        reclassification_job.stop()
+        return jsonify({'success': True, 'status': reclassification_job.status()})
+    if not reclassification_job.start():
+        return jsonify({'error': 'Reclasificarea rulează deja', 'status': reclassification_job.status()}), 409
+    return jsonify({'success': True, 'status': reclassification_job.status()})
+
+@app.route('/reclasificare/status')
+def reclasificare_status():
+    if 'user' not in session:
+        return jsonify({'error': 'Neautentificat'}), 401
+    return jsonify(reclassification_job.status())
+
+ISTORIC_PER_PAGINA = 50
+
+# Numărul de tranzacții, păstrat până la următoarea modificare a bazei de date
+_count_cache = {'token': None, 'count': 0}
+
+def count_tranzactii(conn):
+    """Numărul total de tranzacții, recalculat doar după o scriere (din raport_sumar)"""
+    token = get_db_hash()
+    if _count_cache['token'] != token:
+        count = conn.execute("SELECT COALESCE(SUM(numar), 0) FROM raport_sumar").fetchone()[0]
+        _count_cache.update(token=token, count=count)
+    return _count_cache['count']
+
+def pagina_istoric(conn, token, per_pagina=ISTORIC_PER_PAGINA):
+    """O pagină din istoric, ordonată după (data DESC, id DESC), cu paginare keyset.
+
+    token este dicționarul decodat din parametrul `cursor` (sau None pentru prima
+    pagină): {'dir': 'next'|'prev'|'last', 'data', 'id', 'pagina'}. Fiecare pagină
+    pornește de la cheia (data, id) a vecinei, deci costul nu depinde de poziție.
+    Returnează (rânduri, token_urmator, token_anterior, numar_pagina).
+    """
+    directie = (token or {}).get('dir')
+    if directie in ('next', 'prev') and not {'data', 'id'} <= token.keys():
+        directie = None
+    pagina = (token or {}).get('pagina')
+    if not isinstance(pagina, int):
+        pagina = 1
+    
+    if directie == 'next':
+        rows = conn.execute('''
+            SELECT * FROM tranzactii WHERE (data, id) < (?, ?)
+            ORDER BY data DESC, id DESC LIMIT ?
+        ''', (token['data'], token['id'], per_pagina + 1)).fetchall()
+        if not rows:
+            # Pagina a rămas goală (ștergeri între timp) - afișează ultima pagină
+            return pagina_istoric(conn, {'dir': 'last'}, per_pagina)
+        has_prev, has_next = True, len(rows) > per_pagina
+        rows = rows[:per_pagina]
+    elif directie in ('prev', 'last'):
+        if directie == 'prev':
+            rows = conn.execute('''
+                SELECT * FROM tranzactii WHERE (data, id) > (?, ?)
+                ORDER BY data ASC, id ASC LIMIT ?
+            ''', (token['data'], token['id'], per_pagina + 1)).fetchall()
+            has_prev = len(rows) > per_pagina
+            if not has_prev:
+                # Am ajuns la început - afișează prima pagină completă
+                return pagina_istoric(conn, None, per_pagina)
+            rows = rows[:per_pagina]
+        else:
+            # Ultima pagină are restul rândurilor, ca la parcurgerea înainte
+            total = count_tranzactii(conn)
+            rest = total % per_pagina or per_pagina
+            rows = conn.execute(
+                "SELECT * FROM tranzactii ORDER BY data ASC, id ASC LIMIT ?", (rest,)
+            ).fetchall()
+            has_prev = total > rest
+        has_next = directie == 'prev'
+        rows = rows[::-1]
+    else:
+        rows = conn.execute(
+            "SELECT * FROM tranzactii ORDER BY data DESC, id DESC LIMIT ?", (per_pagina + 1,)
+        ).fetchall()
+        has_prev, has_next = False, len(rows) > per_pagina
+        rows = rows[:per_pagina]
+        pagina = 1
+    
+    total_pagini = max(1, (count_tranzactii(conn) + per_pagina - 1) // per_pagina)
+    if directie == 'last':
+        pagina = total_pagini
+    pagina = max(1, min(pagina, total_pagini))
+    
+    token_urmator = token_anterior = None
+    if has_next:
+        token_urmator = encode_page_token({'dir': 'next', 'data': rows[-1]['data'], 'id': rows[-1]['id'], 'pagina': pagina + 1})
+    if has_prev:
+        token_anterior = encode_page_token({'dir': 'prev', 'data': rows[0]['data'], 'id': rows[0]['id'], 'pagina': pagina - 1})
+    return rows, token_urmator, token_anterior, pagina
+
 @app.route('/istoric')
 def istoric():
     if 'user' not in session:
         return redirect(url_for('login'))
     
-    # Parametri de paginare
-    pagina = request.args.get('page', 1, type=int)
-    tranzactii_per_pagina = 50
-    offset = (pagina - 1) * tranzactii_per_pagina
+    # Parametri de paginare: `cursor` este un token opac primit de la pagina anterioară
+    cursor_curent = request.args.get('cursor') or None
+    token = decode_page_token(cursor_curent) if cursor_curent else None
     
     conn = get_db()
-    c = conn.cursor()
-    
-    # Numărul total de tranzacții
-    total_tranzactii = c.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0]
-    total_pagini = (total_tranzactii + tranzactii_per_pagina - 1) // tranzactii_per_pagina
+    tranzactii, token_urmator, token_anterior, pagina = pagina_istoric(conn, token)
     
-    # Obține tranzacțiile pentru pagina curentă
-    tranzactii = c.execute("""
-        SELECT * FROM tranzactii 
-        ORDER BY data DESC, id DESC 
-        LIMIT ? OFFSET ?
-    """, (tranzactii_per_pagina, offset)).fetchall()
+    # Numărul total de tranzacții (din cache, invalidat la scrieri)
+    total_tranzactii = count_tranzactii(conn)
+    total_pagini = max(1, (total_tranzactii + ISTORIC_PER_PAGINA - 1) // ISTORIC_PER_PAGINA)
     
     error = request.args.get('error')
     return render_template('istoric.html', 
                          tranzactii=tranzactii, 
                          pagina_curenta=pagina,
                          total_pagini=total_pagini,
-                         tranzactii_per_pagina=tranzactii_per_pagina,
+                         tranzactii_per_pagina=ISTORIC_PER_PAGINA,
                          total_tranzactii=total_tranzactii,
+                         cursor_curent=cursor_curent,
+                         cursor_urmator=token_urmator,
+                         cursor_anterior=token_anterior,
+                         cursor_ultima=encode_page_token({'dir': 'last'}),
                          user=session['user'],
                          error=error)
 
@@ -1475,6 +2175,7 @@ def sterge_obiect(id):
         # Șterge obiectul
         c.execute("DELETE FROM obiecte WHERE id=?", (id,))
         conn.commit()
+        change_notifier.publish('obiecte', [id])
         
         return redirect(url_for('obiecte', success=f'Obiectul "{obiect["nume"]}" a fost șters cu succes!'))
         
@@ -1506,6 +2207,7 @@ def modifica_obiect(id):
                 
                 c.execute("UPDATE obiecte SET nume=? WHERE id=?", (nume_nou, id))
                 conn.commit()
+                change_notifier.publish('obiecte', [id])
                 print(f"Obiect modificat: ID={id}, nume nou={nume_nou}")
                 return redirect(url_for('obiecte'))
             except Exception as e:
@@ -1549,20 +2251,21 @@ def transfer():
             comentariu_to = f"Transfer de la {operator_from}: {comentariu}"
             
             # Tranzacție pentru operatorul care transferă (cheltuială)
-            tip_from, obiect_from, persoana_from, categorie_from = classify_entry(comentariu_from)
             c.execute('''
                 INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (data, suma, comentariu_from, operator_from, 'cheltuiala', 'transfer', operator_to, 'transfer'))
+            id_from = c.lastrowid
             
             # Tranzacție pentru operatorul care primește (venit)
-            tip_to, obiect_to, persoana_to, categorie_to = classify_entry(comentariu_to)
             c.execute('''
                 INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             ''', (data, suma, comentariu_to, operator_to, 'venit', 'transfer', operator_from, 'transfer'))
+            id_to = c.lastrowid
             
             conn.commit()
+            change_notifier.publish('tranzactii', [id_from, id_to])
             return redirect(url_for('transfer', success=f'Transfer realizat cu succes: {suma} lei de la {operator_from} către {operator_to}'))
             
         except Exception as e:
@@ -1616,15 +2319,9 @@ def backup():
                     backup_filename = backup_system.create_backup(upload_to_gdrive_flag=True)
                     gdrive_status = ""
                     try:
-                        backup_dir = backup_system.backup_dir
-                        json_file = backup_dir / f"{backup_filename.replace('.db', '.json')}"
-                        if json_file.exists():
-                            with open(json_file, 'r', encoding='utf-8') as f:
-                                info = json.load(f)
-                            if info.get('gdrive_id'):
-                                gdrive_status = " + Google Drive"
-                            else:
-                                gdrive_status = " (Google Drive: Eroare)"
+                        info = backup_system.catalog.get(backup_filename)
+                        if info and info.get('gdrive_id'):
+                            gdrive_status = " + Google Drive"
                         else:
                             gdrive_status = " (Google Drive: Eroare)"
                     except Exception as e:
@@ -1637,9 +2334,10 @@ def backup():
                 backup_filename = request.form.get('backup_file')
                 if backup_filename:
                     try:
-                        backup_system.create_backup(upload_to_gdrive_flag=True)
+                        backup_system.create_backup(upload_to_gdrive_flag=True, is_auto_backup=True)
                         success, message = backup_system.restore_backup(backup_filename)
                         if success:
+                            database_replaced()
                             return redirect(url_for('backup', success=message))
                         else:
                             return redirect(url_for('backup', error=message))
@@ -1652,32 +2350,24 @@ def backup():
                 backup_filename = request.form.get('backup_file')
                 if backup_filename:
                     try:
-                        # Șterge din local
-                        backup_path = backup_system.backup_dir / backup_filename
-                        info_path = backup_system.backup_dir / f"{backup_filename.replace('.db', '.json')}"
-                        
                         # Verifică dacă backup-ul există pe Google Drive și îl șterge
                         gdrive_deleted = False
-                        if info_path.exists():
-                            with open(info_path, 'r', encoding='utf-8') as f:
-                                info = json.load(f)
-                                if info.get('gdrive_id'):
-                                    try:
-                                        from auto_backup import gdrive_auth
-                                        drive = gdrive_auth()
-                                        if drive:
-                                            file_drive = drive.CreateFile({'id': info['gdrive_id']})
-                                            file_drive.Delete()
-                                            gdrive_deleted = True
-                                            print(f"✅ Backup șters de pe Google Drive: {backup_filename}")
-                                    except Exception as e:
-                                        print(f"⚠️ Eroare la ștergerea de pe Google Drive: {e}")
+                        info = backup_system.catalog.get(backup_filename)
+                        if info and info.get('gdrive_id'):
+                            try:
+                                from gdrive_session import get_drive_session
+                                get_drive_session().delete(info['gdrive_id'])
+                                gdrive_deleted = True
+                                print(f"✅ Backup șters de pe Google Drive: {backup_filename}")
+                            except Exception as e:
+                                print(f"⚠️ Eroare la ștergerea de pe Google Drive: {e}")
                         
-                        # Șterge fișierele locale
-                        if backup_path.exists():
-                            backup_path.unlink()
-                        if info_path.exists():
-                            info_path.unlink()
+                        # Șterge fișierele locale (sau manifestul din depozitul deduplicat)
+                        delete_backup(backup_system.backup_dir, backup_filename, backup_system.store)
+                        if gdrive_deleted:
+                            backup_system.catalog.remove([backup_filename])
+                        else:
+                            backup_system.catalog.set_local(backup_filename, False)
                         
                         success_msg = f'Backup șters: {backup_filename}'
                         if gdrive_deleted:
@@ -1696,6 +2386,7 @@ def backup():
                 try:
                     success, message = backup_system.sync_with_local(local_db_path)
                     if success:
+                        database_replaced()
                         return redirect(url_for('backup', success=message))
                     else:
                         return redirect(url_for('backup', error=message))
@@ -1757,8 +2448,8 @@ if __name__ == '__main__':
         print(f"Starting AI Finance App on port {port}")
         print("Database will be initialized automatically")
         
-        # Inițializează baza de date înainte de pornire
-        init_db()
+        # Inițializează baza de date înainte de pornire (no-op dacă s-a făcut la import)
+        ensure_db_initialized()
         print("Database initialized successfully")
         
         # Resetează tracking-ul pentru backup automat
@@ -158,7 +158,9 @@ def verify_persistence_fix():
             return False
         
         # Verifică că backup-ul se face mai frecvent pe Render
-        if "BACKUP_INTERVAL_RENDER" in content:
+        with open('runtime_profile.py', 'r', encoding='utf-8') as f:
+            profile_content = f.read()
+        if "BACKUP_INTERVAL_RENDER" in profile_content:
             print("✅ Backup mai frecvent pe Render este configurat")
         else:
             print("❌ Backup mai frecvent pe Render nu este configurat")
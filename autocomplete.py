@@ -0,0 +1,173 @@
+"""
+Index în memorie pentru sugestiile de autocompletare (/autocomplete).
+
+Sugestiile vin din comentariile folosite anterior, numele obiectelor și
+persoanele din tranzacții, ordonate după frecvență. Indexul este construit o
+dată la pornire și actualizat incremental din change_log după fiecare scriere,
+astfel încât o căutare nu atinge niciodată SQLite.
+"""
+
+import sqlite3
+import threading
+import unicodedata
+
+from change_log import get_changes_since
+
+# Numărul de sugestii păstrate pe fiecare nod (și returnate cel mult)
+AUTOCOMPLETE_LIMIT = 10
+# Termenii mai lungi nu sunt indexați (comentarii lungi, lipite din altă parte)
+AUTOCOMPLETE_MAX_LENGTH = 100
+# Obiectul atribuit de clasificator când nu recunoaște nimic
+OBIECT_NECUNOSCUT = 'necunoscut'
+
+def normalize(text):
+    """Cheia de căutare: litere mici, fără diacritice, spații comprimate"""
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.split())
+
+class _Node:
+    __slots__ = ('children', 'count', 'display', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.count = 0
+        self.display = None
+        self.top = None
+
+class PrefixIndex:
+    """Trie cu frecvențe; fiecare nod ține în cache cele mai frecvente completări.
+
+    Cache-ul unui nod este invalidat doar pe drumul termenului modificat, deci
+    o actualizare costă O(lungimea termenului), iar o căutare O(lungimea prefixului).
+    """
+
+    def __init__(self, limit=AUTOCOMPLETE_LIMIT):
+        self.limit = limit
+        self._root = _Node()
+
+    def add(self, term, delta=1):
+        """Modifică frecvența unui termen (delta negativ la ștergere)"""
+        if not term:
+            return
+        term = ' '.join(str(term).split())
+        key = normalize(term)
+        if not key or len(key) > AUTOCOMPLETE_MAX_LENGTH:
+            return
+        node = self._root
+        node.top = None
+        for ch in key:
+            node = node.children.setdefault(ch, _Node())
+            node.top = None
+        node.count = max(0, node.count + delta)
+        if delta > 0 or node.display is None:
+            node.display = term
+
+    def suggest(self, prefix, limit=None):
+        """Cele mai frecvente completări ale prefixului"""
+        node = self._root
+        for ch in normalize(prefix):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return [display for _, display in self._top(node)[:limit or self.limit]]
+
+    def _top(self, node):
+        if node.top is None:
+            candidates = [(node.count, node.display)] if node.count > 0 else []
+            for child in node.children.values():
+                candidates.extend(self._top(child))
+            candidates.sort(key=lambda item: (-item[0], item[1].lower()))
+            node.top = candidates[:self.limit]
+        return node.top
+
+class AutocompleteIndex:
+    """Indexul de autocompletare pentru o bază de date, ținut la zi din change_log.
+
+    Nu păstrează rândurile: frecvența vechilor valori este scăzută din intrările
+    jurnalului (`anterior` la UPDATE, valorile șterse la DELETE).
+    """
+
+    def __init__(self, database):
+        self.database = database
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._index = None
+        self._seq = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.database)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _terms(self, values):
+        """Termenii contribuiți de o tranzacție: comentariul, persoana și obiectul"""
+        obiect = values.get('obiect')
+        return [values.get('comentariu'), values.get('persoana'), obiect if obiect != OBIECT_NECUNOSCUT else None]
+
+    def rebuild(self):
+        """Construiește indexul de la zero (la pornire și după o restaurare)"""
+        with self._refresh_lock:
+            self._rebuild()
+
+    def _rebuild(self):
+        index = PrefixIndex()
+        conn = self._connect()
+        try:
+            seq = conn.execute("SELECT change_seq FROM sync_state WHERE id = 1").fetchone()[0]
+            for row in conn.execute("SELECT comentariu, persoana, obiect FROM tranzactii"):
+                for term in self._terms(dict(row)):
+                    index.add(term)
+            for row in conn.execute("SELECT nume FROM obiecte"):
+                index.add(row['nume'])
+        finally:
+            conn.close()
+        index.suggest('')  # precalculează sugestiile pe toate nodurile
+        with self._lock:
+            self._index, self._seq = index, seq
+
+    def refresh(self):
+        """Aplică modificările din change_log de după ultima secvență văzută"""
+        with self._refresh_lock:
+            if self._index is None:
+                self._rebuild()
+                return
+            conn = self._connect()
+            try:
+                while True:
+                    changes = get_changes_since(conn, self._seq, limit=1000)
+                    if not changes:
+                        break
+                    with self._lock:
+                        for change in changes:
+                            self._apply(change)
+                            self._seq = change['seq']
+            finally:
+                conn.close()
+
+    def _apply(self, change):
+        coloane = change['coloane']
+        if change['op'] == 'update':
+            removed, added = change.get('anterior') or {}, coloane
+        elif change['op'] == 'delete':
+            removed, added = coloane, {}
+        else:
+            removed, added = {}, coloane
+        if change['tabel'] == 'obiecte':
+            self._index.add(removed.get('nume'), -1)
+            self._index.add(added.get('nume'))
+            return
+        for term in self._terms(removed):
+            self._index.add(term, -1)
+        for term in self._terms(added):
+            self._index.add(term)
+
+    def suggest(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        if self._index is None:
+            self.rebuild()
+        with self._lock:
+            return self._index.suggest(prefix, limit)
+
+    def reset(self):
+        """Reconstruiește indexul după înlocuirea fișierului bazei de date"""
+        self.rebuild()
@@ -0,0 +1,212 @@
+"""
+Catalogul backup-urilor: un tabel SQLite (backups/catalog.db) cu câte un rând pe snapshot.
+
+Fiecare backup este înregistrat la creare, cu metadatele din fișierul JSON,
+locul unde se află (local, Google Drive sau ambele) și checksum-ul SHA-256 al
+bazei de date. Pagina /backup citește lista cu o interogare pe index, fără să
+parcurgă directorul și fără să deschidă fișierele JSON. Fișierele JSON rămân
+sursa din care catalogul poate fi reconstruit:
+
+    python backup_catalog.py [backups]
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+from backup_codec import file_sha256
+from backup_store import ChunkStore, STORE_DIRNAME, list_local_backups, read_sidecar
+
+CATALOG_FILENAME = 'catalog.db'
+
+CATALOG_DDL = (
+    '''
+    CREATE TABLE IF NOT EXISTS backups (
+        filename TEXT PRIMARY KEY,
+        created_at TEXT NOT NULL,
+        is_auto_backup INTEGER NOT NULL DEFAULT 0,
+        format TEXT NOT NULL DEFAULT 'file',
+        codec TEXT,
+        stored_as TEXT,
+        size INTEGER NOT NULL DEFAULT 0,
+        stored_size INTEGER,
+        sha256 TEXT,
+        local INTEGER NOT NULL DEFAULT 1,
+        gdrive_id TEXT,
+        info TEXT NOT NULL DEFAULT '{}'
+    )
+    ''',
+    "CREATE INDEX IF NOT EXISTS idx_backups_created_at ON backups (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_backups_gdrive ON backups (gdrive_id) WHERE gdrive_id IS NOT NULL",
+)
+
+# Coloanele copiate direct din fișierul JSON al backup-ului
+_COLUMNS = ('created_at', 'is_auto_backup', 'format', 'codec', 'stored_as', 'size', 'stored_size', 'sha256', 'gdrive_id')
+
+class BackupCatalog:
+    """Acces la catalog; fiecare operație folosește o conexiune scurtă (apelabil din orice thread)"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._ready:
+            with self._lock:
+                for statement in CATALOG_DDL:
+                    conn.execute(statement)
+                conn.commit()
+                self._ready = True
+        return conn
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def record(self, info, local=True):
+        """Adaugă sau actualizează un backup din dicționarul scris în fișierul JSON"""
+        info = dict(info)
+        info.setdefault('created_at', info.get('timestamp'))
+        values = [info.get(column) for column in _COLUMNS]
+        values[1] = 1 if info.get('is_auto_backup') else 0
+        values[2] = info.get('format') or 'file'
+        values[5] = info.get('size') or 0
+        conn = self._connect()
+        try:
+            conn.execute(f'''
+                INSERT INTO backups (filename, {", ".join(_COLUMNS)}, local, info)
+                VALUES ({", ".join("?" * (len(_COLUMNS) + 3))})
+                ON CONFLICT (filename) DO UPDATE SET
+                    {", ".join(f"{column} = excluded.{column}" for column in _COLUMNS if column != 'gdrive_id')},
+                    gdrive_id = COALESCE(excluded.gdrive_id, backups.gdrive_id),
+                    local = excluded.local, info = excluded.info
+            ''', [info['filename']] + values + [1 if local else 0, json.dumps(info, ensure_ascii=False)])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def set_gdrive_id(self, filename, gdrive_id):
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE backups SET gdrive_id = ? WHERE filename = ?", (gdrive_id, filename))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def set_local(self, filename, local):
+        """Marchează copia locală ca existentă/ștearsă; rândul dispare când nu mai e nicăieri"""
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE backups SET local = ? WHERE filename = ?", (1 if local else 0, filename))
+            conn.execute("DELETE FROM backups WHERE filename = ? AND local = 0 AND gdrive_id IS NULL", (filename,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def remove(self, filenames):
+        conn = self._connect()
+        try:
+            conn.executemany("DELETE FROM backups WHERE filename = ?", [(name,) for name in filenames])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _entry(self, row):
+        entry = json.loads(row['info'])
+        entry.update({key: row[key] for key in row.keys() if key != 'info'})
+        entry['is_auto_backup'] = bool(row['is_auto_backup'])
+        entry['local'] = bool(row['local'])
+        entry['source'] = ('local_and_gdrive' if row['local'] else 'gdrive') if row['gdrive_id'] else 'local_backup'
+        return entry
+
+    def get(self, filename):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM backups WHERE filename = ?", (filename,)).fetchone()
+            return self._entry(row) if row else None
+        finally:
+            conn.close()
+
+    def list(self, local=None, on_gdrive=None, limit=None):
+        """Backup-urile în ordinea creării (cel mai recent primul)"""
+        where, params = [], []
+        if local is not None:
+            where.append("local = ?")
+            params.append(1 if local else 0)
+        if on_gdrive is not None:
+            where.append("gdrive_id IS NOT NULL" if on_gdrive else "gdrive_id IS NULL")
+        query = "SELECT * FROM backups"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY created_at DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        conn = self._connect()
+        try:
+            return [self._entry(row) for row in conn.execute(query, params)]
+        finally:
+            conn.close()
+
+    def latest(self, local=None, on_gdrive=None):
+        entries = self.list(local=local, on_gdrive=on_gdrive, limit=1)
+        return entries[0] if entries else None
+
+    def rebuild(self, backup_dir, store):
+        """Reconstruiește catalogul din directorul de backup-uri și fișierele JSON"""
+        entries = list_local_backups(backup_dir, store)
+        conn = self._connect()
+        try:
+            # Backup-urile care mai există local sunt marcate din nou mai jos
+            conn.execute("UPDATE backups SET local = 0")
+            conn.commit()
+        finally:
+            conn.close()
+        for filename, entry in entries.items():
+            info = read_sidecar(backup_dir, filename) or {}
+            info['filename'] = filename
+            info.setdefault('created_at', info.get('timestamp') or datetime.fromtimestamp(entry['mtime']).isoformat())
+            info.setdefault('size', entry['size'])
+            info.setdefault('format', entry['format'])
+            if entry['format'] == 'file':
+                info.setdefault('stored_as', os.path.basename(entry['path']))
+            if not info.get('sha256') and entry['format'] == 'file' and entry['path'].endswith('.db'):
+                info['sha256'] = file_sha256(entry['path'])
+            self.record(info)
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM backups WHERE local = 0 AND gdrive_id IS NULL")
+            conn.commit()
+        finally:
+            conn.close()
+        return len(entries)
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def get_catalog(backup_dir, store=None):
+    """Catalogul (unic pe proces) al unui director de backup-uri; creat din fișiere la prima folosire"""
+    backup_dir = os.path.realpath(str(backup_dir))
+    with _catalogs_lock:
+        catalog = _catalogs.get(backup_dir)
+        if catalog is None:
+            catalog = BackupCatalog(os.path.join(backup_dir, CATALOG_FILENAME))
+            if not catalog.exists():
+                os.makedirs(backup_dir, exist_ok=True)
+                count = catalog.rebuild(backup_dir, store or ChunkStore(os.path.join(backup_dir, STORE_DIRNAME)))
+                print(f"📒 Catalog backup creat din {count} backup-uri existente")
+            _catalogs[backup_dir] = catalog
+        return catalog
+
+def main(backup_dir='backups'):
+    catalog = BackupCatalog(os.path.join(backup_dir, CATALOG_FILENAME))
+    count = catalog.rebuild(backup_dir, ChunkStore(os.path.join(backup_dir, STORE_DIRNAME)))
+    print(f"✅ Catalog reconstruit: {count} backup-uri locale, {len(catalog.list(on_gdrive=True))} pe Google Drive")
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,116 @@
+"""
+Compresia backup-urilor: zstd dacă pachetul zstandard este instalat, altfel gzip.
+
+Fișierele sunt comprimate și decomprimate în flux (bucăți de BACKUP_STREAM_CHUNK),
+deci memoria folosită nu depinde de dimensiunea bazei de date. Codec-ul folosit
+este ales o singură dată la import și poate fi forțat din mediu:
+
+    BACKUP_COMPRESSION=auto|zstd|gzip|none
+"""
+
+import gzip
+import hashlib
+import os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BACKUP_STREAM_CHUNK = 1024 * 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+
+# Sufixul adăugat numelui backup-ului (finance_backup_X.db -> finance_backup_X.db.zst)
+CODEC_SUFFIX = {'zstd': '.zst', 'gzip': '.gz'}
+
+def available_codecs():
+    return [codec for codec in ('zstd', 'gzip') if codec != 'zstd' or zstandard is not None]
+
+def resolve_codec(environ=None):
+    """Codec-ul pentru backup-urile noi (None = necomprimat)"""
+    if environ is None:
+        environ = os.environ
+    choice = environ.get('BACKUP_COMPRESSION', 'auto').lower()
+    if choice in ('none', 'false', '0', 'no'):
+        return None
+    if choice in available_codecs():
+        return choice
+    return available_codecs()[0]
+
+BACKUP_CODEC = resolve_codec()
+
+def _writer(fileobj, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(fileobj, closefd=False)
+    return gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=GZIP_LEVEL)
+
+def open_reader(fileobj, codec):
+    """Flux decomprimat peste un fișier deschis (codec None = fișierul ca atare)"""
+    if codec is None:
+        return fileobj
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("Backup-ul este comprimat cu zstd, dar pachetul zstandard nu este instalat")
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+    if codec == 'gzip':
+        return gzip.GzipFile(fileobj=fileobj, mode='rb')
+    raise ValueError(f"Codec necunoscut: {codec}")
+
+def compress_file(source_path, dest_path, codec):
+    """Comprimă în flux; returnează (sha256 al conținutului original, dimensiunea comprimată)"""
+    digest = hashlib.sha256()
+    tmp_path = f"{dest_path}.tmp"
+    with open(source_path, 'rb') as source, open(tmp_path, 'wb') as dest:
+        writer = _writer(dest, codec)
+        while True:
+            block = source.read(BACKUP_STREAM_CHUNK)
+            if not block:
+                break
+            digest.update(block)
+            writer.write(block)
+        writer.close()
+    os.replace(tmp_path, dest_path)
+    return digest.hexdigest(), os.path.getsize(dest_path)
+
+def decompress_file(source_path, dest_path, codec):
+    """Decomprimă în flux; returnează sha256 al conținutului decomprimat"""
+    digest = hashlib.sha256()
+    tmp_path = f"{dest_path}.tmp"
+    try:
+        with open(source_path, 'rb') as source, open(tmp_path, 'wb') as dest:
+            reader = open_reader(source, codec)
+            while True:
+                block = reader.read(BACKUP_STREAM_CHUNK)
+                if not block:
+                    break
+                digest.update(block)
+                dest.write(block)
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return digest.hexdigest()
+
+def compress_bytes(data, codec):
+    if codec is None:
+        return data
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+def decompress_bytes(data, codec):
+    if codec is None:
+        return data
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("Blocul este comprimat cu zstd, dar pachetul zstandard nu este instalat")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(BACKUP_STREAM_CHUNK), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,147 @@
+"""
+Politica de retenție a backup-urilor: bunic-tată-fiu (GFS) pe ore, zile și săptămâni.
+
+Din backup-urile automate se păstrează cele mai recente `keep_last`, apoi cel
+mai nou backup din fiecare din ultimele `hourly` ore, `daily` zile și `weekly`
+săptămâni care au backup-uri. Backup-urile manuale au propria limită
+(`keep_manual`), iar totalul nu depășește `max_backups` (se renunță întâi la
+cele mai vechi backup-uri automate). Cu un snapshot pe minut, numărul de
+backup-uri rămâne deci mărginit.
+
+Politica se citește din settings.yaml (secțiunea backup):
+
+    backup:
+      max_backups: 50
+      retention:
+        keep_last: 5
+        hourly: 24
+        daily: 7
+        weekly: 4
+        keep_manual: 10
+
+Ștergerea rulează în thread-ul de backup automat, nu la afișarea unei pagini:
+fișierele locale (sau manifestele din depozitul deduplicat) sunt șterse
+împreună, apoi copiile de pe Google Drive, în paralel.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from datetime import datetime
+
+from backup_store import delete_backup
+from gdrive_upload import GDRIVE_UPLOAD_WORKERS, retry_with_backoff
+
+SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'settings.yaml')
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    keep_last: int = 5
+    hourly: int = 24
+    daily: int = 7
+    weekly: int = 4
+    keep_manual: int = 10
+    max_backups: int = 50
+
+def load_policy(path=SETTINGS_FILE):
+    """Politica din settings.yaml; valorile lipsă (sau fără PyYAML) rămân implicite"""
+    try:
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            backup = (yaml.safe_load(f) or {}).get('backup') or {}
+    except Exception as e:
+        print(f"⚠️ Politica de retenție implicită ({e})")
+        return RetentionPolicy()
+    values = dict(backup.get('retention') or {})
+    if 'max_backups' in backup:
+        values['max_backups'] = backup['max_backups']
+    known = {field.name for field in fields(RetentionPolicy)}
+    return RetentionPolicy(**{key: int(value) for key, value in values.items() if key in known})
+
+def _created_at(backup):
+    try:
+        return datetime.fromisoformat(backup['created_at'])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+_TIERS = (
+    ('hourly', lambda moment: moment.strftime('%Y%m%d%H')),
+    ('daily', lambda moment: moment.strftime('%Y%m%d')),
+    ('weekly', lambda moment: moment.isocalendar()[:2]),
+)
+
+def plan_retention(backups, policy):
+    """Împarte backup-urile (din catalog, cel mai recent primul) în (păstrate, expirate)"""
+    backups = sorted(backups, key=lambda b: b.get('created_at') or '', reverse=True)
+    manual = [b for b in backups if not b.get('is_auto_backup')]
+    automatic = [b for b in backups if b.get('is_auto_backup')]
+
+    keep = {b['filename'] for b in manual[:policy.keep_manual]}
+    keep.update(b['filename'] for b in automatic[:policy.keep_last])
+    for tier, bucket_of in _TIERS:
+        limit = getattr(policy, tier)
+        buckets = set()
+        for backup in automatic:
+            moment = _created_at(backup)
+            if moment is None:
+                # Fără dată nu poate fi încadrat; mai bine păstrat decât șters greșit
+                keep.add(backup['filename'])
+                continue
+            bucket = bucket_of(moment)
+            if bucket in buckets:
+                continue
+            if len(buckets) >= limit:
+                break
+            buckets.add(bucket)
+            keep.add(backup['filename'])
+
+    # Limita totală: manualele primele, apoi automatele de la cel mai nou
+    ordered = [b for b in manual if b['filename'] in keep] + [b for b in automatic if b['filename'] in keep]
+    keep = {b['filename'] for b in ordered[:policy.max_backups]}
+    kept = [b for b in backups if b['filename'] in keep]
+    expired = [b for b in backups if b['filename'] not in keep]
+    return kept, expired
+
+def apply_retention(catalog, backup_dir, store, policy, drive_delete=None, workers=GDRIVE_UPLOAD_WORKERS):
+    """Șterge backup-urile expirate, local și (dacă drive_delete e dat) de pe Google Drive.
+
+    Returnează {'local': n, 'gdrive': n, 'failed': {nume: eroare}}.
+    """
+    _, expired = plan_retention(catalog.list(), policy)
+    result = {'local': 0, 'gdrive': 0, 'failed': {}}
+
+    local = [b for b in expired if b['local']]
+    for backup in local:
+        try:
+            delete_backup(backup_dir, backup['filename'], store)
+            catalog.set_local(backup['filename'], False)
+            result['local'] += 1
+        except Exception as e:
+            result['failed'][backup['filename']] = str(e)
+    if any(b['format'] == 'chunks' for b in local):
+        # Blocurile folosite doar de snapshot-urile șterse
+        store.collect_garbage()
+    local_failed = set(result['failed'])
+
+    remote = [b for b in expired if b.get('gdrive_id')]
+    if drive_delete is not None and remote:
+        def delete_remote(backup):
+            retry_with_backoff(lambda: drive_delete(backup['gdrive_id']), retries=2, label=backup['filename'])
+            return backup['filename']
+
+        deleted = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(delete_remote, backup): backup['filename'] for backup in remote}
+            for future, filename in futures.items():
+                try:
+                    deleted.append(future.result())
+                except Exception as e:
+                    result['failed'][filename] = str(e)
+        for filename in deleted:
+            if filename in local_failed:
+                # Copia locală a rămas: doar legătura cu Drive dispare din catalog
+                catalog.set_gdrive_id(filename, None)
+            else:
+                catalog.remove([filename])
+        result['gdrive'] = len(deleted)
+    return result
@@ -0,0 +1,295 @@
+"""
+Depozitul local de backup-uri cu deduplicare pe blocuri (content-addressed).
+
+Fiecare snapshot al bazei de date este împărțit în blocuri de dimensiune fixă.
+Un bloc este salvat o singură dată, sub numele hash-ului său SHA-256, iar
+snapshot-ul devine un manifest JSON cu lista hash-urilor. Între două snapshot-uri
+se schimbă de obicei doar câteva pagini, deci un snapshot nou scrie pe disc doar
+blocurile noi. Restaurarea reasamblează fișierul din manifest și verifică fiecare
+bloc. Blocurile și backup-urile întregi sunt comprimate cu codec-ul din
+backup_codec.py. Modulul nu depinde de Flask; rulat direct, afișează statistici
+și șterge blocurile care nu mai aparțin niciunui manifest:
+
+    python backup_store.py [backups]
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from backup_codec import (BACKUP_CODEC, CODEC_SUFFIX, compress_bytes, decompress_bytes,
+                          compress_file, decompress_file, file_sha256)
+from sqlite_snapshot import snapshot_database, content_checksum
+
+# Multiplu al oricărei dimensiuni de pagină SQLite (512 - 65536)
+BACKUP_CHUNK_SIZE = 64 * 1024
+# Subdirectorul din backups/ în care stau blocurile și manifestele
+STORE_DIRNAME = 'store'
+BACKUP_PREFIX = 'finance_backup_'
+
+# Un singur lock pe proces: curățarea blocurilor nu rulează în timpul unui snapshot
+_store_lock = threading.Lock()
+
+class BackupStoreError(Exception):
+    """Manifest lipsă sau bloc corupt/lipsă la reasamblare"""
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class ChunkStore:
+    """Blocuri în store/chunks/<ab>/<hash>[.gz|.zst], manifeste în store/manifests/<nume>.json
+
+    Hash-ul este calculat pe conținutul necomprimat; sufixul fișierului spune
+    cu ce codec a fost scris blocul, deci schimbarea codec-ului nu strică
+    snapshot-urile existente.
+    """
+
+    def __init__(self, root, chunk_size=BACKUP_CHUNK_SIZE, codec=BACKUP_CODEC):
+        self.root = str(root)
+        self.chunk_size = chunk_size
+        self.codec = codec
+        self.chunks_dir = os.path.join(self.root, 'chunks')
+        self.manifests_dir = os.path.join(self.root, 'manifests')
+
+    def _chunk_path(self, digest, codec=None):
+        return os.path.join(self.chunks_dir, digest[:2], digest + CODEC_SUFFIX.get(codec, ''))
+
+    def _manifest_path(self, name):
+        return os.path.join(self.manifests_dir, f"{os.path.splitext(name)[0]}.json")
+
+    def has(self, name):
+        return os.path.exists(self._manifest_path(name))
+
+    def manifest(self, name):
+        try:
+            with open(self._manifest_path(name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise BackupStoreError(f"Manifestul pentru {name} nu poate fi citit: {e}")
+
+    def names(self):
+        return sorted(os.path.splitext(os.path.basename(path))[0] + '.db'
+                      for path in glob.glob(os.path.join(self.manifests_dir, '*.json')))
+
+    def put_file(self, name, path):
+        """Adaugă fișierul ca snapshot `name`; scrie doar blocurile care nu există deja"""
+        chunks = []
+        new_chunks = new_bytes = size = 0
+        file_hash = hashlib.sha256()
+        with _store_lock:
+            os.makedirs(self.manifests_dir, exist_ok=True)
+            with open(path, 'rb') as f:
+                while True:
+                    block = f.read(self.chunk_size)
+                    if not block:
+                        break
+                    size += len(block)
+                    file_hash.update(block)
+                    digest = hashlib.sha256(block).hexdigest()
+                    chunk_path = self._chunk_path(digest, self.codec)
+                    if not os.path.exists(chunk_path):
+                        os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+                        data = compress_bytes(block, self.codec)
+                        _write_atomic(chunk_path, data)
+                        new_chunks += 1
+                        new_bytes += len(data)
+                    chunks.append(digest)
+
+            manifest = {
+                'name': name,
+                'created_at': datetime.now().isoformat(),
+                'chunk_size': self.chunk_size,
+                'codec': self.codec,
+                'size': size,
+                'sha256': file_hash.hexdigest(),
+                'chunks': chunks,
+                'new_chunks': new_chunks,
+                'new_bytes': new_bytes
+            }
+            _write_atomic(self._manifest_path(name), json.dumps(manifest).encode('utf-8'))
+        return manifest
+
+    def restore_file(self, name, dest_path):
+        """Reasamblează snapshot-ul în dest_path, verificând fiecare bloc și hash-ul final"""
+        manifest = self.manifest(name)
+        tmp_path = f"{dest_path}.tmp"
+        codec = manifest.get('codec')
+        file_hash = hashlib.sha256()
+        try:
+            with open(tmp_path, 'wb') as out:
+                for digest in manifest['chunks']:
+                    try:
+                        with open(self._chunk_path(digest, codec), 'rb') as f:
+                            block = decompress_bytes(f.read(), codec)
+                    except OSError:
+                        raise BackupStoreError(f"Blocul {digest} din {name} lipsește")
+                    except Exception as e:
+                        raise BackupStoreError(f"Blocul {digest} din {name} nu poate fi decomprimat: {e}")
+                    if hashlib.sha256(block).hexdigest() != digest:
+                        raise BackupStoreError(f"Blocul {digest} din {name} este corupt")
+                    file_hash.update(block)
+                    out.write(block)
+            if file_hash.hexdigest() != manifest['sha256']:
+                raise BackupStoreError(f"Snapshot-ul {name} reasamblat nu corespunde manifestului")
+            os.replace(tmp_path, dest_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return dest_path
+
+    def delete(self, name):
+        """Șterge manifestul; blocurile rămase fără referințe dispar la collect_garbage()"""
+        path = self._manifest_path(name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def collect_garbage(self):
+        """Șterge blocurile nereferite de niciun manifest; returnează numărul lor"""
+        removed = 0
+        with _store_lock:
+            referenced = set()
+            for name in self.names():
+                manifest = self.manifest(name)
+                referenced.update(os.path.basename(self._chunk_path(digest, manifest.get('codec')))
+                                  for digest in manifest['chunks'])
+            for path in glob.glob(os.path.join(self.chunks_dir, '*', '*')):
+                if os.path.basename(path) not in referenced:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    def stats(self):
+        names = self.names()
+        chunk_files = glob.glob(os.path.join(self.chunks_dir, '*', '*'))
+        return {
+            'snapshots': len(names),
+            'logical_bytes': sum(self.manifest(name)['size'] for name in names),
+            'chunks': len(chunk_files),
+            'stored_bytes': sum(os.path.getsize(path) for path in chunk_files)
+        }
+
+def read_sidecar(backup_dir, filename):
+    """Fișierul JSON cu informațiile unui backup (None dacă lipsește sau e invalid)"""
+    info_path = os.path.join(str(backup_dir), f"{os.path.splitext(filename)[0]}.json")
+    try:
+        with open(info_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def stored_file(backup_dir, filename):
+    """(cale, codec) pentru un backup păstrat ca fișier întreg, comprimat sau nu; None dacă nu există"""
+    path = os.path.join(str(backup_dir), filename)
+    if os.path.exists(path):
+        return path, None
+    for codec, suffix in CODEC_SUFFIX.items():
+        if os.path.exists(path + suffix):
+            return path + suffix, codec
+    return None
+
+def write_backup(db_path, backup_dir, filename, store=None):
+    """Face un snapshot verificat al bazei de date și îl păstrează ca backup `filename`.
+
+    Cu `store`, snapshot-ul ajunge în depozitul deduplicat; altfel devine un
+    fișier întreg, comprimat în flux cu codec-ul depozitului (sau BACKUP_CODEC).
+    Returnează câmpurile pentru fișierul JSON al backup-ului.
+    """
+    backup_path = os.path.join(str(backup_dir), filename)
+    codec = store.codec if store is not None else BACKUP_CODEC
+    snapshot_path = f"{backup_path}.snapshot" if store is not None or codec else backup_path
+    snapshot_database(db_path, snapshot_path)
+    try:
+        conn = sqlite3.connect(snapshot_path)
+        try:
+            tables = {
+                'tranzactii': conn.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0],
+                'obiecte': conn.execute("SELECT COUNT(*) FROM obiecte").fetchone()[0]
+            }
+        finally:
+            conn.close()
+        info = {'size': os.path.getsize(snapshot_path), 'tables': tables, 'quick_check': 'ok', 'codec': codec,
+                'content_sha256': content_checksum(snapshot_path)}
+
+        if store is not None:
+            manifest = store.put_file(filename, snapshot_path)
+            info.update(format='chunks', sha256=manifest['sha256'], stored_size=manifest['new_bytes'])
+        elif codec:
+            stored_as = filename + CODEC_SUFFIX[codec]
+            sha256, stored_size = compress_file(snapshot_path, os.path.join(str(backup_dir), stored_as), codec)
+            info.update(format='file', sha256=sha256, stored_as=stored_as, stored_size=stored_size)
+        else:
+            info.update(format='file', sha256=file_sha256(backup_path), stored_as=filename,
+                        stored_size=info['size'])
+        return info
+    finally:
+        if snapshot_path != backup_path and os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+def list_local_backups(backup_dir, store):
+    """Backup-urile locale: fișiere (comprimate sau nu) și snapshot-uri din depozit, cu data creării"""
+    backup_dir = str(backup_dir)
+    backups = {}
+    for suffix in ('',) + tuple(CODEC_SUFFIX.values()):
+        for path in glob.glob(os.path.join(backup_dir, f'{BACKUP_PREFIX}*.db{suffix}')):
+            filename = os.path.basename(path)[:len(os.path.basename(path)) - len(suffix)]
+            backups.setdefault(filename, {'format': 'file', 'mtime': os.path.getctime(path),
+                                          'size': os.path.getsize(path), 'path': path})
+    for name in store.names():
+        if name.startswith(BACKUP_PREFIX) and name not in backups:
+            manifest = store.manifest(name)
+            backups[name] = {'format': 'chunks', 'mtime': os.path.getmtime(store._manifest_path(name)),
+                             'size': manifest['size'], 'path': None}
+    return backups
+
+def backup_exists(backup_dir, filename, store):
+    return stored_file(backup_dir, filename) is not None or store.has(filename)
+
+@contextmanager
+def open_backup(backup_dir, filename, store):
+    """Calea unui fișier SQLite cu conținutul backup-ului (decomprimat sau reasamblat temporar)"""
+    stored = stored_file(backup_dir, filename)
+    if stored is not None and stored[1] is None:
+        yield stored[0]
+        return
+    if stored is None and not store.has(filename):
+        raise BackupStoreError(f"Backup-ul {filename} nu există")
+    tmp_path = os.path.join(str(backup_dir), f".restore_{os.path.splitext(filename)[0]}.db")
+    if stored is not None:
+        decompress_file(stored[0], tmp_path, stored[1])
+    else:
+        store.restore_file(filename, tmp_path)
+    try:
+        yield tmp_path
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def delete_backup(backup_dir, filename, store):
+    """Șterge fișierul/manifestul unui backup și fișierul JSON asociat"""
+    backup_dir = str(backup_dir)
+    paths = [os.path.join(backup_dir, filename + suffix) for suffix in ('',) + tuple(CODEC_SUFFIX.values())]
+    paths.append(os.path.join(backup_dir, f"{os.path.splitext(filename)[0]}.json"))
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+    store.delete(filename)
+
+def main(backup_dir='backups'):
+    store = ChunkStore(os.path.join(backup_dir, STORE_DIRNAME))
+    removed = store.collect_garbage()
+    stats = store.stats()
+    print(f"📦 {stats['snapshots']} snapshot-uri, {stats['logical_bytes'] / 1024:.1f} KB logic, "
+          f"{stats['chunks']} blocuri ({stats['stored_bytes'] / 1024:.1f} KB pe disc)")
+    print(f"🧹 {removed} blocuri nefolosite șterse")
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,236 @@
+"""
+Jurnalul modificărilor (change_log) pentru tabelele tranzactii și obiecte.
+
+Fiecare INSERT/UPDATE/DELETE este înregistrat de trigger-ele create în
+app.create_schema(), cu aceeași secvență ca sync_state.change_seq. Modulul nu
+depinde de Flask, ca să poată fi folosit și din scripturile de sincronizare.
+"""
+
+import json
+import os
+
+# Coloanele jurnalizate pentru fiecare tabel urmărit (fără id)
+TRACKED_COLUMNS = {
+    'tranzactii': ('data', 'suma', 'comentariu', 'operator', 'tip', 'obiect', 'persoana', 'categorie'),
+    'obiecte': ('nume',),
+}
+
+# Intrările mai vechi de atâtea zile sunt comprimate (o intrare pe rând)
+CHANGE_LOG_COMPACT_DAYS = 7
+
+# Fișierul în care scripturile de sincronizare își păstrează cursorul
+SYNC_CURSOR_FILE = 'sync_cursor.json'
+
+CHANGE_LOG_DDL = '''
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY,
+        tabel TEXT NOT NULL,
+        op TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        coloane TEXT NOT NULL,
+        created_at TEXT NOT NULL DEFAULT (datetime('now')),
+        anterior TEXT
+    )
+'''
+
+def _json_columns(table, prefix):
+    return 'json_object(' + ', '.join(f"'{col}', {prefix}.{col}" for col in TRACKED_COLUMNS[table]) + ')'
+
+def _changed_columns(table, side):
+    """Valorile din `side` (NEW sau OLD) ale coloanelor modificate de un UPDATE"""
+    alias = {'NEW': 'n', 'OLD': 'o'}[side]
+    return f'''(
+                        SELECT json_group_object(n.key, {alias}.value)
+                        FROM json_each({_json_columns(table, 'NEW')}) AS n
+                        JOIN json_each({_json_columns(table, 'OLD')}) AS o ON o.key = n.key
+                        WHERE n.value IS NOT o.value
+                    )'''
+
+def trigger_statement(table, op):
+    """Instrucțiunea din corpul trigger-ului care scrie în change_log.
+
+    Trebuie rulată după incrementarea sync_state.change_seq. La UPDATE se
+    salvează doar coloanele care s-au schimbat, iar în `anterior` valorile lor
+    de dinainte (la DELETE, `coloane` are deja valorile vechi).
+    """
+    op = op.lower()
+    anterior = 'NULL'
+    if op == 'insert':
+        row_id, coloane = 'NEW.id', _json_columns(table, 'NEW')
+    elif op == 'delete':
+        row_id, coloane = 'OLD.id', _json_columns(table, 'OLD')
+    else:
+        row_id = 'NEW.id'
+        coloane, anterior = _changed_columns(table, 'NEW'), _changed_columns(table, 'OLD')
+    return f'''
+                    INSERT INTO change_log (seq, tabel, op, row_id, coloane, anterior)
+                    VALUES ((SELECT change_seq FROM sync_state WHERE id = 1), '{table}', '{op}', {row_id}, {coloane}, {anterior});'''
+
+def ensure_change_log_columns(conn):
+    """Adaugă coloana `anterior` în jurnalele create înaintea ei"""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(change_log)").fetchall()]
+    if 'anterior' not in columns:
+        conn.execute("ALTER TABLE change_log ADD COLUMN anterior TEXT")
+
+def get_changes_since(conn, since, limit=1000):
+    """Returnează cel mult `limit` modificări cu secvența mai mare decât `since`"""
+    rows = conn.execute('''
+        SELECT seq, tabel, op, row_id, coloane, created_at, anterior FROM change_log
+        WHERE seq > ? ORDER BY seq LIMIT ?
+    ''', (since, limit)).fetchall()
+    return [{
+        'seq': row[0],
+        'tabel': row[1],
+        'op': row[2],
+        'row_id': row[3],
+        'coloane': json.loads(row[4]),
+        'created_at': row[5],
+        'anterior': json.loads(row[6]) if row[6] else None
+    } for row in rows]
+
+def compact_change_log(conn, before_seq=None, older_than_days=CHANGE_LOG_COMPACT_DAYS):
+    """Comprimă intrările vechi: o singură intrare pe rând, cu secvența ultimei modificări.
+
+    Sunt citite doar intrările de după sync_state.compacted_seq (cele de dinainte
+    au fost deja comprimate), deci costul unei rulări depinde de modificările noi,
+    nu de lungimea jurnalului. Un consumator cu orice cursor primește în
+    continuare starea finală a fiecărui rând: inserările/modificările devin o
+    intrare cu coloanele cumulate, iar un rând șters rămâne ca intrare 'delete'.
+    Returnează numărul de intrări eliminate.
+    """
+    watermark = conn.execute("SELECT compacted_seq FROM sync_state WHERE id = 1").fetchone()[0]
+    if before_seq is None:
+        before_seq = conn.execute(
+            "SELECT MAX(seq) FROM change_log WHERE seq > ? AND created_at < datetime('now', ?)",
+            (watermark, f'-{older_than_days} days')
+        ).fetchone()[0]
+        if before_seq is None:
+            return 0
+    if before_seq <= watermark:
+        return 0
+
+    folded = {}
+    total = 0
+    for seq, tabel, op, row_id, coloane, created_at, anterior in conn.execute('''
+        SELECT seq, tabel, op, row_id, coloane, created_at, anterior FROM change_log
+        WHERE seq > ? AND seq <= ? ORDER BY seq
+    ''', (watermark, before_seq)):
+        total += 1
+        coloane = json.loads(coloane)
+        anterior = json.loads(anterior) if anterior else None
+        entry = folded.get((tabel, row_id))
+        if entry is None:
+            folded[(tabel, row_id)] = {'op': op, 'coloane': coloane, 'anterior': anterior,
+                                       'seq': seq, 'created_at': created_at}
+            continue
+        if op == 'update' and entry['op'] != 'delete':
+            entry['coloane'].update(coloane)
+            if entry['op'] == 'update':
+                # Valoarea anterioară a unei coloane este cea de dinaintea primei modificări
+                entry['anterior'] = dict(anterior or {}, **(entry['anterior'] or {}))
+        else:
+            entry['op'] = op
+            entry['coloane'] = coloane
+            entry['anterior'] = anterior
+        entry['seq'] = seq
+        entry['created_at'] = created_at
+
+    removed = total - len(folded)
+    if removed:
+        conn.execute("DELETE FROM change_log WHERE seq > ? AND seq <= ?", (watermark, before_seq))
+        conn.executemany('''
+            INSERT INTO change_log (seq, tabel, op, row_id, coloane, created_at, anterior)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (entry['seq'], tabel, entry['op'], row_id, json.dumps(entry['coloane'], ensure_ascii=False),
+             entry['created_at'], json.dumps(entry['anterior'], ensure_ascii=False) if entry['anterior'] else None)
+            for (tabel, row_id), entry in folded.items()
+        ])
+    conn.execute("UPDATE sync_state SET compacted_seq = ? WHERE id = 1", (before_seq,))
+    conn.commit()
+    return removed
+
+def apply_changes(conn, changes):
+    """Aplică o listă de modificări (format get_changes_since) pe o bază de date.
+
+    Inserările sunt aplicate ca upsert, deci reaplicarea aceleiași pagini este
+    sigură. Nu face commit - apelantul decide granița tranzacției.
+    """
+    stats = {'applied': 0, 'skipped': 0}
+    for change in changes:
+        table = change['tabel']
+        if table not in TRACKED_COLUMNS:
+            stats['skipped'] += 1
+            continue
+        columns = [col for col in TRACKED_COLUMNS[table] if col in change['coloane']]
+        values = [change['coloane'][col] for col in columns]
+
+        if change['op'] == 'delete':
+            conn.execute(f"DELETE FROM {table} WHERE id = ?", (change['row_id'],))
+        elif change['op'] == 'insert':
+            assignments = ', '.join(f"{col} = excluded.{col}" for col in columns)
+            conn.execute(f'''
+                INSERT INTO {table} (id, {', '.join(columns)}) VALUES (?, {', '.join('?' for _ in columns)})
+                ON CONFLICT(id) DO UPDATE SET {assignments}
+            ''', [change['row_id']] + values)
+        elif columns:
+            cursor = conn.execute(
+                f"UPDATE {table} SET {', '.join(f'{col} = ?' for col in columns)} WHERE id = ?",
+                values + [change['row_id']]
+            )
+            if cursor.rowcount == 0:
+                # Rândul lipsește local; o modificare parțială nu îl poate crea
+                stats['skipped'] += 1
+                continue
+        stats['applied'] += 1
+    return stats
+
+def load_sync_cursor(url, path=SYNC_CURSOR_FILE):
+    """Cursorul salvat pentru serverul dat ({'since': ..., 'epoch': ...}) sau None"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get(url)
+    except (OSError, ValueError):
+        return None
+
+def save_sync_cursor(url, cursor, path=SYNC_CURSOR_FILE):
+    cursors = {}
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cursors = json.load(f)
+        except (OSError, ValueError):
+            cursors = {}
+    cursors[url] = cursor
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cursors, f, indent=2)
+
+def pull_changes(base_url, conn, cursor, page_size=1000, timeout=30):
+    """Descarcă și aplică modificările de pe server de după `cursor`.
+
+    Returnează (cursor_nou, statistici) sau None dacă serverul a fost restaurat
+    între timp (altă epocă) și este nevoie de o sincronizare completă.
+    """
+    import requests
+
+    stats = {'applied': 0, 'skipped': 0}
+    since = cursor['since']
+    while True:
+        response = requests.get(f"{base_url}/api/changes", params={'since': since, 'limit': page_size}, timeout=timeout)
+        response.raise_for_status()
+        page = response.json()
+        if page.get('epoch') != cursor.get('epoch'):
+            return None
+
+        page_stats = apply_changes(conn, page['changes'])
+        conn.commit()
+        for key in stats:
+            stats[key] += page_stats[key]
+
+        since = page['last_seq']
+        if not page.get('has_more'):
+            break
+
+    return {'since': since, 'epoch': cursor.get('epoch')}, stats
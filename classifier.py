@@ -0,0 +1,171 @@
+"""
+Clasificatorul comentariilor de tranzacții (tip, obiect, persoană, categorie).
+
+Regulile sunt compilate o singură dată: expresiile regulate la nivel de modul,
+iar numele obiectelor și cuvintele cheie într-un automat Aho-Corasick, astfel
+încât un comentariu este parcurs o singură dată, fără acces la baza de date.
+Modulul nu depinde de Flask, ca să poată fi folosit și din procese separate.
+"""
+
+import re
+from collections import deque
+
+# Persoanele recunoscute în comentarii (ordinea contează: prima găsită câștigă)
+PERSOANE = ('valerian', 'victor', 'transport', 'bus')
+# Comentariile care încep cu aceste cuvinte sunt venituri
+VENIT_KEYWORDS = ('decontare', 'scos bani', 'primit', 'venit', 'am primit')
+# Cuvintele din comentariu care indică un venit în regula generală
+VENIT_MARKERS = ('venit', 'incasare')
+CATEGORII = ('salariu', 'material', 'transport')
+SALARIU_MARKERS = ('salariu', 'salariul')
+
+CATEGORIE_IMPLICITA = 'alte cheltuieli'
+NECUNOSCUT = 'necunoscut'
+
+SALARIU_RE = re.compile(r"(salariu|salariul)\s+(\w+)(?:\s+(la|pentru)\s+(\w+))?")
+ACHITAT_AVANS_RE = re.compile(r"(achitat|avans)\s+(\w+)(?:\s+(la|pentru)\s+(\w+))?")
+DE_LA_RE = re.compile(r'(?:de la|de la)\s+(\w+)')
+TRANSPORT_RE = re.compile(r"transport\s+(\w+)")
+
+class AhoCorasick:
+    """Automat Aho-Corasick: găsește toate aparițiile unor șiruri într-o singură trecere"""
+
+    def __init__(self, patterns):
+        # patterns: listă de (șir, valoare); valoarea este returnată la fiecare apariție
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = next_state
+            self._out[state].append((len(pattern), value))
+
+        # Legăturile de eșec, calculate în lățime (nodurile de pe primul nivel eșuează în rădăcină)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                if state:
+                    self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def find_all(self, text):
+        """Generează (start, valoare) pentru fiecare apariție"""
+        state = 0
+        for index, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, value in self._out[state]:
+                yield index - length + 1, value
+
+class Classifier:
+    """Regulile de clasificare compilate pentru o listă dată de obiecte.
+
+    lista_obiecte păstrează ordinea din baza de date: dacă mai multe obiecte apar
+    în comentariu, câștigă primul din listă (la fel ca vechea căutare liniară).
+    """
+
+    def __init__(self, lista_obiecte):
+        self.lista_obiecte = tuple(lista_obiecte)
+        patterns = [(nume, ('obiect', index)) for index, nume in enumerate(self.lista_obiecte)]
+        patterns += [(pers, ('persoana', index)) for index, pers in enumerate(PERSOANE)]
+        patterns += [(cat, ('categorie', index)) for index, cat in enumerate(CATEGORII)]
+        patterns += [(marker, ('venit', 0)) for marker in VENIT_MARKERS]
+        patterns += [(marker, ('salariu', 0)) for marker in SALARIU_MARKERS]
+        self._matcher = AhoCorasick(patterns)
+        # Un nume gol apare în orice comentariu (automatul ignoră șirurile goale)
+        self._obiect_gol = self.lista_obiecte.index('') if '' in self.lista_obiecte else None
+
+    def _scan(self, comment):
+        """O singură trecere: pentru fiecare tip de cuvânt, aparițiile (start, index)"""
+        hits = {'obiect': [], 'persoana': [], 'categorie': [], 'venit': [], 'salariu': []}
+        for start, (kind, index) in self._matcher.find_all(comment):
+            hits[kind].append((start, index))
+        return hits
+
+    def _persoana_venit(self, hits, rest, rest_start):
+        # Caută persoana în restul comentariului (după cuvântul cheie)
+        found = [index for start, index in hits['persoana'] if start >= rest_start]
+        if found:
+            return PERSOANE[min(found)]
+        if rest:
+            # Încearcă să găsească un nume după "de la"
+            match = DE_LA_RE.search(rest)
+            if match:
+                return match.group(1)
+            # Dacă nu găsește, ia primul cuvânt din rest ca persoană
+            words = rest.split()
+            if words:
+                return words[0]
+        return NECUNOSCUT
+
+    def classify(self, comment):
+        """Returnează (tip, obiect, persoana, categorie) pentru un comentariu"""
+        comment = comment.lower().strip()
+        hits = self._scan(comment)
+        tip = 'cheltuiala'
+        categorie = CATEGORIE_IMPLICITA
+        obiecte_gasite = [index for _, index in hits['obiect']]
+        if self._obiect_gol is not None:
+            obiecte_gasite.append(self._obiect_gol)
+        obiect = self.lista_obiecte[min(obiecte_gasite)] if obiecte_gasite else NECUNOSCUT
+        categorii_gasite = sorted({index for _, index in hits['categorie']})
+
+        # Dacă există 'salariu' sau 'salariul', e cheltuială
+        if hits['salariu']:
+            categorie = 'salariu'
+            # extrag persoana și obiectul dacă există
+            match = SALARIU_RE.match(comment)
+            persoana = match.group(2) if match else NECUNOSCUT
+            if match and match.group(3) and match.group(4):
+                obiect = match.group(4)
+            return tip, obiect, persoana, categorie
+
+        # Cuvinte cheie pentru venit
+        for kw in VENIT_KEYWORDS:
+            if comment.startswith(kw):
+                tip = 'venit'
+                rest = comment[len(kw):].strip()
+                persoana = self._persoana_venit(hits, rest, len(kw))
+                if categorii_gasite:
+                    categorie = CATEGORII[categorii_gasite[0]]
+                return tip, obiect, persoana, categorie
+
+        # Reguli speciale pentru Achitat, Avans
+        match = ACHITAT_AVANS_RE.match(comment)
+        if match:
+            persoana = match.group(2)
+            if match.group(3) and match.group(4):
+                obiect = match.group(4)
+            categorie = 'salariu'
+            return tip, obiect, persoana, categorie
+
+        # Reguli speciale pentru transport
+        match = TRANSPORT_RE.match(comment)
+        if match:
+            return 'cheltuiala', obiect, match.group(1), 'transport'
+
+        # Regula generală
+        if hits['venit']:
+            tip = 'venit'
+        persoane_gasite = [index for _, index in hits['persoana']]
+        persoana = PERSOANE[min(persoane_gasite)] if persoane_gasite else NECUNOSCUT
+        if categorii_gasite:
+            # Ultima categorie din listă care apare câștigă
+            categorie = CATEGORII[categorii_gasite[-1]]
+        return tip, obiect, persoana, categorie
@@ -0,0 +1,130 @@
+"""
+Restaurarea la pornire (cold start) din cel mai recent backup.
+
+Pe Render, init_db() restaurează baza de date la fiecare pornire. Pașii:
+
+1. checksum-ul conținutului bazei locale este comparat cu cel al ultimului
+   backup din catalog; dacă sunt egale, nu se descarcă nimic;
+2. dacă backup-ul există și local (depozitul de backup-uri), este folosit
+   acela; altfel este descărcat în flux, pe blocuri, într-un fișier temporar
+   de lângă baza de date, cu progres și cu o limită de timp;
+3. copia este decomprimată, verificată (SHA-256 din catalog și
+   PRAGMA quick_check) și abia apoi instalată: la pornire prin redenumire
+   atomică, altfel prin API-ul de backup SQLite (conexiunile deschise rămân valide).
+"""
+
+import os
+import shutil
+import time
+from datetime import datetime
+
+from backup_codec import CODEC_SUFFIX, decompress_file, file_sha256
+from backup_store import BACKUP_PREFIX
+from sqlite_snapshot import content_checksum, quick_check, restore_database
+
+COLD_RESTORE_TIMEOUT = 120  # secunde pentru descărcare
+COLD_RESTORE_CHUNK = 4 * 1024 * 1024  # octeți per bloc descărcat
+
+class RestoreError(Exception):
+    """Backup-ul nu a putut fi descărcat la timp sau nu a trecut verificarea"""
+
+def local_matches(db_path, backup):
+    """True dacă baza locală are exact conținutul backup-ului (după checksum)"""
+    expected = backup.get('content_sha256')
+    if not expected or not os.path.exists(db_path):
+        return False
+    try:
+        return content_checksum(db_path) == expected
+    except OSError:
+        return False
+
+def download_backup(download, backup, dest_path, timeout=COLD_RESTORE_TIMEOUT,
+                    chunksize=COLD_RESTORE_CHUNK, clock=time.monotonic):
+    """Descarcă backup-ul de pe Drive în dest_path, oprindu-se dacă depășește `timeout`"""
+    deadline = clock() + timeout
+    state = {'reported': 0}
+
+    def progress(transferred, total):
+        if clock() > deadline:
+            raise RestoreError(f"Descărcarea {backup['filename']} nu s-a terminat în {timeout} secunde")
+        percent = int(transferred * 100 / total) if total else 100
+        if percent - state['reported'] >= 25 or percent == 100:
+            state['reported'] = percent
+            print(f"⬇️ {backup['filename']}: {transferred / 1024:.0f} KB ({percent}%)")
+
+    download(backup['gdrive_id'], dest_path, callback=progress, chunksize=chunksize)
+    return dest_path
+
+def verify_backup(path, backup, codec=None):
+    """Decomprimă (dacă e cazul) și verifică; returnează calea fișierului SQLite"""
+    db_path = path[:-len(CODEC_SUFFIX[codec])] if codec else path
+    sha256 = decompress_file(path, db_path, codec) if codec else file_sha256(path)
+    if backup.get('sha256') and sha256 != backup['sha256']:
+        raise RestoreError(f"Checksum greșit pentru {backup['filename']}")
+    result = quick_check(db_path)
+    if result != 'ok':
+        raise RestoreError(f"{backup['filename']} nu a trecut quick_check: {result}")
+    return db_path
+
+def install_database(verified_path, db_path):
+    """Înlocuiește atomic baza de date; doar când nicio conexiune nu o folosește"""
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.replace(verified_path, db_path)
+
+def restore_latest(db_path, backup, download=None, open_local=None, cold_start=False,
+                   timeout=COLD_RESTORE_TIMEOUT):
+    """Aduce baza de date la `backup` (intrare din catalog).
+
+    open_local(nume) este contextul care dă calea unei copii locale
+    (backup_store.open_backup). Returnează (restaurat, mesaj); ridică RestoreError.
+    """
+    if local_matches(db_path, backup):
+        return False, f"Baza de date este deja la zi cu {backup['filename']}"
+
+    work_dir = os.path.dirname(os.path.abspath(db_path))
+    temp_path = os.path.join(work_dir, f".{os.path.basename(db_path)}.restore")
+    codec = backup.get('codec') if backup.get('format', 'file') == 'file' else None
+    download_path = temp_path + CODEC_SUFFIX.get(codec, '')
+    try:
+        if backup.get('local') and open_local is not None:
+            # Copia locală (deja verificată la deschidere) evită descărcarea
+            with open_local(backup['filename']) as local_path:
+                shutil.copyfile(local_path, temp_path)
+            verified = verify_backup(temp_path, backup)
+            source = 'backup local'
+        elif backup.get('gdrive_id') and download is not None:
+            start = time.monotonic()
+            download_backup(download, backup, download_path, timeout=timeout)
+            verified = verify_backup(download_path, backup, codec)
+            source = f"Google Drive ({time.monotonic() - start:.1f}s)"
+        else:
+            raise RestoreError(f"{backup['filename']} nu este disponibil nici local, nici pe Google Drive")
+
+        if cold_start:
+            install_database(verified, db_path)
+        else:
+            restore_database(verified, db_path)
+        return True, f"Date restaurate din {source}: {backup['filename']}"
+    finally:
+        for path in (temp_path, download_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+def register_drive_backups(catalog, files):
+    """Trece în catalog backup-urile găsite în folderul de pe Drive (ex. pe un disc nou, gol)"""
+    for drive_file in files:
+        title = drive_file['title']
+        codec = next((name for name, suffix in CODEC_SUFFIX.items() if title.endswith(suffix)), None)
+        filename = title[:-len(CODEC_SUFFIX[codec])] if codec else title
+        if not filename.endswith('.db') or catalog.get(filename):
+            continue
+        try:
+            created_at = datetime.strptime(filename[len(BACKUP_PREFIX):-3], '%Y%m%d_%H%M%S').isoformat()
+        except ValueError:
+            continue
+        # Originea (automat/manual) nu se mai știe; retenția le tratează pe niveluri, ca automate
+        catalog.record({'filename': filename, 'created_at': created_at, 'format': 'file', 'codec': codec,
+                        'stored_as': title, 'size': int(drive_file.get('fileSize') or 0),
+                        'gdrive_id': drive_file['id'], 'is_auto_backup': True}, local=False)
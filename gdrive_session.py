@@ -0,0 +1,159 @@
+"""
+Sesiunea Google Drive a procesului: un singur client, autentificat o singură dată.
+
+Înainte, fiecare upload construia un GoogleAuth nou, rescria pe Render
+client_secrets.json și gdrive_token.json și căuta din nou folderul de backup.
+DriveSession păstrează clientul (și conexiunile HTTP ale lui pydrive2, câte una
+per thread), reîmprospătează token-ul doar când a expirat și ține ID-ul
+folderului în cache, deci un backup face doar apelurile API de care are nevoie.
+
+Conexiunea propriu-zisă este o funcție primită la construcție, astfel încât
+sesiunea poate fi testată cu un Drive fals, fără rețea și fără pydrive2.
+"""
+
+import os
+import threading
+
+from runtime_profile import PROFILE
+
+GDRIVE_FOLDER_NAME = "AI Finance App Backups"
+GDRIVE_FOLDER_MIMETYPE = 'application/vnd.google-apps.folder'
+GDRIVE_TOKEN_FILE = "gdrive_token.json"
+GDRIVE_CLIENT_SECRETS_FILE = "client_secrets.json"
+
+class DriveUnavailable(Exception):
+    """Google Drive nu este configurat sau autentificarea a eșuat"""
+
+def connect_pydrive(is_render=None):
+    """Autentificare Google Drive cu suport pentru Render; returnează GoogleDrive sau None"""
+    from pydrive2.auth import GoogleAuth
+    from pydrive2.drive import GoogleDrive
+
+    if is_render is None:
+        is_render = PROFILE.is_render
+    gauth = GoogleAuth()
+
+    # Pentru Render, credențialele vin din variabilele de mediu (scrise o singură dată pe proces)
+    if is_render:
+        client_secrets_str = os.environ.get('GDRIVE_CLIENT_SECRETS')
+        token_str = os.environ.get('GDRIVE_TOKEN')
+        if not (client_secrets_str and token_str):
+            print("⚠️ Nu sunt configurate variabilele de mediu pentru Google Drive pe Render")
+            return None
+        with open(GDRIVE_CLIENT_SECRETS_FILE, 'w') as f:
+            f.write(client_secrets_str)
+        with open(GDRIVE_TOKEN_FILE, 'w') as f:
+            f.write(token_str)
+        print("✅ Credentials încărcate din variabilele de mediu Render")
+
+    # Configurează setările pentru refresh token
+    gauth.settings['access_type'] = 'offline'
+    gauth.settings['approval_prompt'] = 'force'
+
+    # Încearcă să încarce credențialele salvate
+    try:
+        gauth.LoadCredentialsFile(GDRIVE_TOKEN_FILE)
+    except Exception:
+        pass
+
+    if gauth.credentials is None:
+        if is_render:
+            print("❌ Nu s-au putut încărca credentials pentru Render")
+            return None
+
+        # Prima dată: va deschide browserul pentru autentificare
+        print("Se deschide browserul pentru autentificare Google...")
+        gauth.LocalWebserverAuth()
+    elif gauth.access_token_expired:
+        gauth.Refresh()
+    else:
+        gauth.Authorize()
+
+    gauth.SaveCredentialsFile(GDRIVE_TOKEN_FILE)
+    return GoogleDrive(gauth)
+
+class DriveSession:
+    """Clientul Google Drive comun tuturor backup-urilor din proces"""
+
+    def __init__(self, connect=connect_pydrive, folder_name=GDRIVE_FOLDER_NAME, token_file=GDRIVE_TOKEN_FILE):
+        self._connect = connect
+        self.folder_name = folder_name
+        self.token_file = token_file
+        self._lock = threading.RLock()
+        self._drive = None
+        self._folder_id = None
+
+    def drive(self):
+        """Clientul autentificat; token-ul este reîmprospătat doar dacă a expirat"""
+        with self._lock:
+            if self._drive is None:
+                drive = self._connect()
+                if drive is None:
+                    raise DriveUnavailable("Google Drive nu este configurat")
+                self._drive = drive
+            elif self._drive.auth.access_token_expired:
+                self._drive.auth.Refresh()
+                self._drive.auth.SaveCredentialsFile(self.token_file)
+            return self._drive
+
+    def folder_id(self):
+        """ID-ul folderului de backup (căutat sau creat o singură dată)"""
+        with self._lock:
+            if self._folder_id is None:
+                drive = self.drive()
+                query = f"title='{self.folder_name}' and mimeType='{GDRIVE_FOLDER_MIMETYPE}' and trashed=false"
+                file_list = drive.ListFile({'q': query}).GetList()
+                if file_list:
+                    self._folder_id = file_list[0]['id']
+                    print(f"✅ Folder găsit pe Google Drive: {self.folder_name}")
+                else:
+                    folder = drive.CreateFile({'title': self.folder_name, 'mimeType': GDRIVE_FOLDER_MIMETYPE})
+                    folder.Upload()
+                    self._folder_id = folder['id']
+                    print(f"✅ Folder creat pe Google Drive: {self.folder_name}")
+            return self._folder_id
+
+    def upload(self, filepath, folder_id=None, title=None):
+        """Urcă un fișier (upload resumable pydrive2); returnează ID-ul de pe Drive"""
+        metadata = {'title': title or os.path.basename(filepath)}
+        if folder_id:
+            metadata['parents'] = [{'id': folder_id}]
+        file_drive = self.drive().CreateFile(metadata)
+        file_drive.SetContentFile(filepath)
+        file_drive.Upload()
+        return file_drive['id']
+
+    def download(self, file_id, dest_path, callback=None, chunksize=None):
+        """Descarcă în flux în dest_path; callback(transferat, total) după fiecare bloc"""
+        options = {}
+        if callback is not None:
+            options['callback'] = callback
+        if chunksize:
+            options['chunksize'] = chunksize
+        self.drive().CreateFile({'id': file_id}).GetContentFile(dest_path, **options)
+        return dest_path
+
+    def list_files(self, prefix, folder_id=None):
+        """Fișierele din folderul de backup al căror titlu începe cu `prefix`"""
+        query = f"'{folder_id or self.folder_id()}' in parents and title contains '{prefix}' and trashed=false"
+        return [dict(f) for f in self.drive().ListFile({'q': query}).GetList() if f['title'].startswith(prefix)]
+
+    def delete(self, file_id):
+        self.drive().CreateFile({'id': file_id}).Delete()
+
+    def reset(self):
+        """Renunță la client și la folderul din cache (ex. după o eroare de autentificare)"""
+        with self._lock:
+            self._drive = None
+            self._folder_id = None
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_drive_session():
+    """Sesiunea unică a procesului"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = DriveSession()
+        return _session
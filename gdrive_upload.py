@@ -0,0 +1,101 @@
+"""
+Urcarea în paralel a backup-urilor pe Google Drive, cu reluare și reîncercări.
+
+Fișierele sunt urcate de un pool de thread-uri de dimensiune fixă (fiecare
+upload este resumable în pydrive2). După fiecare fișier urcat, numele și ID-ul
+de pe Drive sunt salvate în fișierul de progres, deci o sincronizare întreruptă
+reia doar fișierele rămase. Erorile temporare sunt reîncercate cu backoff
+exponențial (cu jitter), ca mai multe thread-uri să nu lovească API-ul simultan.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+GDRIVE_UPLOAD_WORKERS = 4
+GDRIVE_UPLOAD_RETRIES = 4
+GDRIVE_UPLOAD_BACKOFF = 2.0  # secunde, dublat la fiecare reîncercare
+GDRIVE_UPLOAD_MAX_BACKOFF = 60  # secunde
+GDRIVE_UPLOAD_PROGRESS = 'gdrive_upload_progress.json'
+
+def retry_with_backoff(fn, retries=GDRIVE_UPLOAD_RETRIES, backoff=GDRIVE_UPLOAD_BACKOFF,
+                       max_backoff=GDRIVE_UPLOAD_MAX_BACKOFF, sleep=time.sleep, label=''):
+    """Apelează fn(); la eroare reîncearcă de cel mult `retries` ori, cu pauze crescătoare"""
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            delay = min(max_backoff, backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            print(f"⚠️ {label}: reîncercare {attempt}/{retries} în {delay:.1f}s ({e})")
+            sleep(delay)
+
+class UploadProgress:
+    """Backup-urile deja urcate ({nume: gdrive_id}), salvate atomic după fiecare upload"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._done = json.load(f)
+        except (OSError, ValueError):
+            self._done = {}
+
+    def get(self, filename):
+        with self._lock:
+            return self._done.get(filename)
+
+    def record(self, filename, gdrive_id):
+        with self._lock:
+            self._done[filename] = gdrive_id
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._done, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+def upload_backups(items, upload, progress_path, workers=GDRIVE_UPLOAD_WORKERS, retries=GDRIVE_UPLOAD_RETRIES,
+                   backoff=GDRIVE_UPLOAD_BACKOFF, sleep=time.sleep, on_uploaded=None):
+    """Urcă [(nume, cale)] cu upload(cale) -> gdrive_id.
+
+    Fișierele trecute deja în progres sunt sărite. on_uploaded(nume, gdrive_id)
+    este apelat din thread-ul worker după fiecare upload reușit. Returnează
+    {'uploaded': {nume: id}, 'skipped': {nume: id}, 'failed': {nume: eroare}}.
+    """
+    progress = UploadProgress(progress_path)
+    result = {'uploaded': {}, 'skipped': {}, 'failed': {}}
+    pending = []
+    for filename, path in items:
+        gdrive_id = progress.get(filename)
+        if gdrive_id:
+            result['skipped'][filename] = gdrive_id
+        else:
+            pending.append((filename, path))
+
+    def job(filename, path):
+        gdrive_id = retry_with_backoff(lambda: upload(path), retries=retries, backoff=backoff,
+                                       sleep=sleep, label=filename)
+        progress.record(filename, gdrive_id)
+        if on_uploaded is not None:
+            on_uploaded(filename, gdrive_id)
+        return gdrive_id
+
+    if not pending:
+        return result
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(job, filename, path): filename for filename, path in pending}
+        for future in as_completed(futures):
+            filename = futures[future]
+            try:
+                result['uploaded'][filename] = future.result()
+                print(f"✅ Backup urcat: {filename}")
+            except Exception as e:
+                result['failed'][filename] = str(e)
+                print(f"❌ Eroare la upload {filename}: {e}")
+    return result
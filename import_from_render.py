@@ -5,17 +5,29 @@ Importă datele de pe Render și le scrie local (suprascrie tot)
 
 import requests
 import sqlite3
+from change_log import apply_changes
+
+# Rânduri cerute per pagină; răspunsurile vin comprimate gzip
+PAGE_SIZE = 5000
 
 def fetch_render_data():
     url = "https://ai-finance-app.onrender.com/api/export"
+    data = {'obiecte': [], 'tranzactii': []}
+    params = {'limit': PAGE_SIZE}
     try:
-        r = requests.get(url, timeout=30)
-        if r.status_code == 200:
-            print("✅ Datele au fost descărcate de pe Render!")
-            return r.json()
-        else:
-            print(f"❌ Eroare la descărcare: {r.status_code}")
-            return None
+        while True:
+            r = requests.get(url, params=params, timeout=30, headers={'Accept-Encoding': 'gzip'})
+            if r.status_code != 200:
+                print(f"❌ Eroare la descărcare: {r.status_code}")
+                return None
+            page = r.json()
+            data['obiecte'].extend(page.get('obiecte', []))
+            data['tranzactii'].extend(page.get('tranzactii', []))
+            if not page.get('next'):
+                break
+            params = {'limit': PAGE_SIZE, 'cursor': page['next']}
+        print("✅ Datele au fost descărcate de pe Render!")
+        return data
     except Exception as e:
         print(f"❌ Eroare la conectare: {e}")
         return None
@@ -27,16 +39,14 @@ def import_local(data):
         # Șterge tot
         c.execute('DELETE FROM tranzactii')
         c.execute('DELETE FROM obiecte')
-        # Reimportă obiecte
+        # Reimportă obiectele și tranzacțiile, păstrând ID-urile
         obiecte = data.get('obiecte', [])
-        for obj in obiecte:
-            # obj[1] = nume
-            c.execute('INSERT INTO obiecte (id, nume) VALUES (?, ?)', (obj[0], obj[1]))
-        # Reimportă tranzacții
         tranzactii = data.get('tranzactii', [])
-        for tr in tranzactii:
-            c.execute('''INSERT INTO tranzactii (id, data, suma, comentariu, operator, tip, obiect, persoana, categorie)
-                         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''', tr)
+        apply_changes(conn, [
+            {'tabel': tabel, 'op': 'insert', 'row_id': row['id'], 'coloane': row}
+            for tabel, rows in (('obiecte', obiecte), ('tranzactii', tranzactii))
+            for row in rows
+        ])
         conn.commit()
         conn.close()
         print(f"✅ Datele au fost importate local! Obiecte: {len(obiecte)}, Tranzacții: {len(tranzactii)}")
@@ -9,6 +9,8 @@ import json
 import sqlite3
 import os
 from datetime import datetime
+from pathlib import Path
+from change_log import apply_changes, load_sync_cursor, save_sync_cursor, pull_changes
 
 def get_manual_url():
     """Cere utilizatorului să introducă URL-ul corect"""
@@ -105,35 +107,14 @@ def sync_with_online_data(online_data):
         cursor.execute("DELETE FROM tranzactii")
         cursor.execute("DELETE FROM obiecte")
         
-        # Inserează tranzacțiile de pe serverul online
-        if 'tranzactii' in online_data:
-            for tranzactie in online_data['tranzactii']:
-                cursor.execute("""
-                    INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    tranzactie.get('data', ''),
-                    tranzactie.get('suma', 0),
-                    tranzactie.get('comentariu', ''),
-                    tranzactie.get('operator', ''),
-                    tranzactie.get('tip', ''),
-                    tranzactie.get('obiect', ''),
-                    tranzactie.get('persoana', ''),
-                    tranzactie.get('categorie', '')
-                ))
-        
-        # Inserează obiectele de pe serverul online
-        if 'obiecte' in online_data:
-            for obiect in online_data['obiecte']:
-                cursor.execute("""
-                    INSERT INTO obiecte (nume, valoare, descriere, categorie)
-                    VALUES (?, ?, ?, ?)
-                """, (
-                    obiect.get('nume', ''),
-                    obiect.get('valoare', 0),
-                    obiect.get('descriere', ''),
-                    obiect.get('categorie', '')
-                ))
+        # Reinserează rândurile cu ID-urile de pe server, ca modificările
+        # incrementale ulterioare să se potrivească
+        snapshot = [
+            {'tabel': tabel, 'op': 'insert', 'row_id': row['id'], 'coloane': row}
+            for tabel in ('obiecte', 'tranzactii')
+            for row in online_data.get(tabel, [])
+        ]
+        apply_changes(conn, snapshot)
         
         conn.commit()
         print("✅ Sincronizare completă cu serverul online")
@@ -172,6 +153,27 @@ def main():
         print("Poți rula din nou scriptul când ai URL-ul corect.")
         return
     
+    # Dacă avem un cursor pentru acest server, descarcă doar modificările
+    cursor = load_sync_cursor(url)
+    if cursor:
+        print(f"\n=== Sincronizare incrementală de la secvența {cursor['since']} ===")
+        conn = sqlite3.connect('finance.db')
+        try:
+            result = pull_changes(url, conn, cursor)
+        except Exception as e:
+            print(f"❌ Eroare la sincronizarea incrementală: {e}")
+            result = None
+        finally:
+            conn.close()
+        
+        if result is not None:
+            new_cursor, stats = result
+            save_sync_cursor(url, new_cursor)
+            print(f"✅ Modificări aplicate: {stats['applied']} (ignorate: {stats['skipped']})")
+            print("\n🔄 Pentru a aplica modificările, repornește serverul local.")
+            return
+        print("⚠️ Este necesară o sincronizare completă")
+    
     # Descarcă datele de pe serverul online
     online_data = download_online_data(url)
     
@@ -187,6 +189,8 @@ def main():
     success = sync_with_online_data(online_data)
     
     if success:
+        if 'seq' in online_data:
+            save_sync_cursor(url, {'since': online_data['seq'], 'epoch': online_data.get('epoch')})
         print("\n✅ Sincronizare completă!")
         print("Aplicația locală are acum aceleași date ca serverul online.")
         print("\n🔄 Pentru a aplica modificările, repornește serverul local.")
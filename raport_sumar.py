@@ -0,0 +1,97 @@
+"""
+Tabelul materializat raport_sumar din care este calculat raportul de pe pagina principală.
+
+Conține câte un rând pentru fiecare (operator, tip, is_transfer), cu suma și numărul
+tranzacțiilor. Este menținut de trigger-ele pe tranzactii create în
+app.create_schema(), astfel încât raportul citește câteva rânduri în loc să
+agrege tot tabelul. Modulul nu depinde de Flask; rulat direct, reconstruiește
+tabelul de la zero și afișează diferențele față de starea menținută:
+
+    python raport_sumar.py [finance.db]
+"""
+
+import os
+import sqlite3
+import sys
+
+RAPORT_SUMAR_DDL = '''
+    CREATE TABLE IF NOT EXISTS raport_sumar (
+        operator TEXT NOT NULL,
+        tip TEXT NOT NULL,
+        is_transfer INTEGER NOT NULL,
+        total REAL NOT NULL DEFAULT 0,
+        numar INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (operator, tip, is_transfer)
+    )
+'''
+
+def _apply(prefix, sign):
+    return f'''
+                    INSERT INTO raport_sumar (operator, tip, is_transfer, total, numar)
+                    VALUES ({prefix}.operator, {prefix}.tip, {prefix}.obiect = 'transfer', {sign}{prefix}.suma, {sign}1)
+                    ON CONFLICT (operator, tip, is_transfer)
+                    DO UPDATE SET total = total + excluded.total, numar = numar + excluded.numar;'''
+
+def summary_statement(op):
+    """Instrucțiunile din corpul trigger-ului pe tranzactii care actualizează raport_sumar"""
+    op = op.lower()
+    if op == 'insert':
+        return _apply('NEW', '')
+    statements = _apply('OLD', '-')
+    if op == 'update':
+        statements += _apply('NEW', '')
+    return statements + '''
+                    DELETE FROM raport_sumar WHERE numar = 0;'''
+
+def rebuild_summary(conn):
+    """Reconstruiește raport_sumar dintr-o singură agregare peste tranzactii (nu face commit)"""
+    conn.execute("DELETE FROM raport_sumar")
+    conn.execute('''
+        INSERT INTO raport_sumar (operator, tip, is_transfer, total, numar)
+        SELECT operator, tip, obiect = 'transfer', SUM(suma), COUNT(*)
+        FROM tranzactii
+        GROUP BY operator, tip, obiect = 'transfer'
+    ''')
+
+def read_summary(conn):
+    """{(operator, tip, is_transfer): (total, numar)} din tabelul menținut"""
+    return {
+        (row[0], row[1], bool(row[2])): (row[3], row[4])
+        for row in conn.execute("SELECT operator, tip, is_transfer, total, numar FROM raport_sumar")
+    }
+
+def verify_summary(conn, tolerance=0.005):
+    """Compară raport_sumar cu o agregare proaspătă; returnează cheile care diferă"""
+    fresh = {
+        (row[0], row[1], bool(row[2])): (row[3], row[4])
+        for row in conn.execute('''
+            SELECT operator, tip, obiect = 'transfer', SUM(suma), COUNT(*)
+            FROM tranzactii GROUP BY operator, tip, obiect = 'transfer'
+        ''')
+    }
+    maintained = read_summary(conn)
+    differences = []
+    for key in sorted(set(fresh) | set(maintained), key=str):
+        expected, actual = fresh.get(key, (0, 0)), maintained.get(key, (0, 0))
+        if expected[1] != actual[1] or abs(expected[0] - actual[0]) > tolerance:
+            differences.append({'cheie': key, 'asteptat': expected, 'mentinut': actual})
+    return differences
+
+def main(database='finance.db'):
+    if not os.path.exists(database):
+        print(f"❌ Baza de date {database} nu există")
+        return
+    conn = sqlite3.connect(database)
+    try:
+        conn.execute(RAPORT_SUMAR_DDL)
+        differences = verify_summary(conn)
+        for diff in differences:
+            print(f"⚠️ {diff['cheie']}: menținut {diff['mentinut']}, recalculat {diff['asteptat']}")
+        rebuild_summary(conn)
+        conn.commit()
+        print(f"✅ raport_sumar reconstruit ({len(read_summary(conn))} rânduri, {len(differences)} diferențe)")
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,175 @@
+"""
+Reclasificarea tranzacțiilor existente cu regulile curente din classifier.py.
+
+Tranzacțiile sunt citite în loturi după id, clasificate într-un pool de procese
+și doar rândurile care s-au schimbat sunt scrise înapoi, cu un UPDATE pe lot.
+După fiecare lot este salvat un checkpoint, astfel încât o rulare întreruptă
+continuă de unde a rămas. Modulul nu depinde de Flask; rulat direct:
+
+    python reclasificare.py [finance.db] [--reset]
+"""
+
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from classifier import Classifier
+
+RECLASIFICARE_CHUNK_SIZE = 500
+RECLASIFICARE_CHECKPOINT = 'reclasificare_checkpoint.json'
+
+# Tranzacțiile create de transfer() au câmpurile setate explicit, nu de clasificator
+CATEGORIE_TRANSFER = 'transfer'
+
+_worker_classifier = None
+
+def _init_worker(lista_obiecte):
+    global _worker_classifier
+    _worker_classifier = Classifier(lista_obiecte)
+
+def _classify_chunk(rows):
+    """Rulează în procesul worker: returnează doar rândurile a căror clasificare diferă"""
+    changed = []
+    for row_id, comentariu, tip, obiect, persoana, categorie in rows:
+        nou = _worker_classifier.classify(comentariu)
+        if nou != (tip, obiect, persoana, categorie):
+            changed.append(nou + (row_id, comentariu))
+    return changed
+
+def _pool_context():
+    """Worker-ii pornesc prin forkserver (spawn pe Windows), niciodată prin fork.
+
+    Reclasificarea rulează din aplicația Flask, care are thread-uri active; un
+    fork ar copia în worker lock-uri ținute de acele thread-uri. Classifier și
+    lista de obiecte ajung în worker prin pickle.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+def load_checkpoint(path=RECLASIFICARE_CHECKPOINT):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_checkpoint(state, path=RECLASIFICARE_CHECKPOINT):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+def clear_checkpoint(path=RECLASIFICARE_CHECKPOINT):
+    if os.path.exists(path):
+        os.remove(path)
+
+def _read_chunks(conn, after_id, chunk_size):
+    while True:
+        rows = conn.execute('''
+            SELECT id, comentariu, tip, obiect, persoana, categorie FROM tranzactii
+            WHERE id > ? AND categorie != ?
+            ORDER BY id LIMIT ?
+        ''', (after_id, CATEGORIE_TRANSFER, chunk_size)).fetchall()
+        if not rows:
+            return
+        after_id = rows[-1][0]
+        yield after_id, [tuple(row) for row in rows]
+
+def reclassify(database, chunk_size=RECLASIFICARE_CHUNK_SIZE, workers=None,
+               checkpoint_path=RECLASIFICARE_CHECKPOINT, progress=None, should_stop=None):
+    """Reclasifică toate tranzacțiile, continuând de la checkpoint dacă există.
+
+    progress(state) este apelat după fiecare lot scris, cu starea curentă și
+    lista ID-urilor modificate în lot (cheia 'ids'). should_stop() permite
+    oprirea între loturi; checkpoint-ul rămâne pentru o reluare ulterioară.
+    """
+    state = load_checkpoint(checkpoint_path) or {
+        'last_id': 0, 'processed': 0, 'updated': 0, 'started_at': datetime.now().isoformat()
+    }
+    conn = sqlite3.connect(database, timeout=30)
+    executor = None
+    try:
+        lista_obiecte = [row[0] for row in conn.execute("SELECT nume FROM obiecte")]
+        state['total'] = conn.execute(
+            "SELECT COUNT(*) FROM tranzactii WHERE categorie != ?", (CATEGORIE_TRANSFER,)
+        ).fetchone()[0]
+
+        if workers != 0:
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(),
+                                           initializer=_init_worker, initargs=(lista_obiecte,))
+            max_in_flight = 2 * (workers or os.cpu_count() or 1)
+        else:
+            _init_worker(lista_obiecte)
+            max_in_flight = 1
+
+        def submit(rows):
+            if executor is not None:
+                return executor.submit(_classify_chunk, rows).result
+            changed = _classify_chunk(rows)
+            return lambda: changed
+
+        # Loturile sunt clasificate în paralel, dar scrise și confirmate în ordinea id-urilor
+        in_flight = deque()
+        chunks = _read_chunks(conn, state['last_id'], chunk_size)
+        exhausted = False
+        while True:
+            stopping = should_stop is not None and should_stop()
+            while not stopping and not exhausted and len(in_flight) < max_in_flight:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                last_id, rows = chunk
+                in_flight.append((last_id, len(rows), submit(rows)))
+            if not in_flight:
+                break
+
+            last_id, count, result = in_flight.popleft()
+            changed = result()
+            updated = 0
+            if changed:
+                # comentariu în WHERE: un rând editat între timp nu este suprascris
+                updated = conn.executemany('''
+                    UPDATE tranzactii SET tip = ?, obiect = ?, persoana = ?, categorie = ?
+                    WHERE id = ? AND comentariu = ?
+                ''', changed).rowcount
+            conn.commit()
+
+            state.update(last_id=last_id, processed=state['processed'] + count,
+                         updated=state['updated'] + updated)
+            save_checkpoint(state, checkpoint_path)
+            if progress is not None:
+                progress(dict(state, ids=[row[4] for row in changed]))
+
+        if exhausted:
+            clear_checkpoint(checkpoint_path)
+            state['finished_at'] = datetime.now().isoformat()
+        return state
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        conn.close()
+
+def main(*args):
+    database = next((arg for arg in args if not arg.startswith('--')), 'finance.db')
+    if not os.path.exists(database):
+        print(f"❌ Baza de date {database} nu există")
+        return
+    if '--reset' in args:
+        clear_checkpoint()
+
+    def afiseaza(state):
+        print(f"🔄 {state['processed']}/{state['total']} tranzacții verificate, {state['updated']} reclasificate")
+
+    state = reclassify(database, progress=afiseaza)
+    print(f"✅ Reclasificare terminată: {state['updated']} tranzacții modificate")
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,100 @@
+"""
+Profilul de rulare al aplicației (local sau Render), calculat o singură dată la import.
+
+Toate modulele citesc PROFILE în loc să inspecteze os.environ la fiecare apel,
+astfel încât drumul unui request nu face nici logging, nici scanări de mediu.
+"""
+
+import os
+import importlib.util
+
+# Intervalele de backup automat
+BACKUP_INTERVAL_LOCAL = 43200  # secunde (12 ore)
+BACKUP_INTERVAL_RENDER = 60  # secunde (1 minut)
+
+# PRAGMA-uri aplicate la deschiderea fiecărei conexiuni SQLite
+LOCAL_PRAGMAS = ()
+RENDER_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=10000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+RENDER_ENV_VARS = (
+    'RENDER',
+    'HOSTNAME',
+    'RENDER_EXTERNAL_HOSTNAME',
+    'RENDER_SERVICE_NAME',
+    'RENDER_SERVICE_ID',
+    'RENDER_INSTANCE_ID',
+)
+
+class RuntimeProfile:
+    """Setările rezolvate pentru mediul curent"""
+
+    def __init__(self, environment, backup_interval, sqlite_pragmas, gdrive_available, env_snapshot=None):
+        self.environment = environment
+        self.backup_interval = backup_interval
+        self.sqlite_pragmas = tuple(sqlite_pragmas)
+        self.gdrive_available = gdrive_available
+        self.env_snapshot = dict(env_snapshot or {})
+
+    @property
+    def is_render(self):
+        return self.environment == 'render'
+
+    def describe(self):
+        """Returnează liniile de diagnostic (afișate o singură dată la pornire)"""
+        lines = ["🔍 Detectare mediu Render:"]
+        for name in RENDER_ENV_VARS:
+            lines.append(f"   {name}: {self.env_snapshot.get(name) or 'Not set'}")
+        lines.append(f"   Rezultat detectare: {self.is_render}")
+        lines.append(f"   Interval backup: {self.backup_interval} secunde")
+        lines.append(f"   Google Drive disponibil: {self.gdrive_available}")
+        return lines
+
+    def __repr__(self):
+        return (f"RuntimeProfile(environment={self.environment!r}, backup_interval={self.backup_interval}, "
+                f"gdrive_available={self.gdrive_available})")
+
+def _detect_render(environ):
+    """Multiple metode de detectare pentru Render"""
+    render_indicators = [
+        environ.get('RENDER', False),
+        'render' in environ.get('HOSTNAME', '').lower(),
+        'render' in environ.get('RENDER_EXTERNAL_HOSTNAME', '').lower(),
+        'render' in environ.get('RENDER_SERVICE_NAME', '').lower(),
+        environ.get('RENDER_SERVICE_NAME') is not None,
+        environ.get('RENDER_EXTERNAL_HOSTNAME') is not None,
+        environ.get('RENDER_SERVICE_ID') is not None,
+        environ.get('RENDER_INSTANCE_ID') is not None
+    ]
+    return any(render_indicators)
+
+def _detect_gdrive(environ, is_render):
+    """Google Drive este disponibil dacă pydrive2 e instalat și există credențiale"""
+    if environ.get('GOOGLE_DRIVE_ENABLED', '').lower() in ('false', '0', 'no'):
+        return False
+    if importlib.util.find_spec('pydrive2') is None:
+        return False
+    if is_render:
+        return bool(environ.get('GDRIVE_CLIENT_SECRETS') and environ.get('GDRIVE_TOKEN'))
+    # Local, autentificarea poate porni din browser dacă token-ul lipsește
+    return True
+
+def detect_runtime_profile(environ=None):
+    """Construiește profilul pe baza variabilelor de mediu"""
+    if environ is None:
+        environ = os.environ
+
+    is_render = _detect_render(environ)
+    return RuntimeProfile(
+        environment='render' if is_render else 'local',
+        backup_interval=BACKUP_INTERVAL_RENDER if is_render else BACKUP_INTERVAL_LOCAL,
+        sqlite_pragmas=RENDER_PRAGMAS if is_render else LOCAL_PRAGMAS,
+        gdrive_available=_detect_gdrive(environ, is_render),
+        env_snapshot={name: environ.get(name) for name in RENDER_ENV_VARS},
+    )
+
+PROFILE = detect_runtime_profile()
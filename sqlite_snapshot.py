@@ -0,0 +1,149 @@
+"""
+Copii consistente ale bazei de date prin API-ul de backup SQLite.
+
+Spre deosebire de shutil.copy2, sqlite3.Connection.backup() copiază pagini
+dintr-o stare consistentă (inclusiv ce se află încă în fișierul WAL). În modul
+WAL copia nu blochează scrierile; în modul rollback journal este făcută pe pași
+scurți, ca aplicația să poată scrie între ei. Fiecare copie este verificată cu
+PRAGMA quick_check înainte să fie folosită.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+
+# Paginile copiate la un pas și pauza dintre pași (cedează lock-ul scrierilor).
+# Se aplică doar în modul rollback journal: în WAL cititorii nu blochează scrierile,
+# deci copia se face într-un singur pas, dintr-o singură tranzacție de citire.
+SNAPSHOT_PAGES_PER_STEP = 256
+SNAPSHOT_STEP_SLEEP = 0.005  # secunde
+# O scriere din altă conexiune repornește copia de la prima pagină; după atâtea
+# reporniri copia este terminată într-un singur pas
+SNAPSHOT_MAX_RESTARTS = 3
+# Timpul maxim pentru o copie, inclusiv așteptarea lock-urilor
+SNAPSHOT_TIMEOUT = 60  # secunde
+
+class SnapshotError(Exception):
+    """Copia nu a trecut verificarea de integritate sau nu s-a terminat la timp"""
+
+class _TooManyRestarts(Exception):
+    pass
+
+def quick_check(path):
+    """Rezultatul PRAGMA quick_check ('ok' pentru o bază de date validă)"""
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("PRAGMA quick_check").fetchall()
+        return '; '.join(row[0] for row in rows)
+    finally:
+        conn.close()
+
+def _copy(source, dest, pages, step_sleep, max_restarts, timeout):
+    deadline = time.monotonic() + timeout
+    state = {'remaining': None, 'restarts': 0}
+
+    def check_deadline():
+        if time.monotonic() > deadline:
+            raise SnapshotError(f"Copia nu s-a terminat în {timeout} secunde")
+
+    def throttle(status, remaining, total):
+        check_deadline()
+        previous, state['remaining'] = state['remaining'], remaining
+        if previous is not None and remaining > previous:
+            state['restarts'] += 1
+            if state['restarts'] > max_restarts:
+                raise _TooManyRestarts()
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+
+    journal_mode = source.execute("PRAGMA journal_mode").fetchone()[0]
+    if journal_mode == 'wal':
+        source.backup(dest, progress=lambda status, remaining, total: check_deadline())
+        return
+    try:
+        source.backup(dest, pages=pages, progress=throttle)
+    except _TooManyRestarts:
+        source.backup(dest, progress=lambda status, remaining, total: check_deadline())
+
+def snapshot_database(db_path, dest_path, pages=SNAPSHOT_PAGES_PER_STEP, step_sleep=SNAPSHOT_STEP_SLEEP,
+                      max_restarts=SNAPSHOT_MAX_RESTARTS, timeout=SNAPSHOT_TIMEOUT):
+    """Copiază baza de date activă în dest_path și verifică copia.
+
+    Copia este scrisă într-un fișier temporar, comutată pe journal_mode=DELETE
+    (un singur fișier, fără -wal) și mutată atomic la destinație doar dacă
+    quick_check raportează 'ok'. Altfel (sau dacă timeout-ul expiră) ridică SnapshotError.
+    """
+    dest_path = os.fspath(dest_path)
+    tmp_path = dest_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    source = sqlite3.connect(db_path, timeout=timeout)
+    dest = sqlite3.connect(tmp_path)
+    try:
+        _copy(source, dest, pages, step_sleep, max_restarts, timeout)
+        dest.execute("PRAGMA journal_mode=DELETE")
+    except (SnapshotError, sqlite3.OperationalError) as e:
+        dest.close()
+        os.remove(tmp_path)
+        if isinstance(e, SnapshotError):
+            raise
+        raise SnapshotError(f"Copia {dest_path} nu a putut fi făcută: {e}") from e
+    finally:
+        dest.close()
+        source.close()
+
+    result = quick_check(tmp_path)
+    if result != 'ok':
+        os.remove(tmp_path)
+        raise SnapshotError(f"Copia {dest_path} nu a trecut quick_check: {result}")
+    os.replace(tmp_path, dest_path)
+    return dest_path
+
+def restore_database(backup_path, db_path):
+    """Scrie conținutul unui backup verificat peste baza de date activă.
+
+    Copierea trece prin SQLite (nu peste fișier), deci conexiunile deschise și
+    un eventual fișier WAL rămân consistente. Ridică SnapshotError dacă
+    backup-ul nu trece quick_check; baza de date activă nu este atinsă.
+    """
+    result = quick_check(backup_path)
+    if result != 'ok':
+        raise SnapshotError(f"Backup-ul {backup_path} nu a trecut quick_check: {result}")
+    source = sqlite3.connect(backup_path)
+    dest = sqlite3.connect(db_path)
+    try:
+        # Într-un singur pas: cititorii nu trebuie să vadă o bază pe jumătate restaurată
+        source.backup(dest)
+    finally:
+        dest.close()
+        source.close()
+
+# Câmpuri din antet rescrise de fiecare commit sau copie (versiunea WAL/rollback,
+# contorul de modificări, schema cookie incrementat de API-ul de backup),
+# excluse din checksum-ul conținutului
+_VOLATILE_HEADER = ((18, 20), (24, 28), (40, 44), (92, 96))
+_CHECKSUM_BLOCK = 1024 * 1024
+
+def content_checksum(path):
+    """SHA-256 al paginilor bazei de date, comparabil între baza activă și snapshot-urile ei.
+
+    Dacă există un fișier WAL, este mai întâi integrat în baza de date
+    (checkpoint), ca fișierul principal să conțină toate paginile.
+    """
+    path = os.fspath(path)
+    if os.path.exists(path + '-wal'):
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        header = bytearray(f.read(100))
+        for start, end in _VOLATILE_HEADER:
+            header[start:end] = bytes(end - start)
+        digest.update(header)
+        for block in iter(lambda: f.read(_CHECKSUM_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
@@ -9,6 +9,7 @@ import json
 import sqlite3
 import os
 from datetime import datetime
+from change_log import apply_changes, load_sync_cursor, save_sync_cursor, pull_changes
 
 # URL-ul aplicației tale pe Render
 ONLINE_URL = "https://ai-finance-app-f521.onrender.com"
@@ -61,35 +62,14 @@ def sync_with_online_data(online_data):
         cursor.execute("DELETE FROM tranzactii")
         cursor.execute("DELETE FROM obiecte")
         
-        # Inserează tranzacțiile de pe serverul online
-        if 'tranzactii' in online_data:
-            for tranzactie in online_data['tranzactii']:
-                cursor.execute("""
-                    INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    tranzactie.get('data', ''),
-                    tranzactie.get('suma', 0),
-                    tranzactie.get('comentariu', ''),
-                    tranzactie.get('operator', ''),
-                    tranzactie.get('tip', ''),
-                    tranzactie.get('obiect', ''),
-                    tranzactie.get('persoana', ''),
-                    tranzactie.get('categorie', '')
-                ))
-        
-        # Inserează obiectele de pe serverul online
-        if 'obiecte' in online_data:
-            for obiect in online_data['obiecte']:
-                cursor.execute("""
-                    INSERT INTO obiecte (nume, valoare, descriere, categorie)
-                    VALUES (?, ?, ?, ?)
-                """, (
-                    obiect.get('nume', ''),
-                    obiect.get('valoare', 0),
-                    obiect.get('descriere', ''),
-                    obiect.get('categorie', '')
-                ))
+        # Reinserează rândurile cu ID-urile de pe server, ca modificările
+        # incrementale ulterioare să se potrivească
+        snapshot = [
+            {'tabel': tabel, 'op': 'insert', 'row_id': row['id'], 'coloane': row}
+            for tabel in ('obiecte', 'tranzactii')
+            for row in online_data.get(tabel, [])
+        ]
+        apply_changes(conn, snapshot)
         
         conn.commit()
         print("✅ Sincronizare completă cu serverul online")
@@ -115,12 +95,42 @@ def sync_with_online_data(online_data):
     finally:
         conn.close()
 
+def pull_online_changes():
+    """Aplică doar modificările de după ultima sincronizare (dacă există un cursor)"""
+    cursor = load_sync_cursor(ONLINE_URL)
+    if not cursor:
+        return False
+    
+    print(f"=== Sincronizare incrementală de la secvența {cursor['since']} ===")
+    conn = sqlite3.connect('finance.db')
+    try:
+        result = pull_changes(ONLINE_URL, conn, cursor)
+    except Exception as e:
+        print(f"❌ Eroare la sincronizarea incrementală: {e}")
+        return False
+    finally:
+        conn.close()
+    
+    if result is None:
+        print("⚠️ Serverul a fost restaurat între timp - este necesară o sincronizare completă")
+        return False
+    
+    new_cursor, stats = result
+    save_sync_cursor(ONLINE_URL, new_cursor)
+    print(f"✅ Modificări aplicate: {stats['applied']} (ignorate: {stats['skipped']})")
+    return True
+
 def main():
     """Funcția principală"""
     print("🔄 Sincronizare cu serverul online")
     print(f"URL server: {ONLINE_URL}")
     print()
     
+    # Dacă avem un cursor, descarcă doar modificările
+    if pull_online_changes():
+        print("\n✅ Sincronizare completă!")
+        return True
+    
     # Descarcă datele de pe serverul online
     online_data = download_online_data()
     
@@ -136,6 +146,8 @@ def main():
     success = sync_with_online_data(online_data)
     
     if success:
+        if 'seq' in online_data:
+            save_sync_cursor(ONLINE_URL, {'since': online_data['seq'], 'epoch': online_data.get('epoch')})
         print("\n✅ Sincronizare completă!")
         print("Aplicația locală are acum aceleași date ca serverul online.")
     else:
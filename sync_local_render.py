@@ -8,40 +8,82 @@ import json
 import requests
 from datetime import datetime
 import os
+from change_log import get_changes_since, load_sync_cursor, save_sync_cursor
+
+RENDER_URL = "https://ai-finance-app.onrender.com"
 
 def get_local_data():
     """Obține datele din baza locală"""
     try:
         conn = sqlite3.connect('finance.db')
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
         # Obține tranzacțiile
         cursor.execute("SELECT * FROM tranzactii ORDER BY id")
-        tranzactii = cursor.fetchall()
+        tranzactii = [dict(row) for row in cursor.fetchall()]
         
         # Obține obiectele
         cursor.execute("SELECT * FROM obiecte ORDER BY id")
-        obiecte = cursor.fetchall()
+        obiecte = [dict(row) for row in cursor.fetchall()]
+        
+        # Secvența curentă devine cursorul pentru următoarea sincronizare
+        seq = cursor.execute("SELECT change_seq FROM sync_state WHERE id = 1").fetchone()
         
         conn.close()
         
         return {
             'tranzactii': tranzactii,
             'obiecte': obiecte,
+            'seq': seq[0] if seq else None,
             'timestamp': datetime.now().isoformat()
         }
     except Exception as e:
         print(f"❌ Eroare la citirea datelor locale: {e}")
         return None
 
+def get_local_changes(since):
+    """Obține rândurile locale inserate sau modificate după secvența `since` (trimise cu upsert)"""
+    try:
+        conn = sqlite3.connect('finance.db')
+        conn.row_factory = sqlite3.Row
+        
+        changed = {'tranzactii': set(), 'obiecte': set()}
+        deleted = 0
+        last_seq = since
+        while True:
+            changes = get_changes_since(conn, last_seq, 1000)
+            if not changes:
+                break
+            for change in changes:
+                if change['op'] == 'delete':
+                    changed[change['tabel']].discard(change['row_id'])
+                    deleted += 1
+                else:
+                    changed[change['tabel']].add(change['row_id'])
+            last_seq = changes[-1]['seq']
+        
+        data = {'seq': last_seq, 'deleted': deleted, 'timestamp': datetime.now().isoformat()}
+        for tabel, ids in changed.items():
+            ids = sorted(ids)
+            data[tabel] = []
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ','.join('?' for _ in chunk)
+                data[tabel].extend(dict(row) for row in conn.execute(
+                    f"SELECT * FROM {tabel} WHERE id IN ({placeholders})", chunk))
+        
+        conn.close()
+        return data
+    except Exception as e:
+        print(f"❌ Eroare la citirea modificărilor locale: {e}")
+        return None
+
 def get_render_data():
     """Obține datele de pe Render prin API"""
     try:
-        # URL-ul aplicației pe Render
-        render_url = "https://ai-finance-app.onrender.com"
-        
         # Obține datele prin API
-        response = requests.get(f"{render_url}/api/export", timeout=30)
+        response = requests.get(f"{RENDER_URL}/api/export", timeout=30)
         
         if response.status_code == 200:
             return response.json()
@@ -85,23 +127,29 @@ def compare_data(local_data, render_data):
         return False
 
 def sync_to_render(local_data):
-    """Sincronizează datele locale pe Render"""
+    """Sincronizează datele locale pe Render (rândurile existente sunt actualizate)"""
     try:
-        render_url = "https://ai-finance-app.onrender.com"
-        
-        # Trimite datele pe Render
+        # Trimite datele pe Render; mode=upsert aplică și modificările rândurilor existente
         response = requests.post(
-            f"{render_url}/api/import",
+            f"{RENDER_URL}/api/import",
+            params={'mode': 'upsert'},
             json=local_data,
             timeout=30
         )
         
-        if response.status_code == 200:
-            print("✅ Datele au fost sincronizate pe Render!")
-            return True
-        else:
+        if response.status_code != 200:
             print(f"❌ Eroare la sincronizarea pe Render: {response.status_code}")
             return False
+        result = response.json()
+        if result.get('error') or result.get('errors'):
+            print(f"❌ Eroare la sincronizarea pe Render: {result.get('error') or result.get('errors')}")
+            return False
+        if result.get('mode') != 'upsert':
+            # Server vechi: modificările rândurilor existente ar fi fost ignorate
+            print("❌ Serverul nu suportă mode=upsert; modificările nu au fost propagate")
+            return False
+        print("✅ Datele au fost sincronizate pe Render!")
+        return True
     except Exception as e:
         print(f"❌ Eroare la sincronizarea pe Render: {e}")
         return False
@@ -111,6 +159,28 @@ def main():
     print("🔄 Sincronizare Local ↔ Render")
     print("=" * 50)
     
+    # Dacă există un cursor, trimite doar rândurile modificate de atunci
+    cursor_key = f"push:{RENDER_URL}"
+    cursor = load_sync_cursor(cursor_key)
+    if cursor:
+        print(f"📥 Obțin modificările locale de la secvența {cursor['since']}...")
+        local_changes = get_local_changes(cursor['since'])
+        if local_changes is None:
+            return
+        
+        total = len(local_changes['tranzactii']) + len(local_changes['obiecte'])
+        if total == 0:
+            print("✅ Nu există modificări locale noi")
+        elif sync_to_render(local_changes):
+            print(f"✅ Trimise {total} rânduri modificate")
+        else:
+            print("❌ Sincronizarea a eșuat!")
+            return
+        if local_changes['deleted']:
+            print(f"ℹ️ {local_changes['deleted']} ștergeri locale nu sunt propagate de /api/import")
+        save_sync_cursor(cursor_key, {'since': local_changes['seq']})
+        return
+    
     # Obține datele locale
     print("📥 Obțin datele locale...")
     local_data = get_local_data()
@@ -128,17 +198,19 @@ def main():
         print("💡 Verifică dacă aplicația pe Render este disponibilă")
         return
     
-    # Compară datele
-    are_sync = compare_data(local_data, render_data)
+    # Compară datele; același număr de rânduri nu înseamnă că rândurile au aceleași
+    # valori, deci prima sincronizare trimite totul (upsert actualizează doar ce diferă)
+    compare_data(local_data, render_data)
     
-    if not are_sync:
-        print("\n🔄 Sincronizez datele locale pe Render...")
-        if sync_to_render(local_data):
-            print("✅ Sincronizare completă!")
-        else:
-            print("❌ Sincronizarea a eșuat!")
+    print("\n🔄 Sincronizez datele locale pe Render...")
+    if sync_to_render(local_data):
+        print("✅ Sincronizare completă!")
     else:
-        print("\n✅ Datele sunt deja sincronizate!")
+        print("❌ Sincronizarea a eșuat!")
+        return
+    
+    if local_data.get('seq') is not None:
+        save_sync_cursor(cursor_key, {'since': local_data['seq']})
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test pentru /api/export (paginare, since și gzip)
+"""
+
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+@contextmanager
+def _client():
+    """Clientul aplicației pe o bază temporară cu 4 obiecte și 7 tranzacții"""
+    from app import app, use_database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance.db')
+        with use_database(path):
+            conn = sqlite3.connect(path)
+            conn.executemany("INSERT INTO obiecte (nume) VALUES (?)", [('casa',), ('garaj',), ('auto',), ('birou',)])
+            conn.executemany('''
+                INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+                VALUES (?, 10, 'export', 'victor', 'cheltuiala', 'casa', '', 'General')
+            ''', [(f'2024-01-0{i}',) for i in range(1, 8)])
+            conn.commit()
+            conn.close()
+            yield app.test_client()
+
+def test_export_pages_cover_all_rows():
+    """Paginile urmate prin `next` conțin toate rândurile exact o dată"""
+    print("🧪 Test export paginat")
+
+    with _client() as client:
+        complet = client.get('/api/export').get_json()
+        assert len(complet['obiecte']) == 4 and len(complet['tranzactii']) == 7
+
+        ids = {'obiecte': [], 'tranzactii': []}
+        params = '?limit=3'
+        while True:
+            page = client.get('/api/export' + params).get_json()
+            for table in ids:
+                ids[table].extend(row['id'] for row in page[table])
+            if not page['next']:
+                break
+            params = f"?limit=3&cursor={page['next']}"
+
+        for table in ids:
+            assert sorted(ids[table]) == sorted(row['id'] for row in complet[table])
+            assert len(ids[table]) == len(set(ids[table]))
+    print(f"✅ {len(ids['obiecte'])} obiecte și {len(ids['tranzactii'])} tranzacții exportate")
+
+def test_export_since_and_gzip():
+    """Un export cu since=seq curent este gol; gzip este aplicat la cerere"""
+    with _client() as client:
+        seq = client.get('/api/export').get_json()['seq']
+
+        delta = client.get(f'/api/export?since={seq}').get_json()
+        assert delta['tranzactii'] == [] and delta['obiecte'] == []
+        assert delta['seq'] == seq
+
+        response = client.get('/api/export', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.data))['seq'] == seq
+
+        assert client.get(f'/api/export?since={seq + 1000}').status_code == 409
+    print("✅ Export incremental și gzip funcționează")
+
+if __name__ == "__main__":
+    test_export_pages_cover_all_rows()
+    test_export_since_and_gzip()
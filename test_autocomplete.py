@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test pentru indexul de autocompletare și ruta /autocomplete
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+
+def test_prefix_index_ranking():
+    """Sugestiile sunt ordonate după frecvență și ignoră diacriticele"""
+    print("🧪 Test trie autocompletare")
+
+    from autocomplete import PrefixIndex
+
+    index = PrefixIndex()
+    for term, count in (('mâncare', 5), ('mașină', 2), ('magazin', 7), ('chirie', 3)):
+        index.add(term, count)
+
+    assert index.suggest('ma') == ['magazin', 'mâncare', 'mașină']
+    assert index.suggest('MAN') == ['mâncare']
+    assert index.suggest('x') == []
+
+    index.add('magazin', -7)
+    assert index.suggest('ma') == ['mâncare', 'mașină']
+    print("✅ Ordinea după frecvență și ștergerile funcționează")
+
+def test_index_follows_change_log():
+    """Inserările, modificările și ștergerile ajung în index prin refresh()"""
+    from app import create_schema
+    from autocomplete import AutocompleteIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'autocomplete.db')
+        conn = sqlite3.connect(path)
+        create_schema(conn)
+        conn.execute("INSERT INTO obiecte (nume) VALUES ('garaj')")
+        insert = '''
+            INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+            VALUES ('2024-01-01', 1, ?, 'victor', 'cheltuiala', 'necunoscut', '', 'General')
+        '''
+        conn.execute(insert, ('benzina',))
+        conn.commit()
+
+        index = AutocompleteIndex(path)
+        index.rebuild()
+        assert index.suggest('b') == ['benzina']
+        assert index.suggest('g') == ['garaj']
+
+        id_nou = conn.execute(insert, ('bilet tren',)).lastrowid
+        conn.execute(insert, ('bilet tren',))
+        conn.execute("UPDATE tranzactii SET comentariu = 'benzina shell' WHERE comentariu = 'benzina'")
+        conn.execute("UPDATE obiecte SET nume = 'garaj nou' WHERE nume = 'garaj'")
+        conn.commit()
+        index.refresh()
+        assert index.suggest('b') == ['bilet tren', 'benzina shell']
+        assert index.suggest('garaj') == ['garaj nou']
+
+        conn.execute("DELETE FROM tranzactii WHERE id = ?", (id_nou,))
+        conn.execute("DELETE FROM tranzactii WHERE comentariu = 'benzina shell'")
+        conn.commit()
+        index.refresh()
+        assert index.suggest('b') == ['bilet tren']
+        conn.close()
+        print("✅ Indexul urmează change_log")
+
+def test_autocomplete_route():
+    """/autocomplete răspunde din memorie, fără să atingă SQLite"""
+    from app import app, autocomplete_index, use_database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance.db')
+        with use_database(path):
+            conn = sqlite3.connect(path)
+            conn.executemany('''
+                INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+                VALUES ('2024-01-01', 1, ?, 'victor', 'cheltuiala', 'necunoscut', '', 'General')
+            ''', [('taxi',), ('tren',), ('taxi',)])
+            conn.commit()
+            conn.close()
+            autocomplete_index.rebuild()
+
+            client = app.test_client()
+            assert client.get('/autocomplete?q=a').status_code == 401
+            with client.session_transaction() as sess:
+                sess['user'] = 'victor'
+
+            sugestii = client.get('/autocomplete?q=t').get_json()
+            assert sugestii == ['taxi', 'tren']
+
+            start = time.perf_counter()
+            for _ in range(1000):
+                autocomplete_index.suggest('t')
+            durata = (time.perf_counter() - start) / 1000
+            assert durata < 0.001
+    print(f"✅ {len(sugestii)} sugestii, {durata * 1e6:.1f} µs per căutare")
+
+if __name__ == "__main__":
+    test_prefix_index_ranking()
+    test_index_follows_change_log()
+    test_autocomplete_route()
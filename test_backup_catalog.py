@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test pentru catalogul backup-urilor (backup_catalog.py)
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+
+from backup_catalog import BackupCatalog, CATALOG_FILENAME, get_catalog
+from backup_store import ChunkStore, STORE_DIRNAME, write_backup
+
+def _info(name, created_at, **extra):
+    info = {'filename': name, 'created_at': created_at, 'size': 100, 'format': 'file',
+            'stored_as': name + '.gz', 'codec': 'gzip', 'sha256': 'ab' * 32}
+    info.update(extra)
+    return info
+
+def test_list_is_ordered_query():
+    """Lista vine din catalog, cel mai recent primul, cu filtre pe locație"""
+    print("🧪 Test catalog backup-uri")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = BackupCatalog(os.path.join(tmp, CATALOG_FILENAME))
+        catalog.record(_info('finance_backup_1.db', '2024-01-01T10:00:00'))
+        catalog.record(_info('finance_backup_3.db', '2024-01-03T10:00:00', is_auto_backup=True))
+        catalog.record(_info('finance_backup_2.db', '2024-01-02T10:00:00', description='manual'))
+
+        names = [b['filename'] for b in catalog.list()]
+        assert names == ['finance_backup_3.db', 'finance_backup_2.db', 'finance_backup_1.db']
+        assert catalog.get('finance_backup_2.db')['description'] == 'manual'
+        assert catalog.get('finance_backup_3.db')['is_auto_backup'] is True
+        assert catalog.latest(on_gdrive=True) is None
+
+        catalog.set_gdrive_id('finance_backup_1.db', 'drive-1')
+        latest = catalog.latest(on_gdrive=True)
+        assert latest['filename'] == 'finance_backup_1.db' and latest['source'] == 'local_and_gdrive'
+        assert len(catalog.list(on_gdrive=False)) == 2
+
+        # O nouă înregistrare a aceluiași backup (ex. JSON rescris) nu pierde ID-ul de pe Drive
+        catalog.record(_info('finance_backup_1.db', '2024-01-01T10:00:00'))
+        assert catalog.get('finance_backup_1.db')['gdrive_id'] == 'drive-1'
+
+        # Fără copie locală rămâne doar intrarea de pe Drive; fără niciuna, rândul dispare
+        catalog.set_local('finance_backup_1.db', False)
+        assert catalog.get('finance_backup_1.db')['source'] == 'gdrive'
+        assert [b['filename'] for b in catalog.list(local=True)] == ['finance_backup_3.db', 'finance_backup_2.db']
+        catalog.set_local('finance_backup_2.db', False)
+        assert catalog.get('finance_backup_2.db') is None
+
+        plan = sqlite3.connect(catalog.path).execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM backups ORDER BY created_at DESC").fetchall()
+        assert any('idx_backups_created_at' in row[-1] for row in plan)
+        print("✅ Catalog ordonat, interogat pe index")
+
+def test_rebuild_from_sidecars():
+    """Catalogul lipsă este reconstruit din fișierele de backup și JSON-urile lor"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'finance.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE tranzactii (id INTEGER PRIMARY KEY, suma REAL)")
+        conn.execute("CREATE TABLE obiecte (id INTEGER PRIMARY KEY, nume TEXT)")
+        conn.execute("INSERT INTO tranzactii (suma) VALUES (1)")
+        conn.commit()
+        conn.close()
+
+        backup_dir = os.path.join(tmp, 'backups')
+        os.makedirs(backup_dir)
+        store = ChunkStore(os.path.join(backup_dir, STORE_DIRNAME))
+        for name, target, extra in (('finance_backup_20240101_100000.db', None, {'gdrive_id': 'drive-a'}),
+                                    ('finance_backup_20240102_100000.db', store, {'is_auto_backup': True})):
+            info = write_backup(db_path, backup_dir, name, target)
+            info.update(filename=name, timestamp=name[15:30], **extra)
+            with open(os.path.join(backup_dir, name.replace('.db', '.json')), 'w', encoding='utf-8') as f:
+                json.dump(info, f)
+
+        catalog = get_catalog(backup_dir, store)
+        assert os.path.exists(os.path.join(backup_dir, CATALOG_FILENAME))
+        backups = catalog.list()
+        assert [b['filename'] for b in backups] == ['finance_backup_20240102_100000.db',
+                                                    'finance_backup_20240101_100000.db']
+        assert backups[0]['format'] == 'chunks' and backups[0]['is_auto_backup']
+        assert backups[1]['gdrive_id'] == 'drive-a' and backups[1]['stored_as'].startswith(backups[1]['filename'])
+        assert all(len(b['sha256']) == 64 for b in backups)
+        assert get_catalog(backup_dir) is catalog
+        print("✅ Catalog reconstruit din fișiere")
+
+if __name__ == "__main__":
+    test_list_is_ordered_query()
+    test_rebuild_from_sidecars()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test pentru backup-urile comprimate (backup_codec.py și write_backup din backup_store.py)
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+
+from backup_codec import available_codecs, resolve_codec, compress_file, decompress_file, file_sha256, CODEC_SUFFIX
+from backup_store import ChunkStore, write_backup, list_local_backups, open_backup, delete_backup
+
+def _database(path, rows=5000):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE tranzactii (id INTEGER PRIMARY KEY, comentariu TEXT, suma REAL)")
+    conn.execute("CREATE TABLE obiecte (id INTEGER PRIMARY KEY, nume TEXT)")
+    conn.executemany("INSERT INTO tranzactii (comentariu, suma) VALUES (?, ?)",
+                     [(f"cheltuiala materiale {i % 50}", i) for i in range(rows)])
+    conn.commit()
+    conn.close()
+
+def test_codec_selection():
+    """gzip este mereu disponibil; 'none' dezactivează compresia"""
+    assert 'gzip' in available_codecs()
+    assert resolve_codec({'BACKUP_COMPRESSION': 'none'}) is None
+    assert resolve_codec({'BACKUP_COMPRESSION': 'gzip'}) == 'gzip'
+    assert resolve_codec({}) == available_codecs()[0]
+    print(f"✅ Codec-uri disponibile: {available_codecs()}")
+
+def test_stream_roundtrip():
+    """Compresia și decompresia în flux păstrează conținutul și hash-ul"""
+    print("🧪 Test compresie backup")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'finance.db')
+        _database(db_path)
+        for codec in available_codecs():
+            packed = os.path.join(tmp, 'finance.db' + CODEC_SUFFIX[codec])
+            sha256, stored_size = compress_file(db_path, packed, codec)
+            assert sha256 == file_sha256(db_path)
+            assert stored_size < os.path.getsize(db_path) / 3
+
+            unpacked = os.path.join(tmp, f'unpacked_{codec}.db')
+            assert decompress_file(packed, unpacked, codec) == sha256
+            assert file_sha256(unpacked) == sha256
+            print(f"✅ {codec}: {os.path.getsize(db_path)} -> {stored_size} bytes")
+
+def test_write_backup_records_codec():
+    """Backup-ul întreg este comprimat, codec-ul ajunge în JSON, iar restaurarea îl decomprimă"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'finance.db')
+        backup_dir = os.path.join(tmp, 'backups')
+        os.makedirs(backup_dir)
+        _database(db_path)
+        store = ChunkStore(os.path.join(backup_dir, 'store'), codec='gzip')
+
+        info = write_backup(db_path, backup_dir, 'finance_backup_1.db')
+        codec = info['codec']
+        assert codec in available_codecs() and info['format'] == 'file'
+        assert info['stored_as'] == 'finance_backup_1.db' + CODEC_SUFFIX[codec]
+        assert info['stored_size'] < info['size'] and info['tables']['tranzactii'] == 5000
+        json.dumps(info)
+        assert sorted(os.listdir(backup_dir)) == ['finance_backup_1.db' + CODEC_SUFFIX[codec]]
+
+        chunked = write_backup(db_path, backup_dir, 'finance_backup_2.db', store)
+        assert chunked['format'] == 'chunks' and chunked['codec'] == 'gzip'
+        assert chunked['stored_size'] < chunked['size'] / 3
+
+        assert set(list_local_backups(backup_dir, store)) == {'finance_backup_1.db', 'finance_backup_2.db'}
+        for name in ('finance_backup_1.db', 'finance_backup_2.db'):
+            with open_backup(backup_dir, name, store) as path:
+                assert file_sha256(path) == info['sha256'] == chunked['sha256']
+
+        delete_backup(backup_dir, 'finance_backup_1.db', store)
+        assert set(list_local_backups(backup_dir, store)) == {'finance_backup_2.db'}
+        print("✅ Backup comprimat scris, listat și restaurat")
+
+if __name__ == "__main__":
+    test_codec_selection()
+    test_stream_roundtrip()
+    test_write_backup_records_codec()
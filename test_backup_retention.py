@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test pentru politica de retenție pe niveluri a backup-urilor (backup_retention.py)
+"""
+
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from backup_catalog import BackupCatalog, CATALOG_FILENAME
+from backup_retention import RetentionPolicy, plan_retention, apply_retention, load_policy
+from backup_store import ChunkStore
+
+def _backups(now, minutes, every=1):
+    """Câte un backup automat pe minut (sau la `every` minute), cel mai recent primul"""
+    backups = []
+    for i in range(0, minutes, every):
+        moment = now - timedelta(minutes=i)
+        backups.append({'filename': f"finance_backup_{moment.strftime('%Y%m%d_%H%M%S')}.db",
+                        'created_at': moment.isoformat(), 'is_auto_backup': True})
+    return backups
+
+def test_one_snapshot_per_minute_stays_bounded():
+    """Cu un snapshot pe minut timp de 60 de zile, numărul păstrat rămâne în limita politicii"""
+    print("🧪 Test retenție GFS")
+
+    now = datetime(2024, 3, 31, 12, 30)
+    policy = RetentionPolicy(keep_last=5, hourly=24, daily=7, weekly=4, keep_manual=2, max_backups=50)
+    backups = _backups(now, 60 * 24 * 60, every=5)
+    backups += [{'filename': f'finance_backup_manual_{i}.db', 'created_at': (now - timedelta(days=i)).isoformat()}
+                for i in range(4)]
+
+    kept, expired = plan_retention(backups, policy)
+    assert len(kept) + len(expired) == len(backups)
+    assert len(kept) <= policy.max_backups
+
+    names = {b['filename'] for b in kept}
+    automatic = sorted((b for b in kept if b.get('is_auto_backup')), key=lambda b: b['created_at'], reverse=True)
+    # ultimele 5 backup-uri, apoi câte unul pe oră, zi și săptămână
+    assert all(b['filename'] in names for b in backups[:5])
+    assert len({b['created_at'][:13] for b in automatic}) >= 24
+    # 4 săptămâni ISO: cea mai veche este 4-10 martie
+    assert automatic[-1]['created_at'] == '2024-03-10T23:55:00'
+    assert {'finance_backup_manual_0.db', 'finance_backup_manual_1.db'} <= names
+    assert 'finance_backup_manual_3.db' not in names
+    print(f"✅ {len(kept)} păstrate din {len(backups)}")
+
+def test_max_backups_drops_oldest_automatic():
+    now = datetime(2024, 3, 31, 12, 30)
+    policy = RetentionPolicy(keep_last=3, hourly=24, daily=0, weekly=0, keep_manual=1, max_backups=10)
+    backups = _backups(now, 60 * 48, every=30)
+    backups.append({'filename': 'finance_backup_manual.db', 'created_at': (now - timedelta(days=30)).isoformat()})
+    kept, _ = plan_retention(backups, policy)
+    assert len(kept) == 10
+    assert 'finance_backup_manual.db' in {b['filename'] for b in kept}
+    # ultimele 3 (12:30, 12:00, 11:30), apoi câte unul pe oră până la limită
+    assert min(b['created_at'] for b in kept if b.get('is_auto_backup')) == (now - timedelta(hours=7)).isoformat()
+
+def test_apply_deletes_local_and_drive_in_batch():
+    """Backup-urile expirate sunt șterse local și de pe Drive, iar catalogul este actualizat"""
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = BackupCatalog(os.path.join(tmp, CATALOG_FILENAME))
+        store = ChunkStore(os.path.join(tmp, 'store'))
+        now = datetime(2024, 3, 31, 12, 30)
+        for i, backup in enumerate(_backups(now, 10)):
+            with open(os.path.join(tmp, backup['filename'] + '.gz'), 'wb') as f:
+                f.write(b'backup')
+            catalog.record(dict(backup, stored_as=backup['filename'] + '.gz'))
+            if i % 2:
+                catalog.set_gdrive_id(backup['filename'], f'drive-{i}')
+        # o copie care există doar pe Drive
+        catalog.record({'filename': 'finance_backup_20240301_000000.db', 'created_at': '2024-03-01T00:00:00',
+                        'is_auto_backup': True, 'gdrive_id': 'drive-old'}, local=False)
+
+        lock = threading.Lock()
+        deleted = []
+
+        def drive_delete(gdrive_id):
+            with lock:
+                deleted.append(gdrive_id)
+
+        policy = RetentionPolicy(keep_last=3, hourly=0, daily=0, weekly=0, keep_manual=0, max_backups=50)
+        result = apply_retention(catalog, tmp, store, policy, drive_delete)
+
+        assert result['local'] == 7 and not result['failed']
+        assert sorted(deleted) == ['drive-3', 'drive-5', 'drive-7', 'drive-9', 'drive-old']
+        assert result['gdrive'] == 5
+        assert len(catalog.list()) == 3
+        assert len([name for name in os.listdir(tmp) if name.endswith('.gz')]) == 3
+        print("✅ Ștergere locală și Google Drive")
+
+def test_policy_from_settings():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'settings.yaml')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("backup:\n  max_backups: 20\n  retention:\n    hourly: 6\n")
+        policy = load_policy(path)
+        assert policy.max_backups == 20 and policy.hourly == 6 and policy.daily == RetentionPolicy().daily
+        assert load_policy(os.path.join(tmp, 'lipsa.yaml')) == RetentionPolicy()
+
+if __name__ == "__main__":
+    test_one_snapshot_per_minute_stays_bounded()
+    test_max_backups_drops_oldest_automatic()
+    test_apply_deletes_local_and_drive_in_batch()
+    test_policy_from_settings()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test pentru backup-ul write-behind (BackupScheduler din app.py)
+"""
+
+import threading
+import time
+
+def _scheduler(debounce, max_staleness):
+    from app import BackupScheduler
+
+    scheduler = BackupScheduler(debounce=debounce, max_staleness=max_staleness)
+    scheduler.saves = []
+    scheduler.save = lambda: scheduler.saves.append(time.monotonic())
+    return scheduler
+
+def test_burst_is_coalesced():
+    """O rafală de scrieri produce un singur backup, după fereastra de debounce"""
+    print("🧪 Test backup write-behind")
+
+    scheduler = _scheduler(debounce=0.2, max_staleness=5)
+    start = time.monotonic()
+    for _ in range(20):
+        scheduler.mark_dirty()
+        time.sleep(0.01)
+    time.sleep(0.5)
+
+    assert len(scheduler.saves) == 1
+    assert scheduler.saves[0] - start >= 0.2
+    assert scheduler.due_in() is None
+    print("✅ 20 scrieri, un singur backup")
+
+def test_max_staleness_bounds_delay():
+    """Scrierile continue nu amână backup-ul peste max_staleness"""
+    scheduler = _scheduler(debounce=0.2, max_staleness=0.5)
+    start = time.monotonic()
+    while time.monotonic() - start < 1.2:
+        scheduler.mark_dirty()
+        time.sleep(0.05)
+
+    assert len(scheduler.saves) >= 2
+    assert scheduler.saves[0] - start < 0.7
+    print(f"✅ {len(scheduler.saves)} backup-uri în timpul scrierilor continue")
+
+def test_flush_saves_pending_changes():
+    """flush() salvează imediat doar dacă există modificări nesalvate"""
+    scheduler = _scheduler(debounce=60, max_staleness=60)
+    scheduler.flush()
+    assert scheduler.saves == []
+    scheduler.mark_dirty()
+    scheduler.flush()
+    assert len(scheduler.saves) == 1 and scheduler.due_in() is None
+    print("✅ flush() salvează modificările nesalvate")
+
+def test_flush_waits_for_running_save():
+    """La oprire, flush() așteaptă snapshot-ul început de thread, apoi salvează restul"""
+    from app import BackupScheduler
+
+    scheduler = BackupScheduler(debounce=0.01, max_staleness=5)
+    started, release = threading.Event(), threading.Event()
+    saves = []
+
+    def save():
+        saves.append('start')
+        if len(saves) == 1:
+            started.set()
+            release.wait(5)
+        saves.append('end')
+
+    scheduler.save = save
+    scheduler.mark_dirty()
+    assert started.wait(2)
+    scheduler.mark_dirty()
+
+    threading.Timer(0.2, release.set).start()
+    start = time.monotonic()
+    scheduler.flush()
+    assert time.monotonic() - start >= 0.15
+    assert saves == ['start', 'end', 'start', 'end'] and scheduler.due_in() is None
+    print("✅ flush() nu se suprapune cu salvarea din thread")
+
+def test_sigterm_flushes_before_exit():
+    """Handler-ul SIGTERM salvează modificările nesalvate și oprește procesul"""
+    import app as app_module
+
+    flushed = []
+    original = app_module.backup_scheduler
+    app_module.backup_scheduler = type('Scheduler', (), {'flush': lambda self: flushed.append(True)})()
+    try:
+        app_module.handle_sigterm(15, None)
+        assert False, "handler-ul trebuia să oprească procesul"
+    except SystemExit as e:
+        assert e.code == 0 and flushed == [True]
+    finally:
+        app_module.backup_scheduler = original
+
+if __name__ == "__main__":
+    test_burst_is_coalesced()
+    test_max_staleness_bounds_delay()
+    test_flush_saves_pending_changes()
+    test_flush_waits_for_running_save()
+    test_sigterm_flushes_before_exit()
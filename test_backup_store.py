@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test pentru depozitul de backup-uri deduplicat pe blocuri (backup_store.py)
+"""
+
+import os
+import sqlite3
+import tempfile
+
+from backup_store import ChunkStore, BackupStoreError, list_local_backups, open_backup, delete_backup
+
+def _database(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS tranzactii (id INTEGER PRIMARY KEY, comentariu TEXT, suma REAL)")
+    conn.executemany("INSERT INTO tranzactii (comentariu, suma) VALUES (?, ?)",
+                     [(f"comentariu {i} " + 'x' * 50, i) for i in range(rows)])
+    conn.commit()
+    conn.close()
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_snapshots_share_unchanged_chunks():
+    """Al doilea snapshot scrie doar blocurile modificate, iar restaurarea dă fișierul identic"""
+    print("🧪 Test depozit backup deduplicat")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChunkStore(os.path.join(tmp, 'store'), chunk_size=4096)
+        db_path = os.path.join(tmp, 'finance.db')
+        _database(db_path, 20000)
+        first = store.put_file('finance_backup_1.db', db_path)
+        assert first['new_chunks'] == len(first['chunks'])
+
+        # O singură tranzacție nouă modifică doar câteva pagini
+        _database(db_path, 1)
+        second = store.put_file('finance_backup_2.db', db_path)
+        assert 0 < second['new_chunks'] <= 5, second['new_chunks']
+        assert second['new_bytes'] < second['size'] / 20
+
+        restored = os.path.join(tmp, 'restored.db')
+        store.restore_file('finance_backup_1.db', restored)
+        assert _read(restored) != _read(db_path)
+        store.restore_file('finance_backup_2.db', restored)
+        assert _read(restored) == _read(db_path)
+
+        stats = store.stats()
+        assert stats['snapshots'] == 2
+        assert stats['stored_bytes'] < stats['logical_bytes'] * 0.6
+        print(f"✅ {second['new_chunks']} blocuri noi din {len(second['chunks'])}")
+
+def test_corrupt_chunk_is_detected():
+    """Un bloc modificat pe disc oprește restaurarea, fără a lăsa fișiere parțiale"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChunkStore(os.path.join(tmp, 'store'), chunk_size=4096)
+        db_path = os.path.join(tmp, 'finance.db')
+        _database(db_path, 100)
+        manifest = store.put_file('finance_backup_1.db', db_path)
+
+        with open(store._chunk_path(manifest['chunks'][-1], store.codec), 'r+b') as f:
+            f.write(b'corupt')
+
+        restored = os.path.join(tmp, 'restored.db')
+        try:
+            store.restore_file('finance_backup_1.db', restored)
+            assert False, "restore_file trebuia să ridice BackupStoreError"
+        except BackupStoreError:
+            pass
+        assert not os.path.exists(restored) and not os.path.exists(restored + '.tmp')
+        print("✅ Blocul corupt a fost detectat")
+
+def test_delete_and_garbage_collection():
+    """După ștergerea unui snapshot rămân doar blocurile folosite de celelalte"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ChunkStore(os.path.join(tmp, 'store'), chunk_size=4096)
+        db_path = os.path.join(tmp, 'finance.db')
+        _database(db_path, 2000)
+        store.put_file('finance_backup_1.db', db_path)
+        _database(db_path, 2000)
+        store.put_file('finance_backup_2.db', db_path)
+        chunks_before = store.stats()['chunks']
+
+        backups = list_local_backups(tmp, store)
+        assert set(backups) == {'finance_backup_1.db', 'finance_backup_2.db'}
+        assert backups['finance_backup_1.db']['format'] == 'chunks'
+
+        with open_backup(tmp, 'finance_backup_2.db', store) as path:
+            conn = sqlite3.connect(path)
+            assert conn.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0] == 4000
+            conn.close()
+        assert not any(name.startswith('.restore_') for name in os.listdir(tmp))
+
+        delete_backup(tmp, 'finance_backup_2.db', store)
+        removed = store.collect_garbage()
+        assert removed > 0 and store.stats()['chunks'] == chunks_before - removed
+        restored = os.path.join(tmp, 'restored.db')
+        store.restore_file('finance_backup_1.db', restored)
+        print(f"✅ {removed} blocuri nefolosite șterse")
+
+if __name__ == "__main__":
+    test_snapshots_share_unchanged_chunks()
+    test_corrupt_chunk_is_detected()
+    test_delete_and_garbage_collection()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test pentru importul masiv (bulk_import și /api/import cu NDJSON)
+"""
+
+import os
+import sqlite3
+import tempfile
+
+def _connect(path):
+    from app import create_schema
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    conn.commit()
+    return conn
+
+def _tranzactie(id, suma=10.0):
+    return {'id': id, 'data': '2024-01-01', 'suma': suma, 'comentariu': 'import', 'operator': 'Ion',
+            'tip': 'cheltuiala', 'obiect': 'Casa', 'persoana': '', 'categorie': 'General'}
+
+def test_bulk_import_batches_and_ignores_duplicates():
+    """Rândurile sunt inserate pe loturi; duplicatele sunt ignorate, nu dublate"""
+    print("🧪 Test import masiv pe loturi")
+
+    from app import bulk_import
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _connect(os.path.join(tmp, 'import.db'))
+        records = [('obiecte', {'id': 1, 'nume': 'Casa'})]
+        records += [('tranzactii', _tranzactie(i)) for i in range(1, 26)]
+        records.append(('tranzactii', _tranzactie(5, suma=99.0)))
+
+        result = bulk_import(conn, records, batch_size=10)
+        assert result['stats']['tranzactii'] == {'importate': 25, 'ignorate': 1}
+        assert result['stats']['obiecte']['importate'] == 1
+        assert result['batches'] == 4
+        assert result['errors'] == []
+        assert conn.execute("SELECT suma FROM tranzactii WHERE id = 5").fetchone()[0] == 10.0
+        print("✅ 25 tranzacții importate în 3 loturi, duplicatul ignorat")
+
+def test_bulk_import_reports_invalid_rows():
+    """Rândurile invalide sunt raportate, iar restul lotului este importat"""
+    from app import bulk_import
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _connect(os.path.join(tmp, 'import.db'))
+        records = [('tranzactii', _tranzactie(1)), ('tranzactii', {'id': 2}),
+                   ('necunoscut', {'id': 3}), (None, 'linia 4: JSON invalid')]
+
+        result = bulk_import(conn, records)
+        assert result['stats']['tranzactii']['importate'] == 1
+        assert len(result['errors']) == 2
+        assert result['errors'][0]['randuri_invalide'] == 1
+        assert result['errors'][1]['randuri_invalide'] == 2
+        assert conn.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0] == 1
+        print("✅ Rândurile invalide au fost raportate")
+
+def test_bulk_import_upsert_updates_existing_rows():
+    """Cu upsert, modificările rândurilor existente sunt aplicate (nu ignorate ca la inserare)"""
+    from app import bulk_import
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _connect(os.path.join(tmp, 'import.db'))
+        bulk_import(conn, [('obiecte', {'id': 1, 'nume': 'Casa'}), ('obiecte', {'id': 2, 'nume': 'Masina'})]
+                    + [('tranzactii', _tranzactie(i)) for i in (1, 2)])
+        seq = conn.execute("SELECT change_seq FROM sync_state WHERE id = 1").fetchone()[0]
+
+        records = [('tranzactii', _tranzactie(1, suma=55.0)), ('tranzactii', _tranzactie(2)),
+                   ('tranzactii', _tranzactie(3)), ('obiecte', {'id': 3, 'nume': 'Casa'})]
+        result = bulk_import(conn, records, upsert=True)
+        # id 1 actualizat, id 3 inserat; id 2 identic și obiectul cu nume existent sunt ignorate
+        assert result['stats']['tranzactii'] == {'importate': 2, 'ignorate': 1}
+        assert result['stats']['obiecte'] == {'importate': 0, 'ignorate': 1}
+        assert result['errors'] == []
+        assert conn.execute("SELECT suma FROM tranzactii WHERE id = 1").fetchone()[0] == 55.0
+        changed = conn.execute("SELECT op, row_id FROM change_log WHERE seq > ? ORDER BY seq", (seq,)).fetchall()
+        assert [tuple(row) for row in changed] == [('update', 1), ('insert', 3)]
+        print("✅ Upsert: rândul modificat a fost actualizat")
+
+def test_api_import_ndjson():
+    """/api/import acceptă un corp NDJSON citit în flux"""
+    import json
+    from app import app, use_database
+
+    with tempfile.TemporaryDirectory() as tmp, use_database(os.path.join(tmp, 'finance.db')):
+        client = app.test_client()
+        body = "\n".join(json.dumps(dict(_tranzactie(None), tabel='tranzactii', comentariu=f'ndjson {i}'))
+                         for i in range(3))
+        response = client.post('/api/import', data=body + "\nnu este json\n",
+                               content_type='application/x-ndjson')
+        result = response.get_json()
+        assert result['success'] and result['tranzactii_importate'] == 3
+        assert result['errors'][0]['randuri_invalide'] == 1
+
+        export = client.get('/api/export').get_json()
+        assert sorted(row['comentariu'] for row in export['tranzactii']) == ['ndjson 0', 'ndjson 1', 'ndjson 2']
+    print("✅ Import NDJSON reușit")
+
+if __name__ == "__main__":
+    test_bulk_import_batches_and_ignores_duplicates()
+    test_bulk_import_reports_invalid_rows()
+    test_bulk_import_upsert_updates_existing_rows()
+    test_api_import_ndjson()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test pentru jurnalul de modificări (change_log)
+"""
+
+import os
+import sqlite3
+import tempfile
+
+def _open_db(path):
+    from app import create_schema
+
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    return conn
+
+def test_triggers_record_changes():
+    """Fiecare INSERT/UPDATE/DELETE apare în jurnal cu coloanele schimbate"""
+    print("🧪 Test jurnal modificări")
+
+    from change_log import get_changes_since
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _open_db(os.path.join(tmp, 'log.db'))
+        conn.execute('''
+            INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+            VALUES ('2025-07-14', 100, 'avans ion', 'victor', 'cheltuiala', 'colonita', 'ion', 'salariu')
+        ''')
+        conn.execute("UPDATE tranzactii SET suma = 150 WHERE id = 1")
+        conn.execute("DELETE FROM tranzactii WHERE id = 1")
+        conn.commit()
+
+        changes = get_changes_since(conn, 0)
+        assert [c['op'] for c in changes] == ['insert', 'update', 'delete']
+        assert changes[0]['coloane']['comentariu'] == 'avans ion'
+        assert changes[1]['coloane'] == {'suma': 150}
+        assert changes[1]['anterior'] == {'suma': 100}
+        assert changes[0]['anterior'] is None and changes[2]['coloane']['suma'] == 150
+        assert changes[2]['row_id'] == 1
+
+        seq = conn.execute("SELECT change_seq FROM sync_state").fetchone()[0]
+        assert changes[-1]['seq'] == seq
+        assert get_changes_since(conn, seq) == []
+        print("✅ Modificările sunt jurnalizate")
+        conn.close()
+
+def test_compaction_keeps_final_state():
+    """După comprimare, aplicarea jurnalului produce aceleași date"""
+    from change_log import compact_change_log, get_changes_since, apply_changes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = _open_db(os.path.join(tmp, 'source.db'))
+        source.execute("INSERT INTO obiecte (nume) VALUES ('colonita')")
+        source.execute("INSERT INTO obiecte (nume) VALUES ('temporar')")
+        source.execute("UPDATE obiecte SET nume = 'durlesti' WHERE id = 1")
+        source.execute("DELETE FROM obiecte WHERE id = 2")
+        source.commit()
+
+        last_seq = get_changes_since(source, 0)[-1]['seq']
+        assert compact_change_log(source, before_seq=last_seq) == 2
+
+        changes = get_changes_since(source, 0)
+        assert [(c['row_id'], c['op']) for c in changes] == [(1, 'insert'), (2, 'delete')]
+        assert changes[0]['coloane'] == {'nume': 'durlesti'}
+        assert changes[0]['seq'] < changes[1]['seq'] == last_seq
+
+        replica = _open_db(os.path.join(tmp, 'replica.db'))
+        stats = apply_changes(replica, changes)
+        replica.commit()
+        assert stats['applied'] == 2
+        assert [tuple(r) for r in replica.execute("SELECT id, nume FROM obiecte")] == [(1, 'durlesti')]
+        print("✅ Comprimarea păstrează starea finală")
+        source.close()
+        replica.close()
+
+def test_compaction_starts_at_watermark():
+    """A doua comprimare citește doar intrările de după ultima comprimare"""
+    from change_log import compact_change_log, get_changes_since
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _open_db(os.path.join(tmp, 'log.db'))
+        conn.execute("INSERT INTO obiecte (nume) VALUES ('colonita')")
+        conn.execute("UPDATE obiecte SET nume = 'durlesti' WHERE id = 1")
+        conn.commit()
+        first = get_changes_since(conn, 0)[-1]['seq']
+        assert compact_change_log(conn, before_seq=first) == 1
+        assert conn.execute("SELECT compacted_seq FROM sync_state").fetchone()[0] == first
+
+        # Intrarea deja comprimată nu mai este citită (nici rescrisă) de rularea următoare
+        conn.execute("UPDATE change_log SET coloane = '{\"nume\": \"marcaj\"}' WHERE seq <= ?", (first,))
+        conn.execute("UPDATE obiecte SET nume = 'ialoveni' WHERE id = 1")
+        conn.execute("UPDATE obiecte SET nume = 'chisinau' WHERE id = 1")
+        conn.commit()
+        last = get_changes_since(conn, 0)[-1]['seq']
+        assert compact_change_log(conn, before_seq=last) == 1
+        assert compact_change_log(conn, before_seq=last) == 0
+
+        changes = get_changes_since(conn, 0)
+        assert [(c['op'], c['coloane']) for c in changes] == [('insert', {'nume': 'marcaj'}),
+                                                             ('update', {'nume': 'chisinau'})]
+        # Valoarea anterioară este cea de dinaintea primei modificări comprimate
+        assert changes[1]['anterior'] == {'nume': 'durlesti'}
+        assert conn.execute("SELECT compacted_seq FROM sync_state").fetchone()[0] == last
+        print("✅ Comprimarea pornește de la ultima secvență comprimată")
+        conn.close()
+
+if __name__ == "__main__":
+    test_triggers_record_changes()
+    test_compaction_keeps_final_state()
+    test_compaction_starts_at_watermark()
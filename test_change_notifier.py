@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test pentru gruparea notificărilor data_changed (ChangeNotifier din app.py)
+"""
+
+class FakeSocketIO:
+    """SocketIO fals: task-urile de fundal sunt rulate manual, emit-urile sunt reținute"""
+
+    def __init__(self):
+        self.tasks = []
+        self.sleeps = []
+        self.emits = []
+
+    def start_background_task(self, target, *args):
+        self.tasks.append((target, args))
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+    def emit(self, event, payload):
+        self.emits.append((event, payload))
+
+    def run_tasks(self):
+        tasks, self.tasks = self.tasks, []
+        for target, args in tasks:
+            target(*args)
+
+def test_publishes_coalesced_into_one_emit():
+    """Mai multe publish() în aceeași fereastră dau un singur data_changed, cu ID-urile reunite"""
+    print("🧪 Test grupare notificări")
+
+    import app as app_module
+    from app import ChangeNotifier, CHANGE_COALESCE_WINDOW
+
+    socketio = FakeSocketIO()
+    notifier = ChangeNotifier(socketio)
+    grupate = []
+    notifier.listeners.append(grupate.append)
+
+    original = app_module.get_db_hash
+    app_module.get_db_hash = lambda: 'token-test'
+    try:
+        notifier.publish('tranzactii', [5, 2])
+        notifier.publish('obiecte', [7])
+        notifier.publish('tranzactii', [3, 5])
+        notifier.publish('tranzactii', [1], truncated=True)
+        assert len(socketio.tasks) == 1 and socketio.emits == []
+
+        socketio.run_tasks()
+        assert socketio.sleeps == [CHANGE_COALESCE_WINDOW]
+        assert len(socketio.emits) == 1
+        event, payload = socketio.emits[0]
+        assert event == 'data_changed'
+        assert payload['tranzactii'] == [1, 2, 3, 5]
+        assert payload['obiecte'] == [7]
+        assert payload['truncated'] is True and payload['hash'] == 'token-test'
+        assert grupate == [{'tranzactii': {1, 2, 3, 5}, 'obiecte': {7}}]
+
+        # După emit, o nouă modificare pornește o fereastră nouă, fără restul vechi
+        notifier.publish('obiecte', [8])
+        socketio.run_tasks()
+        assert len(socketio.emits) == 2
+        payload = socketio.emits[1][1]
+        assert payload['tranzactii'] == [] and payload['obiecte'] == [8] and payload['truncated'] is False
+    finally:
+        app_module.get_db_hash = original
+    print("✅ Un singur emit per fereastră de grupare")
+
+if __name__ == "__main__":
+    test_publishes_coalesced_into_one_emit()
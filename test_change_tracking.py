@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test pentru detectarea modificărilor prin contor și PRAGMA data_version
+"""
+
+import os
+import sqlite3
+import tempfile
+
+def test_token_changes_only_on_writes():
+    """Token-ul se schimbă la INSERT/UPDATE/DELETE și rămâne stabil altfel"""
+    print("🧪 Test contor modificări")
+
+    from app import create_schema, ChangeTracker
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'tracking.db')
+        conn = sqlite3.connect(db_path)
+        create_schema(conn)
+
+        tracker = ChangeTracker(db_path)
+        initial = tracker.current_token()
+        assert tracker.current_token() == initial
+
+        conn.execute("INSERT INTO obiecte (nume) VALUES ('colonita')")
+        conn.commit()
+        after_insert = tracker.current_token()
+        assert after_insert != initial
+
+        conn.execute("UPDATE obiecte SET nume='durlesti' WHERE nume='colonita'")
+        conn.commit()
+        after_update = tracker.current_token()
+        assert after_update != after_insert
+
+        conn.execute("DELETE FROM obiecte")
+        conn.commit()
+        after_delete = tracker.current_token()
+        assert after_delete not in (initial, after_insert, after_update)
+        assert tracker.current_token() == after_delete
+
+        seq = conn.execute("SELECT change_seq FROM sync_state").fetchone()[0]
+        assert seq == 3
+        print(f"✅ Token final: {after_delete}")
+
+        tracker.reset()
+        conn.close()
+
+def test_create_schema_is_idempotent():
+    """create_schema() poate rula de mai multe ori fără să reseteze contorul"""
+    from app import create_schema
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'tracking.db'))
+        create_schema(conn)
+        conn.execute("INSERT INTO obiecte (nume) VALUES ('bubuieci')")
+        conn.commit()
+        create_schema(conn)
+        assert conn.execute("SELECT change_seq FROM sync_state").fetchone()[0] == 1
+        conn.close()
+        print("✅ Schema poate fi reaplicată")
+
+if __name__ == "__main__":
+    test_token_changes_only_on_writes()
+    test_create_schema_is_idempotent()
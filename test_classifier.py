@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test pentru clasificatorul compilat (classifier.py) și cache-ul din app.py
+"""
+
+def test_classifier_rules():
+    """Regulile existente dau aceleași rezultate cu automatul Aho-Corasick"""
+    print("🧪 Test clasificator compilat")
+
+    from classifier import Classifier
+
+    classifier = Classifier(['transport', 'casa', 'casa mare', 'garaj'])
+    cazuri = {
+        'Salariu ion la garaj': ('cheltuiala', 'garaj', 'ion', 'salariu'),
+        'decontare de la victor material': ('venit', 'necunoscut', 'victor', 'material'),
+        'am primit de la maria': ('venit', 'necunoscut', 'maria', 'alte cheltuieli'),
+        'Primit bani casa mare': ('venit', 'casa', 'bani', 'alte cheltuieli'),
+        'achitat ion pentru casa': ('cheltuiala', 'casa', 'ion', 'salariu'),
+        'transport bus garaj': ('cheltuiala', 'transport', 'bus', 'transport'),
+        'incasare material transport victor': ('venit', 'transport', 'victor', 'transport'),
+        'ciment': ('cheltuiala', 'necunoscut', 'necunoscut', 'alte cheltuieli'),
+    }
+    for comentariu, asteptat in cazuri.items():
+        assert classifier.classify(comentariu) == asteptat, (comentariu, classifier.classify(comentariu))
+    print(f"✅ {len(cazuri)} comentarii clasificate corect")
+
+def test_aho_corasick_overlaps():
+    """Automatul găsește aparițiile suprapuse și incluse"""
+    from classifier import AhoCorasick
+
+    matcher = AhoCorasick([('he', 1), ('she', 2), ('his', 3), ('hers', 4)])
+    assert sorted(matcher.find_all('ushers')) == [(1, 2), (2, 1), (2, 4)]
+    print("✅ Aho-Corasick găsește toate aparițiile")
+
+def test_classifier_cache_invalidated_by_obiecte():
+    """Cache-ul se reconstruiește doar după o modificare în obiecte"""
+    from app import app, classifier_cache, change_notifier, classify_entry
+
+    with app.app_context():
+        classify_entry('test')
+        compilat = classifier_cache.get()
+        change_notifier.publish('tranzactii', [])
+        assert classifier_cache.get() is compilat
+        change_notifier.publish('obiecte', [])
+        assert classifier_cache.get() is not compilat
+    print("✅ Clasificatorul este reconstruit doar la schimbarea obiectelor")
+
+def test_invalidate_during_build_is_not_lost():
+    """O invalidare venită cât timp clasificatorul se construiește nu lasă în cache lista veche"""
+    import app as app_module
+    from app import app, ClassifierCache
+
+    cache = ClassifierCache()
+    construiri = []
+
+    class ClassifierLent(app_module.Classifier):
+        def __init__(self, obiecte):
+            construiri.append(obiecte)
+            if len(construiri) == 1:
+                # obiecte s-a schimbat între citirea listei și sfârșitul construcției
+                cache.invalidate()
+            super().__init__(obiecte)
+
+    original = app_module.Classifier
+    app_module.Classifier = ClassifierLent
+    try:
+        with app.app_context():
+            primul = cache.get()
+            al_doilea = cache.get()
+            assert al_doilea is not primul and len(construiri) == 2
+            assert cache.get() is al_doilea
+    finally:
+        app_module.Classifier = original
+    print("✅ Invalidarea din timpul construcției nu este pierdută")
+
+if __name__ == "__main__":
+    test_classifier_rules()
+    test_aho_corasick_overlaps()
+    test_classifier_cache_invalidated_by_obiecte()
+    test_invalidate_during_build_is_not_lost()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test pentru restaurarea la pornire din cel mai recent backup (cold_restore.py)
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from backup_catalog import BackupCatalog, CATALOG_FILENAME
+from backup_store import write_backup
+from cold_restore import RestoreError, restore_latest, register_drive_backups
+
+def _database(path, rows, wal=False):
+    conn = sqlite3.connect(path)
+    if wal:
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS tranzactii (id INTEGER PRIMARY KEY, suma REAL)")
+    conn.execute("CREATE TABLE IF NOT EXISTS obiecte (id INTEGER PRIMARY KEY, nume TEXT)")
+    conn.executemany("INSERT INTO tranzactii (suma) VALUES (?)", [(i,) for i in range(rows)])
+    conn.commit()
+    conn.close()
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0]
+    finally:
+        conn.close()
+
+class FakeDrive:
+    """Drive în memorie: descărcare pe blocuri, cu callback(transferat, total)"""
+
+    def __init__(self, files, chunk=1024):
+        self.files = files
+        self.chunk = chunk
+        self.downloads = 0
+
+    def download(self, file_id, dest_path, callback=None, chunksize=None):
+        self.downloads += 1
+        total = os.path.getsize(self.files[file_id])
+        with open(self.files[file_id], 'rb') as src, open(dest_path, 'wb') as dst:
+            while True:
+                block = src.read(self.chunk)
+                if not block:
+                    break
+                dst.write(block)
+                if callback:
+                    callback(dst.tell(), total)
+        return dest_path
+
+def _backup(tmp, rows):
+    """Un backup comprimat „urcat” pe Drive, cu intrarea lui din catalog"""
+    source = os.path.join(tmp, 'sursa.db')
+    _database(source, rows, wal=True)
+    backup_dir = os.path.join(tmp, 'drive')
+    os.makedirs(backup_dir, exist_ok=True)
+    name = 'finance_backup_20240101_100000.db'
+    info = write_backup(source, backup_dir, name)
+    info.update(filename=name, gdrive_id='drive-1', local=False)
+    return source, info, FakeDrive({'drive-1': os.path.join(backup_dir, info['stored_as'])})
+
+def _leftovers(directory):
+    return [name for name in os.listdir(directory) if '.restore' in name]
+
+def test_unchanged_database_is_not_downloaded():
+    """Dacă baza locală are conținutul ultimului backup, pornirea nu descarcă nimic"""
+    print("🧪 Test restaurare la pornire")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source, info, drive = _backup(tmp, 500)
+        restored, message = restore_latest(source, info, drive.download, cold_start=True)
+        assert not restored and drive.downloads == 0, message
+        print(f"✅ {message}")
+
+def test_download_verified_and_installed_atomically():
+    """Backup-ul este descărcat pe blocuri, verificat și pus în locul bazei (inclusiv peste un WAL vechi)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        _, info, drive = _backup(tmp, 2000)
+        db_path = os.path.join(tmp, 'finance.db')
+        _database(db_path, 3, wal=True)
+
+        restored, message = restore_latest(db_path, info, drive.download, cold_start=True)
+        assert restored and drive.downloads == 1, message
+        assert _count(db_path) == 2000
+        assert not os.path.exists(db_path + '-wal')
+        assert _leftovers(tmp) == []
+        print(f"✅ {message}")
+
+def test_timeout_and_corruption_keep_current_database():
+    """O descărcare prea lentă sau un backup corupt nu ating baza de date existentă"""
+    with tempfile.TemporaryDirectory() as tmp:
+        _, info, drive = _backup(tmp, 2000)
+        db_path = os.path.join(tmp, 'finance.db')
+        _database(db_path, 3)
+
+        try:
+            restore_latest(db_path, info, drive.download, cold_start=True, timeout=-1)
+            assert False, "descărcarea trebuia oprită de limita de timp"
+        except RestoreError as e:
+            assert 'secunde' in str(e)
+        assert _count(db_path) == 3 and _leftovers(tmp) == []
+
+        corrupt = dict(info, sha256='0' * 64)
+        try:
+            restore_latest(db_path, corrupt, drive.download, cold_start=True)
+            assert False, "checksum-ul greșit trebuia detectat"
+        except RestoreError as e:
+            assert 'Checksum' in str(e)
+        assert _count(db_path) == 3 and _leftovers(tmp) == []
+        print("✅ Baza curentă rămâne neatinsă la eroare")
+
+def test_local_copy_preferred_over_download():
+    with tempfile.TemporaryDirectory() as tmp:
+        _, info, drive = _backup(tmp, 100)
+        db_path = os.path.join(tmp, 'finance.db')
+        _database(db_path, 1)
+        local_copy = os.path.join(tmp, 'local.db')
+        _database(local_copy, 100)
+
+        class _Open:
+            def __init__(self, filename):
+                pass
+
+            def __enter__(self):
+                return local_copy
+
+            def __exit__(self, *exc):
+                return False
+
+        entry = dict(info, local=True, sha256=None)
+        restored, message = restore_latest(db_path, entry, drive.download, open_local=_Open)
+        assert restored and drive.downloads == 0 and 'local' in message
+        assert _count(db_path) == 100
+
+def test_drive_listing_fills_empty_catalog():
+    """Pe un disc gol, backup-urile găsite pe Drive intră în catalog"""
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = BackupCatalog(os.path.join(tmp, CATALOG_FILENAME))
+        register_drive_backups(catalog, [
+            {'id': 'a', 'title': 'finance_backup_20240101_100000.db.gz', 'fileSize': '10'},
+            {'id': 'b', 'title': 'finance_backup_20240102_100000.db', 'fileSize': '20'},
+            {'id': 'c', 'title': 'finance_backup_fara_data.db.gz'},
+        ])
+        latest = catalog.latest(on_gdrive=True)
+        assert latest['filename'] == 'finance_backup_20240102_100000.db' and latest['codec'] is None
+        older = catalog.get('finance_backup_20240101_100000.db')
+        assert older['codec'] == 'gzip' and older['gdrive_id'] == 'a' and not older['local']
+        assert len(catalog.list()) == 2
+
+if __name__ == "__main__":
+    test_unchanged_database_is_not_downloaded()
+    test_download_verified_and_installed_atomically()
+    test_timeout_and_corruption_keep_current_database()
+    test_local_copy_preferred_over_download()
+    test_drive_listing_fills_empty_catalog()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test pentru pool-ul de conexiuni SQLite din app.py
+"""
+
+import os
+import tempfile
+
+def test_pool_reuses_connections():
+    """Conexiunile eliberate sunt refolosite, nu redeschise"""
+    print("🧪 Test pool conexiuni")
+
+    from app import ConnectionPool
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, 'pool.db'), ("PRAGMA temp_store=MEMORY",))
+
+        conn, generation = pool.acquire()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        pool.release(conn, generation)
+
+        conn2, generation2 = pool.acquire()
+        assert conn2 is conn
+        assert conn2.execute("PRAGMA temp_store").fetchone()[0] == 2
+        pool.release(conn2, generation2)
+        print("✅ Conexiunea a fost refolosită")
+
+def test_pool_rolls_back_on_release():
+    """O tranzacție rămasă deschisă nu ajunge la următorul request"""
+    from app import ConnectionPool
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, 'pool.db'))
+
+        conn, generation = pool.acquire()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        pool.release(conn, generation)
+
+        conn, generation = pool.acquire()
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        pool.release(conn, generation)
+        print("✅ Tranzacția neconfirmată a fost anulată")
+
+def test_pool_reset_drops_stale_connections():
+    """După reset() (restaurare) conexiunile vechi nu mai sunt refolosite"""
+    from app import ConnectionPool
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, 'pool.db'))
+
+        conn, generation = pool.acquire()
+        in_use, in_use_generation = pool.acquire()
+        pool.release(conn, generation)
+
+        pool.reset()
+        pool.release(in_use, in_use_generation)
+
+        fresh, _ = pool.acquire()
+        assert fresh is not conn and fresh is not in_use
+        assert pool._idle == []
+        print("✅ Conexiunile vechi au fost închise după reset")
+
+if __name__ == "__main__":
+    test_pool_reuses_connections()
+    test_pool_rolls_back_on_release()
+    test_pool_reset_drops_stale_connections()
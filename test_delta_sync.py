@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test pentru protocolul de sincronizare delta (request_sync)
+"""
+
+import os
+import sqlite3
+import tempfile
+
+def _open_db(tmp):
+    from app import create_schema
+
+    conn = sqlite3.connect(os.path.join(tmp, 'delta.db'))
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    return conn
+
+def _add_tranzactie(conn, comentariu):
+    cursor = conn.execute('''
+        INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+        VALUES ('2025-07-14', 10, ?, 'victor', 'cheltuiala', 'necunoscut', 'necunoscut', 'alte cheltuieli')
+    ''', (comentariu,))
+    conn.commit()
+    return cursor.lastrowid
+
+def test_delta_contains_only_changes():
+    """După un cursor valid se trimit doar rândurile modificate și tombstone-urile"""
+    print("🧪 Test sincronizare delta")
+
+    from app import build_sync_payload
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _open_db(tmp)
+        id_vechi = _add_tranzactie(conn, 'vechi')
+        id_sters = _add_tranzactie(conn, 'de sters')
+
+        snapshot = build_sync_payload(conn)
+        assert snapshot['mode'] == 'snapshot'
+        assert len(snapshot['tranzactii']) == 2
+
+        id_nou = _add_tranzactie(conn, 'nou')
+        conn.execute("DELETE FROM tranzactii WHERE id=?", (id_sters,))
+        conn.commit()
+
+        delta = build_sync_payload(conn, snapshot['seq'], snapshot['epoch'])
+        assert delta['mode'] == 'delta'
+        assert [row['id'] for row in delta['tranzactii']] == [id_nou]
+        assert delta['deleted']['tranzactii'] == [id_sters]
+        assert id_vechi not in [row['id'] for row in delta['tranzactii']]
+
+        empty = build_sync_payload(conn, delta['seq'], delta['epoch'])
+        assert empty['mode'] == 'delta' and empty['tranzactii'] == [] and empty['deleted']['tranzactii'] == []
+        print("✅ Delta conține doar modificările")
+        conn.close()
+
+def test_stale_cursor_falls_back_to_snapshot():
+    """Epocă diferită sau tombstone-uri șterse forțează un snapshot"""
+    from app import build_sync_payload, purge_sync_tombstones
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _open_db(tmp)
+        first = build_sync_payload(conn)
+
+        assert build_sync_payload(conn, first['seq'], 'alta-epoca')['mode'] == 'snapshot'
+
+        for i in range(3):
+            conn.execute("DELETE FROM tranzactii WHERE id=?", (_add_tranzactie(conn, f'temp {i}'),))
+            conn.commit()
+        assert purge_sync_tombstones(conn, keep=1) == 2
+
+        assert build_sync_payload(conn, first['seq'], first['epoch'])['mode'] == 'snapshot'
+        print("✅ Cursorul expirat primește snapshot")
+        conn.close()
+
+if __name__ == "__main__":
+    test_delta_contains_only_changes()
+    test_stale_cursor_falls_back_to_snapshot()
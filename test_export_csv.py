@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test pentru exportul CSV generat în flux (/export/csv)
+"""
+
+import csv
+import gzip
+import io
+import os
+import sqlite3
+import tempfile
+
+# (data, operator) pentru rândurile cunoscute din baza de test
+TRANZACTII = [
+    ('2024-01-10', 'victor'), ('2024-01-10', 'valerian'), ('2024-01-11', 'victor'),
+    ('2024-01-12', 'victor'), ('2024-01-12', 'valerian'), ('2024-02-01', 'valerian'),
+]
+
+def _rows(data):
+    return list(csv.reader(io.StringIO(data.decode('utf-8'))))
+
+def _seed(path):
+    conn = sqlite3.connect(path)
+    conn.executemany('''
+        INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+        VALUES (?, 10, 'csv', ?, 'cheltuiala', 'casa', '', 'General')
+    ''', TRANZACTII)
+    conn.commit()
+    conn.close()
+
+def test_export_csv_filters():
+    """Filtrele de dată și operator restrâng rândurile exportate"""
+    print("🧪 Test export CSV filtrat")
+
+    from app import app, use_database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance.db')
+        with use_database(path):
+            _seed(path)
+            client = app.test_client()
+
+            def export(**filtre):
+                return _rows(client.get('/export/csv', query_string=filtre).data)[1:]
+
+            toate = _rows(client.get('/export/csv').data)
+            header, rows = toate[0], toate[1:]
+            assert header[:3] == ['id', 'data', 'suma']
+            assert len(rows) == len(TRANZACTII)
+            operator, data = header.index('operator'), header.index('data')
+
+            victor = export(operator='victor')
+            assert len(victor) == 3 and all(row[operator] == 'victor' for row in victor)
+
+            zi = export(de_la='2024-01-12', pana_la='2024-01-12')
+            assert len(zi) == 2 and all(row[data] == '2024-01-12' for row in zi)
+
+            interval = export(de_la='2024-01-11', pana_la='2024-01-31', operator='valerian')
+            assert [(row[data], row[operator]) for row in interval] == [('2024-01-12', 'valerian')]
+            assert len(export(de_la='2024-01-11')) == 4 and len(export(pana_la='2024-01-10')) == 2
+
+            assert client.get('/export/csv?de_la=ieri').status_code == 400
+    print(f"✅ {len(rows)} rânduri exportate, filtrele funcționează")
+
+def test_export_csv_gzip():
+    """gzip=1 descarcă un fișier .csv.gz cu același conținut"""
+    from app import app, use_database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance.db')
+        with use_database(path):
+            _seed(path)
+            client = app.test_client()
+            simplu = client.get('/export/csv').data
+            response = client.get('/export/csv?gzip=1')
+    assert len(_rows(simplu)) == len(TRANZACTII) + 1
+    assert 'tranzactii.csv.gz' in response.headers['Content-Disposition']
+    assert gzip.decompress(response.data) == simplu
+    print("✅ Export CSV comprimat corect")
+
+if __name__ == "__main__":
+    test_export_csv_filters()
+    test_export_csv_gzip()
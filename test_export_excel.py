@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test pentru exportul Excel într-o singură trecere (/export/excel)
+"""
+
+import io
+import os
+import sqlite3
+import tempfile
+import zipfile
+
+def test_export_excel_sheets():
+    """Workbook-ul are foaia generală, foi pe obiecte și foaia fără tranzacții"""
+    print("🧪 Test export Excel")
+
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        print("⚠️ XlsxWriter nu este instalat, testul este omis")
+        return
+
+    from app import app, use_database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance.db')
+        with use_database(path):
+            conn = sqlite3.connect(path)
+            conn.executemany("INSERT INTO obiecte (nume) VALUES (?)", [('casa',), ('garaj',), ('birou',)])
+            conn.executemany('''
+                INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+                VALUES ('2024-01-01', 10, 'excel', 'victor', 'cheltuiala', ?, '', 'General')
+            ''', [('casa',), ('casa',), ('garaj',)])
+            conn.commit()
+            conn.close()
+
+            response = app.test_client().get('/export/excel')
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.data)) as xlsx:
+        foi = [name for name in xlsx.namelist() if name.startswith('xl/worksheets/sheet')]
+        workbook = xlsx.read('xl/workbook.xml').decode('utf-8')
+
+    assert 'Toate Tranzacțiile' in workbook
+    # foaia generală, casa, garaj și foaia obiectelor fără tranzacții (birou)
+    assert len(foi) == 4
+    print(f"✅ {len(foi)} foi generate")
+
+def test_excel_sheet_names_are_unique():
+    """Numele lungi sau cu caractere interzise devin nume de foi valide și unice"""
+    from app import _excel_sheet_name
+
+    used = set()
+    nume = [_excel_sheet_name('Apartament central etajul 4 scara B', used) for _ in range(3)]
+    assert len(set(nume)) == 3 and all(len(n) <= 31 for n in nume)
+    assert _excel_sheet_name('Casa [vechi]/2', used) == 'Obiect_Casa _vechi__2'
+    print("✅ Nume de foi valide")
+
+if __name__ == "__main__":
+    test_export_excel_sheets()
+    test_excel_sheet_names_are_unique()
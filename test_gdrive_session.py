@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test pentru sesiunea Google Drive comună (gdrive_session.py), cu un Drive fals în memorie
+"""
+
+import os
+import tempfile
+
+from gdrive_session import DriveSession, DriveUnavailable, GDRIVE_FOLDER_MIMETYPE
+
+class FakeAuth:
+    def __init__(self):
+        self.access_token_expired = False
+        self.refreshes = 0
+        self.saved = []
+
+    def Refresh(self):
+        self.refreshes += 1
+        self.access_token_expired = False
+
+    def SaveCredentialsFile(self, path):
+        self.saved.append(path)
+
+class FakeFile(dict):
+    def __init__(self, drive, metadata):
+        super().__init__(metadata)
+        self.drive = drive
+        self.content = None
+
+    def SetContentFile(self, path):
+        with open(path, 'rb') as f:
+            self.content = f.read()
+
+    def Upload(self):
+        self.drive.calls.append('upload')
+        if 'id' not in self:
+            self['id'] = f"id{len(self.drive.files) + 1}"
+        self.drive.files[self['id']] = self
+
+    def GetContentFile(self, path):
+        self.drive.calls.append('download')
+        with open(path, 'wb') as f:
+            f.write(self.drive.files[self['id']].content)
+
+    def Delete(self):
+        self.drive.calls.append('delete')
+        del self.drive.files[self['id']]
+
+class FakeList:
+    def __init__(self, drive, query):
+        self.drive = drive
+        self.query = query
+
+    def GetList(self):
+        self.drive.calls.append('list')
+        return [f for f in self.drive.files.values()
+                if f.get('mimeType') == GDRIVE_FOLDER_MIMETYPE and f"title='{f['title']}'" in self.query]
+
+class FakeDrive:
+    def __init__(self):
+        self.auth = FakeAuth()
+        self.files = {}
+        self.calls = []
+
+    def CreateFile(self, metadata):
+        return FakeFile(self, metadata)
+
+    def ListFile(self, params):
+        return FakeList(self, params['q'])
+
+def _session(drive):
+    connects = []
+
+    def connect():
+        connects.append(1)
+        return drive
+    return DriveSession(connect=connect), connects
+
+def test_single_login_and_cached_folder():
+    """Autentificarea și căutarea folderului se fac o singură dată pentru mai multe upload-uri"""
+    print("🧪 Test sesiune Google Drive")
+
+    drive = FakeDrive()
+    session, connects = _session(drive)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance_backup_1.db.gz')
+        with open(path, 'wb') as f:
+            f.write(b'backup')
+
+        ids = [session.upload(path, session.folder_id()) for _ in range(3)]
+        assert len(connects) == 1
+        assert drive.calls.count('list') == 1
+        # un upload pentru folder + trei pentru fișiere, nimic altceva
+        assert drive.calls == ['list', 'upload', 'upload', 'upload', 'upload']
+        assert drive.files[ids[0]]['title'] == 'finance_backup_1.db.gz'
+        assert drive.files[ids[0]]['parents'] == [{'id': session.folder_id()}]
+
+        dest = os.path.join(tmp, 'descarcat.gz')
+        session.download(ids[0], dest)
+        with open(dest, 'rb') as f:
+            assert f.read() == b'backup'
+        session.delete(ids[1])
+        assert ids[1] not in drive.files
+        print("✅ O singură autentificare, folderul căutat o dată")
+
+def test_existing_folder_is_reused():
+    drive = FakeDrive()
+    folder = drive.CreateFile({'title': 'AI Finance App Backups', 'mimeType': GDRIVE_FOLDER_MIMETYPE})
+    folder.Upload()
+    session, _ = _session(drive)
+    assert session.folder_id() == folder['id']
+    assert session.folder_id() == folder['id'] and drive.calls.count('list') == 1
+
+def test_token_refreshed_lazily():
+    """Token-ul este reîmprospătat (și salvat) doar când a expirat"""
+    drive = FakeDrive()
+    session, connects = _session(drive)
+    session.drive()
+    session.drive()
+    assert drive.auth.refreshes == 0
+
+    drive.auth.access_token_expired = True
+    session.drive()
+    session.drive()
+    assert drive.auth.refreshes == 1 and drive.auth.saved == ['gdrive_token.json']
+    assert len(connects) == 1
+    print("✅ Token reîmprospătat o singură dată, la expirare")
+
+def test_unconfigured_drive():
+    """Fără credențiale sesiunea ridică DriveUnavailable și reîncearcă la următorul apel"""
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        return None
+    session = DriveSession(connect=connect)
+    for _ in range(2):
+        try:
+            session.folder_id()
+            assert False, "folder_id trebuia să ridice DriveUnavailable"
+        except DriveUnavailable:
+            pass
+    assert len(attempts) == 2
+
+if __name__ == "__main__":
+    test_single_login_and_cached_folder()
+    test_existing_folder_is_reused()
+    test_token_refreshed_lazily()
+    test_unconfigured_drive()
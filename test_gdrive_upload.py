@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test pentru urcarea în paralel, cu reluare, a backup-urilor (gdrive_upload.py)
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from gdrive_upload import upload_backups, retry_with_backoff, UploadProgress
+
+def _items(tmp, count):
+    items = []
+    for i in range(count):
+        path = os.path.join(tmp, f'finance_backup_{i}.db.gz')
+        with open(path, 'wb') as f:
+            f.write(b'x')
+        items.append((f'finance_backup_{i}.db', path))
+    return items
+
+def test_parallel_upload_is_bounded():
+    """Upload-urile rulează în paralel, dar niciodată mai multe decât numărul de workeri"""
+    print("🧪 Test upload paralel Google Drive")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lock = threading.Lock()
+        active, peak = [0], [0]
+
+        def upload(path):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return 'id-' + os.path.basename(path)
+
+        start = time.monotonic()
+        result = upload_backups(_items(tmp, 12), upload, os.path.join(tmp, 'progres.json'), workers=4)
+        elapsed = time.monotonic() - start
+
+        assert len(result['uploaded']) == 12 and not result['failed']
+        assert peak[0] == 4
+        assert elapsed < 12 * 0.05 / 2
+        print(f"✅ 12 fișiere urcate în {elapsed:.2f}s cu {peak[0]} workeri")
+
+def test_interrupted_sync_resumes():
+    """O a doua rulare urcă doar fișierele care au eșuat, nu pe cele deja urcate"""
+    with tempfile.TemporaryDirectory() as tmp:
+        items = _items(tmp, 6)
+        progress_path = os.path.join(tmp, 'progres.json')
+        calls = []
+
+        def flaky(path):
+            calls.append(path)
+            if path.endswith(('_1.db.gz', '_4.db.gz')):
+                raise IOError("conexiune întreruptă")
+            return 'id-' + os.path.basename(path)
+
+        first = upload_backups(items, flaky, progress_path, retries=1, sleep=lambda s: None)
+        assert set(first['failed']) == {'finance_backup_1.db', 'finance_backup_4.db'}
+        assert len(first['uploaded']) == 4
+        assert UploadProgress(progress_path).get('finance_backup_0.db') == 'id-finance_backup_0.db.gz'
+
+        calls.clear()
+        recorded = {}
+        second = upload_backups(items, lambda path: calls.append(path) or 'nou', progress_path,
+                                on_uploaded=lambda name, gdrive_id: recorded.update({name: gdrive_id}))
+        assert sorted(os.path.basename(path) for path in calls) == ['finance_backup_1.db.gz', 'finance_backup_4.db.gz']
+        assert len(second['skipped']) == 4 and recorded == {'finance_backup_1.db': 'nou', 'finance_backup_4.db': 'nou'}
+        print("✅ Sincronizarea reia doar fișierele rămase")
+
+def test_retry_backoff_grows():
+    """Pauzele dintre reîncercări cresc exponențial și sunt limitate"""
+    sleeps = []
+    attempts = []
+
+    def fails_three_times():
+        attempts.append(1)
+        if len(attempts) <= 3:
+            raise IOError("503")
+        return 'ok'
+
+    assert retry_with_backoff(fails_three_times, retries=5, backoff=1, max_backoff=3, sleep=sleeps.append) == 'ok'
+    assert len(sleeps) == 3
+    assert 0.5 <= sleeps[0] <= 1 and 1 <= sleeps[1] <= 2 and 1.5 <= sleeps[2] <= 3
+
+    try:
+        retry_with_backoff(lambda: 1 / 0, retries=2, sleep=lambda s: None)
+        assert False, "eroarea trebuia propagată după ultima reîncercare"
+    except ZeroDivisionError:
+        pass
+    print("✅ Backoff exponențial cu limită")
+
+if __name__ == "__main__":
+    test_parallel_upload_is_bounded()
+    test_interrupted_sync_resumes()
+    test_retry_backoff_grows()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test pentru paginarea keyset din /istoric
+"""
+
+import os
+import sqlite3
+import tempfile
+
+def _connect(path, randuri):
+    from app import create_schema
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    conn.executemany('''
+        INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+        VALUES (?, 1, '', 'victor', 'cheltuiala', 'Casa', '', 'General')
+    ''', [(f'2024-01-{i % 28 + 1:02d}',) for i in range(randuri)])
+    conn.commit()
+    return conn
+
+def test_keyset_pages_match_offset_order():
+    """Parcurgerea înainte și înapoi dă aceleași rânduri ca ORDER BY ... LIMIT/OFFSET"""
+    print("🧪 Test paginare keyset istoric")
+
+    from app import app, pagina_istoric, decode_page_token, _count_cache
+
+    with tempfile.TemporaryDirectory() as tmp, app.app_context():
+        conn = _connect(os.path.join(tmp, 'istoric.db'), 23)
+        # count_tranzactii() ține minte numărul după tokenul bazei aplicației, nu al acestei baze
+        _count_cache['token'] = None
+        asteptat = [row['id'] for row in conn.execute("SELECT id FROM tranzactii ORDER BY data DESC, id DESC")]
+
+        pagini, token = [], None
+        while True:
+            rows, urmator, anterior, pagina = pagina_istoric(conn, token, per_pagina=5)
+            assert pagina == len(pagini) + 1
+            assert (anterior is None) == (pagina == 1)
+            pagini.append([row['id'] for row in rows])
+            if not urmator:
+                break
+            token = decode_page_token(urmator)
+        assert sum(pagini, []) == asteptat
+        assert [len(p) for p in pagini] == [5, 5, 5, 5, 3]
+
+        # Înapoi de la ultima pagină
+        rows, _, anterior, pagina = pagina_istoric(conn, decode_page_token(anterior), per_pagina=5)
+        assert [row['id'] for row in rows] == pagini[-2] and pagina == 4
+
+        rows, urmator, anterior, _ = pagina_istoric(conn, {'dir': 'last'}, per_pagina=5)
+        assert [row['id'] for row in rows] == asteptat[-3:] and urmator is None and anterior
+        assert pagina_istoric(conn, {'dir': 'last'}, per_pagina=5)[3] == 5
+
+        # Când numărul de rânduri se împarte exact, ultima pagină este completă
+        with conn:
+            conn.execute("DELETE FROM tranzactii WHERE id IN (SELECT id FROM tranzactii ORDER BY data ASC, id ASC LIMIT 3)")
+        _count_cache['token'] = None
+        rows, _, anterior, pagina = pagina_istoric(conn, {'dir': 'last'}, per_pagina=5)
+        assert [row['id'] for row in rows] == asteptat[-8:-3] and anterior and pagina == 4
+        print(f"✅ {len(pagini)} pagini parcurse în ambele sensuri")
+
+def test_keyset_query_uses_index():
+    """Interogările keyset pornesc din indexul (data, id), fără sortare temporară"""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _connect(os.path.join(tmp, 'plan.db'), 0)
+        for query in ("SELECT * FROM tranzactii WHERE (data, id) < (?, ?) ORDER BY data DESC, id DESC LIMIT 51",
+                      "SELECT * FROM tranzactii WHERE (data, id) > (?, ?) ORDER BY data ASC, id ASC LIMIT 51"):
+            plan = ' '.join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", ('2024-01-01', 10)))
+            assert plan.startswith('SEARCH') and 'idx_tranzactii_data_id' in plan, plan
+            assert 'TEMP B-TREE' not in plan, plan
+        print("✅ Paginarea folosește căutare în index")
+
+def test_istoric_route_with_cursor():
+    """/istoric acceptă tokenul `cursor` și ignoră unul invalid"""
+    from app import app, use_database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance.db')
+        _connect(path, 7).close()
+        with use_database(path):
+            client = app.test_client()
+            with client.session_transaction() as sess:
+                sess['user'] = 'victor'
+
+            assert client.get('/istoric').status_code == 200
+            assert client.get('/istoric?cursor=invalid!').status_code == 200
+    print("✅ Ruta /istoric răspunde cu și fără cursor")
+
+if __name__ == "__main__":
+    test_keyset_pages_match_offset_order()
+    test_keyset_query_uses_index()
+    test_istoric_route_with_cursor()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test pentru migrările schemei (PRAGMA user_version) și indexurile pe tranzactii
+"""
+
+import os
+import sqlite3
+import tempfile
+
+# Interogările fierbinți din app.py și indexul pe care trebuie să îl folosească
+QUERY_PLANS = [
+    ("SELECT * FROM tranzactii ORDER BY data DESC, id DESC LIMIT 50 OFFSET 0", (),
+     'idx_tranzactii_data_id'),
+    ("SELECT id FROM tranzactii WHERE data=? AND suma=? AND comentariu=? AND operator=? ORDER BY id DESC LIMIT 1",
+     ('2024-01-01', 1.0, 'x', 'victor'), 'idx_tranzactii_data_id'),
+    ("SELECT * FROM tranzactii WHERE tip='cheltuiala' AND obiect=? ORDER BY data DESC", ('Casa',),
+     'idx_tranzactii_obiect_tip_data'),
+    ("SELECT COUNT(*) FROM tranzactii WHERE obiect=?", ('Casa',),
+     'idx_tranzactii_obiect_tip_data'),
+    ("SELECT * FROM tranzactii WHERE tip='venit' AND obiect != 'transfer' ORDER BY data DESC", (),
+     'idx_tranzactii_tip_data'),
+    ("SELECT * FROM tranzactii WHERE tip='venit' AND operator=? AND obiect != 'transfer' ORDER BY data DESC", ('victor',),
+     'idx_tranzactii_operator_tip_data'),
+    ("SELECT SUM(suma) FROM tranzactii WHERE tip='cheltuiala' AND persoana=?", ('Ana',),
+     'idx_tranzactii_persoana_tip_suma'),
+    ("SELECT SUM(suma) FROM tranzactii WHERE tip='venit' AND operator=? AND obiect != 'transfer'", ('victor',),
+     'idx_tranzactii_operator_tip_data'),
+    ("SELECT DISTINCT operator FROM tranzactii ORDER BY operator", (),
+     'idx_tranzactii_operator_tip_data'),
+]
+
+def _connect(path):
+    from app import create_schema
+    conn = sqlite3.connect(path)
+    create_schema(conn)
+    return conn
+
+def test_migrations_set_user_version():
+    """Migrările sunt aplicate o singură dată și actualizează user_version"""
+    print("🧪 Test migrări schemă")
+
+    from app import MIGRATIONS, run_migrations
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _connect(os.path.join(tmp, 'migrari.db'))
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == MIGRATIONS[-1][0]
+        assert run_migrations(conn) == []
+        print(f"✅ Schema la versiunea {MIGRATIONS[-1][0]}")
+
+def test_failed_migration_is_rolled_back():
+    """O migrare eșuată nu schimbă nici schema, nici versiunea"""
+    from app import run_migrations
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _connect(os.path.join(tmp, 'migrari.db'))
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        migrare = [(version + 1, 'test', [
+            "CREATE INDEX idx_test ON tranzactii (comentariu)",
+            "CREATE INDEX idx_test_invalid ON tabel_inexistent (x)",
+        ])]
+        try:
+            run_migrations(conn, migrare)
+            assert False, "migrarea trebuia să eșueze"
+        except sqlite3.OperationalError:
+            pass
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == version
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_test'").fetchone() is None
+        print("✅ Migrarea eșuată a fost anulată")
+
+def test_hot_queries_use_indexes():
+    """EXPLAIN QUERY PLAN: interogările fierbinți folosesc indexurile compuse"""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _connect(os.path.join(tmp, 'plan.db'))
+        for query, params, index in QUERY_PLANS:
+            plan = ' '.join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+            assert index in plan, f"{query}\n  plan: {plan}"
+            assert 'USE TEMP B-TREE FOR ORDER BY' not in plan, f"{query}\n  plan: {plan}"
+        print(f"✅ {len(QUERY_PLANS)} interogări folosesc indexurile așteptate")
+
+if __name__ == "__main__":
+    test_migrations_set_user_version()
+    test_failed_migration_is_rolled_back()
+    test_hot_queries_use_indexes()
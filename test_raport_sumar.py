@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test pentru tabelul materializat raport_sumar
+"""
+
+import os
+import sqlite3
+import tempfile
+
+def _connect(path):
+    from app import create_schema
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    return conn
+
+def _insert(conn, suma, operator, tip, obiect='Casa'):
+    return conn.execute('''
+        INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+        VALUES ('2024-01-01', ?, '', ?, ?, ?, '', 'General')
+    ''', (suma, operator, tip, obiect)).lastrowid
+
+def test_triggers_keep_summary_current():
+    """INSERT, UPDATE și DELETE pe tranzactii sunt reflectate în raport_sumar"""
+    print("🧪 Test raport_sumar menținut de trigger-e")
+
+    from raport_sumar import read_summary, verify_summary
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _connect(os.path.join(tmp, 'raport.db'))
+        _insert(conn, 100, 'victor', 'venit')
+        id_cheltuiala = _insert(conn, 40, 'victor', 'cheltuiala')
+        id_transfer = _insert(conn, 25, 'valerian', 'venit', obiect='transfer')
+        conn.commit()
+
+        summary = read_summary(conn)
+        assert summary[('victor', 'venit', False)] == (100, 1)
+        assert summary[('valerian', 'venit', True)] == (25, 1)
+
+        conn.execute("UPDATE tranzactii SET suma = 60, operator = 'valerian' WHERE id = ?", (id_cheltuiala,))
+        conn.execute("DELETE FROM tranzactii WHERE id = ?", (id_transfer,))
+        conn.commit()
+
+        summary = read_summary(conn)
+        assert ('victor', 'cheltuiala', False) not in summary
+        assert ('valerian', 'venit', True) not in summary
+        assert summary[('valerian', 'cheltuiala', False)] == (60, 1)
+        assert verify_summary(conn) == []
+        print("✅ Sumarul corespunde cu o agregare proaspătă")
+
+def test_summary_rebuilt_for_existing_database():
+    """O bază de date fără raport_sumar (backup vechi) primește tabelul reconstruit"""
+    from raport_sumar import verify_summary
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'vechi.db')
+        conn = _connect(path)
+        _insert(conn, 10, 'victor', 'venit')
+        _insert(conn, 5, 'victor', 'cheltuiala', obiect='transfer')
+        conn.execute("DROP TABLE raport_sumar")
+        conn.commit()
+        conn.close()
+
+        conn = _connect(path)
+        assert conn.execute("SELECT COUNT(*) FROM raport_sumar").fetchone()[0] == 2
+        assert verify_summary(conn) == []
+        print("✅ raport_sumar reconstruit la deschidere")
+
+def test_calculeaza_raport_matches_aggregates():
+    """calculeaza_raport() dă aceleași totaluri ca agregarea directă peste tranzactii"""
+    from app import app, calculeaza_raport, get_db, use_database
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'finance.db')
+        conn = _connect(path)
+        _insert(conn, 100, 'victor', 'venit')
+        _insert(conn, 30, 'victor', 'cheltuiala')
+        _insert(conn, 40, 'valerian', 'venit', obiect='transfer')
+        _insert(conn, 40, 'victor', 'cheltuiala', obiect='transfer')
+        conn.commit()
+        conn.close()
+
+        with use_database(path), app.app_context():
+            raport = calculeaza_raport()
+            c = get_db()
+            venituri = c.execute("SELECT SUM(suma) FROM tranzactii WHERE tip='venit' AND obiect != 'transfer'").fetchone()[0] or 0
+            cheltuieli = c.execute("SELECT SUM(suma) FROM tranzactii WHERE tip='cheltuiala' AND obiect != 'transfer'").fetchone()[0] or 0
+            for operator, sold in raport['sold_pe_operator'].items():
+                asteptat = c.execute('''
+                    SELECT COALESCE(SUM(CASE WHEN tip = 'venit' THEN suma WHEN tip = 'cheltuiala' THEN -suma END), 0)
+                    FROM tranzactii WHERE operator = ?
+                ''', (operator,)).fetchone()[0]
+                assert abs(sold - asteptat) < 0.005
+
+            assert abs(raport['total_venituri'] - venituri) < 0.005
+            assert abs(raport['total_cheltuieli'] - cheltuieli) < 0.005
+            assert raport['total_venituri'] == 100 and raport['total_cheltuieli'] == 30
+    print(f"✅ Balanța {raport['balanta']:.2f} corespunde")
+
+if __name__ == "__main__":
+    test_triggers_keep_summary_current()
+    test_summary_rebuilt_for_existing_database()
+    test_calculeaza_raport_matches_aggregates()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test pentru reclasificarea în loturi (reclasificare.py)
+"""
+
+import os
+import sqlite3
+import tempfile
+
+def _database(path, randuri):
+    from app import create_schema
+    conn = sqlite3.connect(path)
+    create_schema(conn)
+    conn.execute("INSERT INTO obiecte (nume) VALUES ('garaj')")
+    # Clasificare veche, greșită, pentru toate rândurile
+    conn.executemany('''
+        INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+        VALUES ('2024-01-01', 1, ?, 'victor', 'cheltuiala', 'necunoscut', 'necunoscut', 'alte cheltuieli')
+    ''', [(f'salariu ion la garaj {i}' if i % 2 else f'ciment {i}',) for i in range(randuri)])
+    conn.execute('''
+        INSERT INTO tranzactii (data, suma, comentariu, operator, tip, obiect, persoana, categorie)
+        VALUES ('2024-01-01', 1, 'Transfer către valerian: salariu', 'victor', 'cheltuiala', 'transfer', 'valerian', 'transfer')
+    ''')
+    conn.commit()
+    return conn
+
+def test_reclassify_resumes_from_checkpoint():
+    """O rulare oprită continuă de la checkpoint și scrie doar rândurile schimbate"""
+    print("🧪 Test reclasificare în loturi")
+
+    from reclasificare import reclassify, load_checkpoint
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'reclasificare.db')
+        checkpoint = os.path.join(tmp, 'checkpoint.json')
+        conn = _database(db_path, 50)
+
+        loturi = []
+        def progress(state):
+            loturi.append(state)
+
+        # Prima rulare se oprește după primul lot
+        state = reclassify(db_path, chunk_size=10, workers=0, checkpoint_path=checkpoint,
+                           progress=progress, should_stop=lambda: len(loturi) >= 1)
+        assert state['processed'] == 10 and state['updated'] == 5
+        assert load_checkpoint(checkpoint)['last_id'] == 10
+
+        state = reclassify(db_path, chunk_size=10, workers=2, checkpoint_path=checkpoint, progress=progress)
+        assert state['processed'] == 50 and state['updated'] == 25
+        assert 'finished_at' in state and not os.path.exists(checkpoint)
+        assert sum(len(lot['ids']) for lot in loturi) == 25
+
+        rows = conn.execute("SELECT obiect, persoana, categorie FROM tranzactii WHERE comentariu LIKE 'salariu ion%'").fetchall()
+        assert set(rows) == {('garaj', 'ion', 'salariu')}
+        transfer = conn.execute("SELECT obiect, categorie FROM tranzactii WHERE categorie = 'transfer'").fetchone()
+        assert transfer == ('transfer', 'transfer')
+
+        # A doua rulare completă nu mai găsește nimic de modificat
+        assert reclassify(db_path, chunk_size=10, workers=0, checkpoint_path=checkpoint)['updated'] == 0
+        conn.close()
+        print("✅ Reclasificarea a fost reluată de la checkpoint")
+
+def test_pool_never_forks():
+    """Worker-ii nu sunt creați prin fork dintr-un proces cu thread-uri (aplicația Flask)"""
+    from reclasificare import _pool_context, reclassify
+
+    assert _pool_context().get_start_method() in ('forkserver', 'spawn')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'reclasificare.db')
+        _database(db_path, 20).close()
+        state = reclassify(db_path, chunk_size=5, workers=2, checkpoint_path=os.path.join(tmp, 'cp.json'))
+        assert state['processed'] == 20 and state['updated'] == 10
+    print("✅ Pool de procese pornit prin forkserver/spawn")
+
+if __name__ == "__main__":
+    test_reclassify_resumes_from_checkpoint()
+    test_pool_never_forks()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test pentru detectarea mediului de rulare (runtime_profile)
+"""
+
+from runtime_profile import detect_runtime_profile, BACKUP_INTERVAL_LOCAL, BACKUP_INTERVAL_RENDER, RENDER_PRAGMAS
+
+def test_local_profile():
+    """Fără variabile Render profilul este local"""
+    profile = detect_runtime_profile({})
+
+    assert profile.environment == 'local'
+    assert not profile.is_render
+    assert profile.backup_interval == BACKUP_INTERVAL_LOCAL
+    assert profile.sqlite_pragmas == ()
+    print(f"✅ {profile}")
+
+def test_render_profile():
+    """Oricare dintre indicatorii Render activează profilul Render"""
+    for environ in ({'RENDER': 'true'}, {'RENDER_SERVICE_ID': 'srv-1'}, {'HOSTNAME': 'srv-render-abc'}):
+        profile = detect_runtime_profile(environ)
+        assert profile.is_render, environ
+        assert profile.backup_interval == BACKUP_INTERVAL_RENDER
+        assert profile.sqlite_pragmas == RENDER_PRAGMAS
+    print("✅ Mediul Render detectat corect")
+
+def test_gdrive_requires_credentials_on_render():
+    """Pe Render, Google Drive cere credențialele din variabilele de mediu"""
+    assert not detect_runtime_profile({'RENDER': 'true'}).gdrive_available
+
+    environ = {'RENDER': 'true', 'GDRIVE_CLIENT_SECRETS': '{}', 'GDRIVE_TOKEN': '{}'}
+    assert detect_runtime_profile(environ).gdrive_available
+
+    environ['GOOGLE_DRIVE_ENABLED'] = 'false'
+    assert not detect_runtime_profile(environ).gdrive_available
+    print("✅ Disponibilitatea Google Drive detectată corect")
+
+if __name__ == "__main__":
+    test_local_profile()
+    test_render_profile()
+    test_gdrive_requires_credentials_on_render()
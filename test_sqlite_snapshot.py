@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test pentru copiile bazei de date prin API-ul de backup SQLite (sqlite_snapshot.py)
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from sqlite_snapshot import snapshot_database, restore_database, quick_check, SnapshotError
+
+def _live_db(path, rows=5000, journal_mode='WAL'):
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    conn.execute("CREATE TABLE tranzactii (id INTEGER PRIMARY KEY, comentariu TEXT, suma REAL)")
+    conn.executemany("INSERT INTO tranzactii (comentariu, suma) VALUES (?, ?)",
+                     [(f"comentariu {i}", i) for i in range(rows)])
+    conn.commit()
+    return conn
+
+def _snapshot_with_writer(db_path, snapshot_path, **kwargs):
+    """Face copia în timp ce un thread scrie (cel mult 10 secunde); returnează durata"""
+    stop = threading.Event()
+
+    def writer():
+        writer_conn = sqlite3.connect(db_path, timeout=30)
+        deadline = time.monotonic() + 10
+        while not stop.is_set() and time.monotonic() < deadline:
+            writer_conn.execute("INSERT INTO tranzactii (comentariu, suma) VALUES ('nou', 1)")
+            writer_conn.commit()
+            time.sleep(0.001)
+        writer_conn.close()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    start = time.monotonic()
+    try:
+        snapshot_database(db_path, snapshot_path, **kwargs)
+        return time.monotonic() - start
+    finally:
+        stop.set()
+        thread.join()
+
+def _check_snapshot(snapshot_path, min_rows):
+    assert quick_check(snapshot_path) == 'ok'
+    copy = sqlite3.connect(snapshot_path)
+    count = copy.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0]
+    journal_mode = copy.execute("PRAGMA journal_mode").fetchone()[0]
+    copy.close()
+    assert count >= min_rows
+    assert journal_mode == 'delete'
+    assert not os.path.exists(snapshot_path + '.tmp')
+    assert not os.path.exists(snapshot_path + '-wal')
+    return count
+
+def test_snapshot_during_writes():
+    """În WAL copia făcută în timp ce aplicația scrie se termină imediat și trece quick_check"""
+    print("🧪 Test snapshot în timpul scrierilor")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'finance.db')
+        snapshot_path = os.path.join(tmp, 'finance_backup.db')
+        conn = _live_db(db_path, rows=50000)
+        elapsed = _snapshot_with_writer(db_path, snapshot_path, pages=4, step_sleep=0.001)
+        count = _check_snapshot(snapshot_path, 50000)
+        conn.close()
+
+        assert elapsed < 5
+        print(f"✅ Snapshot consistent cu {count} tranzacții în {elapsed:.2f}s")
+
+def test_snapshot_restarts_are_capped():
+    """Fără WAL, repornirile cauzate de scrieri sunt limitate, apoi copia se termină dintr-un pas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'finance.db')
+        snapshot_path = os.path.join(tmp, 'finance_backup.db')
+        conn = _live_db(db_path, rows=50000, journal_mode='DELETE')
+        elapsed = _snapshot_with_writer(db_path, snapshot_path, pages=4, step_sleep=0.001, max_restarts=2)
+        _check_snapshot(snapshot_path, 50000)
+        conn.close()
+
+        assert elapsed < 5
+        print(f"✅ Snapshot fără WAL terminat în {elapsed:.2f}s")
+
+def test_snapshot_timeout():
+    """Copia care nu se poate termina la timp ridică SnapshotError și nu lasă fișiere"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'finance.db')
+        snapshot_path = os.path.join(tmp, 'finance_backup.db')
+        conn = _live_db(db_path, rows=10, journal_mode='DELETE')
+        # Un lock exclusiv ținut pe durata copiei blochează citirea sursei
+        conn.execute("BEGIN EXCLUSIVE")
+        try:
+            snapshot_database(db_path, snapshot_path, timeout=0.5)
+            assert False, "snapshot_database trebuia să ridice SnapshotError"
+        except SnapshotError:
+            pass
+        finally:
+            conn.rollback()
+            conn.close()
+
+        assert not os.path.exists(snapshot_path)
+        assert not os.path.exists(snapshot_path + '.tmp')
+        print("✅ Timeout-ul copiei este respectat")
+
+def test_corrupt_backup_is_rejected():
+    """Un backup corupt nu este restaurat, iar baza activă rămâne neatinsă"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'finance.db')
+        backup_path = os.path.join(tmp, 'finance_backup.db')
+        _live_db(db_path, rows=10).close()
+        with open(backup_path, 'wb') as f:
+            f.write(b'SQLite format 3\x00' + b'\xff' * 4096)
+
+        try:
+            restore_database(backup_path, db_path)
+            assert False, "restore_database trebuia să ridice SnapshotError"
+        except (SnapshotError, sqlite3.DatabaseError):
+            pass
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0] == 10
+        conn.close()
+        print("✅ Backup-ul corupt a fost respins")
+
+def test_restore_with_open_connection():
+    """Restaurarea se vede imediat într-o conexiune deja deschisă (WAL rămâne activ)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'finance.db')
+        backup_path = os.path.join(tmp, 'finance_backup.db')
+        conn = _live_db(db_path, rows=100)
+        snapshot_database(db_path, backup_path)
+
+        conn.execute("DELETE FROM tranzactii")
+        conn.commit()
+        assert conn.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0] == 0
+
+        restore_database(backup_path, db_path)
+        assert conn.execute("SELECT COUNT(*) FROM tranzactii").fetchone()[0] == 100
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        conn.close()
+        print("✅ Restaurare vizibilă în conexiunea deschisă")
+
+if __name__ == "__main__":
+    test_snapshot_during_writes()
+    test_snapshot_restarts_are_capped()
+    test_snapshot_timeout()
+    test_corrupt_backup_is_rejected()
+    test_restore_with_open_connection()